@@ -24,6 +24,9 @@ logger = logging.getLogger(__name__)
 # Blueprint principale per le routes
 main = Blueprint('main', __name__)
 
+# Status mostrati in dashboard (una colonna ciascuno)
+DASHBOARD_STATUSES = ['Programmata', 'Calendarizzata', 'Conclusa']
+
 
 @main.route('/')
 def home():
@@ -48,33 +51,26 @@ async def dashboard():
         notion_service = training_service.notion_service
         logger.debug("✅ NotionService recuperato da TrainingService Singleton")
         
-        # PERFORMANCE BOOST: Chiamate parallele con asyncio.gather()
-        logger.debug("🔄 Recupero formazioni da Notion (chiamate parallele)...")
-        formazioni_results = await asyncio.gather(
-            notion_service.get_formazioni_by_status('Programmata'),
-            notion_service.get_formazioni_by_status('Calendarizzata'),
-            notion_service.get_formazioni_by_status('Conclusa'),
-            return_exceptions=True  # Continua anche se una chiamata fallisce
-        )
-        
-        # Gestione risultati con error handling
-        formazioni_programmata = formazioni_results[0] if not isinstance(formazioni_results[0], Exception) else []
-        formazioni_calendarizzata = formazioni_results[1] if not isinstance(formazioni_results[1], Exception) else []
-        formazioni_conclusa = formazioni_results[2] if not isinstance(formazioni_results[2], Exception) else []
-        
-        # Log eventuali errori nelle chiamate Notion
-        for idx, result in enumerate(formazioni_results):
-            if isinstance(result, Exception):
-                status = ['Programmata', 'Calendarizzata', 'Conclusa'][idx]
-                logger.error(f"❌ Errore recupero formazioni '{status}': {result}")
-        
-        # Statistiche con null safety
-        stats = {
-            'programmata': len(formazioni_programmata or []),
-            'calendarizzata': len(formazioni_calendarizzata or []),
-            'conclusa': len(formazioni_conclusa or []),
-        }
-        stats['totale'] = stats['programmata'] + stats['calendarizzata'] + stats['conclusa']
+        # PERFORMANCE BOOST: una sola scansione paginata per tutti gli status
+        logger.debug("🔄 Recupero formazioni da Notion (query unica multi-status)...")
+        try:
+            grouped = await notion_service.get_formazioni_grouped_by_status(DASHBOARD_STATUSES)
+        except NotionServiceError as e:
+            if e.transient:
+                # 429/5xx/timeout con retry già esauriti: altre query rallenterebbero la pagina
+                # e aggiungerebbero carico sul rate limit condiviso
+                logger.warning(f"⚠️ Notion non disponibile, dashboard senza formazioni | Error: {e}")
+                flash("❌ Notion non risponde al momento: formazioni non caricate, riprova tra qualche minuto.", 'error')
+                grouped = _group_dashboard_formazioni({status: [] for status in DASHBOARD_STATUSES})
+            else:
+                # Query unica fallita: una query per status, la pagina mostra ciò che si riesce a caricare
+                logger.warning(f"⚠️ Query multi-status fallita, ripiego su query per status | Error: {e}")
+                grouped = await _get_formazioni_by_status_separately(notion_service)
+        
+        formazioni_programmata = grouped['formazioni']['Programmata']
+        formazioni_calendarizzata = grouped['formazioni']['Calendarizzata']
+        formazioni_conclusa = grouped['formazioni']['Conclusa']
+        stats = grouped['stats']
         
         logger.info(f"✅ Dashboard caricata | Totale: {stats['totale']} | "
                    f"Programmata: {stats['programmata']} | Calendarizzata: {stats['calendarizzata']} | "
@@ -82,9 +78,9 @@ async def dashboard():
         
         # Usa il nuovo template atomic design
         return render_template('pages/dashboard.html',
-                             formazioni_programmata=formazioni_programmata or [],
-                             formazioni_calendarizzata=formazioni_calendarizzata or [],
-                             formazioni_conclusa=formazioni_conclusa or [],
+                             formazioni_programmata=formazioni_programmata,
+                             formazioni_calendarizzata=formazioni_calendarizzata,
+                             formazioni_conclusa=formazioni_conclusa,
                              stats=stats,
                              title='Dashboard - Formazing')
                              
@@ -101,6 +97,42 @@ async def dashboard():
         return redirect(url_for('main.home'))
 
 
+async def _get_formazioni_by_status_separately(notion_service) -> dict:
+    """
+    Fallback dashboard: una query per status in parallelo (stessa forma di get_formazioni_grouped_by_status).
+    
+    Usato solo per errori non transitori della query unica (es. parsing, filtro rifiutato).
+    Uno status non caricato resta vuoto e viene segnalato con un banner di errore
+    invece di rendere inutilizzabile l'intera dashboard.
+    """
+    results = await asyncio.gather(
+        *(notion_service.get_formazioni_by_status(status) for status in DASHBOARD_STATUSES),
+        return_exceptions=True  # Continua anche se una chiamata fallisce
+    )
+    
+    formazioni = {}
+    failed = []
+    for status, result in zip(DASHBOARD_STATUSES, results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ Errore recupero formazioni '{status}': {result}")
+            failed.append(status)
+            result = []
+        formazioni[status] = result
+    
+    if failed:
+        flash(f"❌ Impossibile caricare da Notion le formazioni: {', '.join(failed)}. "
+              f"Le sezioni interessate sono vuote, riprova più tardi.", 'error')
+    
+    return _group_dashboard_formazioni(formazioni)
+
+
+def _group_dashboard_formazioni(formazioni: dict) -> dict:
+    """Formazioni per status con statistiche (stessa forma di get_formazioni_grouped_by_status)."""
+    stats = {status.lower(): len(formazioni[status]) for status in DASHBOARD_STATUSES}
+    stats['totale'] = sum(stats.values())
+    return {'formazioni': formazioni, 'stats': stats}
+
+
 # === PAGINE PREVIEW CON FORM CONFERMA ===
 
 @main.route('/preview/notification/<training_id>')
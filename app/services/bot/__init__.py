@@ -4,9 +4,12 @@ Bot Telegram Module - Moduli specializzati per servizio Telegram
 Struttura:
 - telegram_formatters.py: Gestione template e formattazione messaggi
 - telegram_commands.py: Comandi bot interattivi (/oggi, /domani, etc.)
+- schedule_index.py: Indice calendario per giorno condiviso dai comandi
+- telegram_webhook.py: Endpoint HTTP locale per la modalità webhook
 """
 
 from .telegram_formatters import TelegramFormatter
 from .telegram_commands import TelegramCommands
+from .telegram_webhook import TelegramWebhookServer
 
-__all__ = ['TelegramFormatter', 'TelegramCommands']
\ No newline at end of file
+__all__ = ['TelegramFormatter', 'TelegramCommands', 'TelegramWebhookServer']
\ No newline at end of file
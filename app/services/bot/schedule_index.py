@@ -0,0 +1,283 @@
+"""
+Schedule Index - Calendario formazioni indicizzato per giorno
+
+Questo modulo gestisce:
+- Indice in memoria giorno → formazioni calendarizzate ordinate per ora, limitato
+  alla finestra servita dai comandi (lunedì della settimana corrente → oggi + 7)
+- Query range diretta per i giorni fuori finestra
+- Ricostruzione a intervallo, dopo invalidate() o al cambio del marker del NotionService
+  (revisione del mirror SQLite, condiviso tra processo Flask e processo bot)
+- Ricostruzioni concorrenti unificate (single-flight): un picco di /oggi = una query
+- Indice precedente servito se la ricostruzione fallisce o supera la scadenza del chiamante
+
+Condiviso dai comandi /oggi, /domani e /settimana: un comando diventa
+una lookup su dict più la formattazione della risposta.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.services.notion.formazione import get_data_inizio
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleIndex:
+    """
+    Indice per giorno delle formazioni calendarizzate.
+
+    RESPONSABILITÀ:
+    - Leggere da Notion le formazioni 'Calendarizzata' della finestra (una query range per ricostruzione)
+    - Raggrupparle per giorno di inizio, ordinate per orario
+    - Rispondere a giorno singolo e intervalli nella finestra senza chiamate Notion finché l'indice è valido
+    - Interrogare Notion sul solo intervallo richiesto quando esce dalla finestra
+
+    La finestra copre /oggi, /domani e /settimana: ogni ricostruzione trasferisce
+    al più due settimane di righe, indipendentemente dalla dimensione dello storico.
+
+    Thread-safe: lo stesso indice può servire event loop diversi.
+    """
+
+    STATUS = 'Calendarizzata'
+    REFRESH_SECONDS = 60
+    DAYS_AHEAD = 7
+
+    def __init__(self, notion_service=None, refresh_seconds: float = None):
+        """
+        Inizializza indice vuoto (costruito alla prima richiesta).
+
+        Args:
+            notion_service: NotionService per la lettura formazioni
+            refresh_seconds: Validità indice (default env TELEGRAM_SCHEDULE_REFRESH_SECONDS o 60)
+        """
+        self.notion_service = notion_service
+        if refresh_seconds is None:
+            refresh_seconds = float(os.getenv('TELEGRAM_SCHEDULE_REFRESH_SECONDS', self.REFRESH_SECONDS))
+        self.refresh_seconds = refresh_seconds
+
+        self._by_day: Dict[date, List[Dict]] = {}
+        # Finestra coperta da _by_day (None = indice mai costruito)
+        self._window: Optional[Tuple[date, date]] = None
+        self._built_at: Optional[float] = None
+        self._built_marker = None
+        # Incrementata da invalidate(): una ricostruzione partita prima non rende l'indice valido
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight(name='schedule_index')
+        self._stats = {'lookups': 0, 'builds': 0, 'build_errors': 0, 'invalidations': 0, 'deadline_misses': 0,
+                       'range_queries': 0}
+
+    # ===============================
+    # LOOKUP
+    # ===============================
+
+    async def get_day(self, day: date, timeout: float = None) -> List[Dict]:
+        """
+        Formazioni calendarizzate di un giorno, ordinate per ora.
+
+        Args:
+            day: Giorno richiesto
+            timeout: Attesa massima di ricostruzione o query fuori finestra (None = senza limite)
+
+        Returns:
+            List[Dict]: Formazioni del giorno (lista vuota se nessuna)
+
+        Raises:
+            asyncio.TimeoutError: Ricostruzione (o query fuori finestra) oltre timeout e nessun indice precedente
+        """
+        by_day = await self.get_range(day, day, timeout)
+        return by_day.get(day, [])
+
+    async def get_range(self, start_date: date, end_date: date, timeout: float = None) -> Dict[date, List[Dict]]:
+        """
+        Formazioni calendarizzate in un intervallo, raggruppate per giorno.
+
+        Args:
+            start_date: Primo giorno (incluso)
+            end_date: Ultimo giorno (incluso)
+            timeout: Attesa massima di ricostruzione o query fuori finestra (None = senza limite)
+
+        Returns:
+            Dict[date, List[Dict]]: Solo i giorni con formazioni, in ordine cronologico
+
+        Raises:
+            asyncio.TimeoutError: Ricostruzione (o query fuori finestra) oltre timeout e nessun indice precedente
+        """
+        if self._covers(self.current_window(), start_date, end_date):
+            window, by_day = await self._get_index(timeout)
+            # Indice precedente di un altro giorno: la finestra servita può non coprire il range
+            if self._covers(window, start_date, end_date):
+                return self._slice(by_day, start_date, end_date)
+        return await self._query_range(start_date, end_date, timeout)
+
+    # ===============================
+    # FINESTRA E QUERY FUORI FINESTRA
+    # ===============================
+
+    def current_window(self) -> Tuple[date, date]:
+        """Finestra indicizzata oggi: lunedì della settimana corrente → oggi + DAYS_AHEAD."""
+        today = date.today()
+        return today - timedelta(days=today.weekday()), today + timedelta(days=self.DAYS_AHEAD)
+
+    @staticmethod
+    def _covers(window: Optional[Tuple[date, date]], start_date: date, end_date: date) -> bool:
+        """Range interamente contenuto nella finestra (False se indice mai costruito)."""
+        return window is not None and window[0] <= start_date and end_date <= window[1]
+
+    @staticmethod
+    def _slice(by_day: Dict[date, List[Dict]], start_date: date, end_date: date) -> Dict[date, List[Dict]]:
+        """Giorni con formazioni nel range (copie delle liste dell'indice)."""
+        result = {}
+        day = start_date
+        while day <= end_date:
+            if day in by_day:
+                result[day] = list(by_day[day])
+            day += timedelta(days=1)
+        return result
+
+    async def _query_range(self, start_date: date, end_date: date, timeout: float = None) -> Dict[date, List[Dict]]:
+        """Query range diretta (giorni fuori finestra), senza passare dall'indice."""
+        with self._lock:
+            self._stats['range_queries'] += 1
+        formazioni = await asyncio.wait_for(
+            self.notion_service.get_formazioni_in_range(self.STATUS, start_date, end_date), timeout
+        )
+        return self._slice(self._group_by_day(formazioni), start_date, end_date)
+
+    @staticmethod
+    def _group_by_day(formazioni: List[Dict]) -> Dict[date, List[Dict]]:
+        """Raggruppa per giorno di inizio, formazioni del giorno ordinate per orario."""
+        by_day: Dict[date, List[Dict]] = {}
+        for formazione in formazioni:
+            data_inizio = get_data_inizio(formazione)
+            if data_inizio is None:
+                continue
+            by_day.setdefault(data_inizio.date(), []).append(formazione)
+        for day_formazioni in by_day.values():
+            day_formazioni.sort(key=lambda f: get_data_inizio(f).time())
+        return by_day
+
+    # ===============================
+    # COSTRUZIONE E INVALIDAZIONE
+    # ===============================
+
+    def invalidate(self):
+        """
+        Forza la ricostruzione alla prossima richiesta (solo in questo processo).
+
+        Una ricostruzione già in corso completa ma non rende l'indice valido:
+        i suoi dati potrebbero precedere la modifica che ha causato l'invalidazione.
+        """
+        with self._lock:
+            self._built_at = None
+            self._generation += 1
+            self._stats['invalidations'] += 1
+
+    async def _get_index(self, timeout: float = None) -> Tuple[Tuple[date, date], Dict[date, List[Dict]]]:
+        """
+        Finestra e indice correnti, ricostruiti se scaduti, invalidati o al cambio giorno.
+
+        Con timeout la ricostruzione prosegue in background oltre la scadenza:
+        il chiamante riceve l'indice precedente (o TimeoutError se non esiste)
+        e le richieste successive trovano l'indice aggiornato.
+        """
+        marker = self._change_marker()
+        window = self.current_window()
+        with self._lock:
+            self._stats['lookups'] += 1
+            fresh = self._is_fresh(marker, window)
+            current = (self._window, self._by_day)
+        if fresh:
+            return current
+
+        try:
+            if timeout is None:
+                return await self._single_flight.do('build', self._build)
+            build = asyncio.ensure_future(self._single_flight.do('build', self._build))
+            # Esito recuperato anche se nessuno attende più la ricostruzione ('exception never retrieved')
+            build.add_done_callback(lambda task: task.cancelled() or task.exception())
+            return await asyncio.wait_for(asyncio.shield(build), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._stats['deadline_misses'] += 1
+                stale = (self._window, self._by_day) if self._stats['builds'] else None
+            if stale is None:
+                raise
+            logger.warning(f"⚠️ Ricostruzione calendario oltre {timeout}s, uso indice precedente")
+            return stale
+        except Exception as e:
+            with self._lock:
+                self._stats['build_errors'] += 1
+                stale = (self._window, self._by_day) if self._stats['builds'] else None
+            if stale is None:
+                raise
+            logger.warning(f"⚠️ Ricostruzione calendario fallita, uso indice precedente | Error: {e}")
+            return stale
+
+    def _is_fresh(self, marker, window: Tuple[date, date]) -> bool:
+        """Indice costruito, non scaduto, con marker e finestra invariati (chiamare con _lock acquisito)."""
+        return (self._built_at is not None
+                and time.monotonic() - self._built_at < self.refresh_seconds
+                and marker == self._built_marker
+                and window == self._window)
+
+    def _change_marker(self):
+        """
+        Marker di modifica del NotionService (None se non disponibile o in errore).
+
+        Con mirror abilitato è la revisione SQLite: una formazione calendarizzata
+        dal processo Flask invalida l'indice del processo bot alla lookup successiva.
+        """
+        get_marker = getattr(self.notion_service, 'get_change_marker', None)
+        if get_marker is None:
+            return None
+        try:
+            return get_marker()
+        except Exception as e:
+            logger.warning(f"⚠️ Marker modifiche calendario non disponibile | Error: {e}")
+            return None
+
+    async def _build(self) -> Tuple[Tuple[date, date], Dict[date, List[Dict]]]:
+        """Legge le formazioni calendarizzate della finestra e ricostruisce l'indice per giorno."""
+        # Marker letto prima della query: una modifica durante la lettura forza un'altra ricostruzione
+        marker = self._change_marker()
+        window = self.current_window()
+        with self._lock:
+            # Ricostruito da un altro chiamante dopo il controllo in _get_index
+            if self._is_fresh(marker, window):
+                return self._window, self._by_day
+            generation = self._generation
+        started = time.monotonic()
+        formazioni = await self.notion_service.get_formazioni_in_range(self.STATUS, *window)
+        by_day = self._group_by_day(formazioni)
+
+        with self._lock:
+            self._by_day = by_day
+            self._window = window
+            self._stats['builds'] += 1
+            # invalidate() arrivato durante la lettura: dati serviti ma indice da ricostruire
+            if generation == self._generation:
+                self._built_at = started
+                self._built_marker = marker
+
+        logger.info(f"📅 Calendario bot ricostruito | Formazioni: {sum(map(len, by_day.values()))} | "
+                    f"Giorni: {len(by_day)} | Finestra: {window[0]} - {window[1]}")
+        return window, by_day
+
+    def get_stats(self) -> Dict:
+        """Statistiche indice: lookup, ricostruzioni, query fuori finestra, errori, età e dimensione."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['days'] = len(self._by_day)
+            stats['trainings'] = sum(map(len, self._by_day.values()))
+            stats['window'] = [day.isoformat() for day in self._window] if self._window else None
+            stats['age_seconds'] = (round(time.monotonic() - self._built_at, 1)
+                                    if self._built_at is not None else None)
+        stats['refresh_seconds'] = self.refresh_seconds
+        return stats
@@ -3,17 +3,23 @@ Telegram Commands - Gestione comandi bot interattivi
 
 Questo modulo gestisce:
 - Comandi bot: /oggi, /domani, /settimana, /help, /start
-- Recupero dati formazioni da Notion
+- Recupero dati formazioni dall'indice calendario (ScheduleIndex, una query range Notion per refresh)
 - Formattazione risposte HTML per utenti
+- Scadenza per comando: risposta da dati in cache o "in caricamento" se Notion è lento
 - Utility per parsing date e ordinamento
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import os
+from datetime import date, datetime, timedelta
+from typing import List, Dict
 from telegram.ext import CommandHandler, ContextTypes
 from telegram import Update
 
+from app.services.bot.schedule_index import ScheduleIndex
+from app.services.notion.formazione import get_data_inizio
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,10 +30,15 @@ class TelegramCommands:
     RESPONSABILITÀ:
     - Registrazione command handlers
     - Implementazione comandi /oggi, /domani, /settimana, /help
-    - Recupero dati formazioni tramite notion_service
+    - Recupero dati formazioni tramite indice calendario condiviso (schedule)
     - Formattazione risposte user-friendly
+    - Risposta entro command_deadline anche con Notion lento
     """
     
+    # Attesa massima dei dati per un comando (oltre: indice precedente o messaggio "in caricamento")
+    COMMAND_DEADLINE_SECONDS = 5.0
+    LOADING_MESSAGE = "⏳ Sto ancora caricando il calendario formazioni, riprova tra qualche secondo"
+    
     def __init__(self, telegram_service):
         """
         Inizializza gestore comandi con riferimento al servizio principale.
@@ -36,8 +47,20 @@ class TelegramCommands:
             telegram_service: Istanza TelegramService per accesso a gruppi e bot
         """
         self.service = telegram_service
+        self.schedule = ScheduleIndex()
+        self.command_deadline = float(os.getenv('TELEGRAM_COMMAND_DEADLINE_SECONDS', self.COMMAND_DEADLINE_SECONDS))
         self.notion_service = None  # Configurato da TelegramService.__init__ tramite self.commands.notion_service
         logger.debug("TelegramCommands inizializzato")
+
+    @property
+    def notion_service(self):
+        """NotionService usato dall'indice calendario."""
+        return self.schedule.notion_service
+
+    @notion_service.setter
+    def notion_service(self, notion_service):
+        self.schedule.notion_service = notion_service
+        self.schedule.invalidate()
     
     def register_handlers(self, application):
         """
@@ -105,31 +128,21 @@ class TelegramCommands:
             start_of_week = today - timedelta(days=today.weekday())  # Lunedì = 0
             end_of_week = start_of_week + timedelta(days=6)  # Domenica
             
-            # Recupero formazioni nel range settimanale
-            formazioni = await self._get_formazioni_by_date_range(start_of_week, end_of_week)
+            # Formazioni del range settimanale, già raggruppate per giorno e ordinate per ora
+            formazioni_per_giorno = await self._get_formazioni_by_date_range(start_of_week, end_of_week)
             
             # Header risposta con date range
             message = f"📅 <b>FORMAZIONI SETTIMANA</b> ({start_of_week.strftime('%d/%m')} - {end_of_week.strftime('%d/%m/%Y')}):\n\n"
             
-            if not formazioni:
+            if not formazioni_per_giorno:
                 message += "🤷‍♂️ <i>Nessuna formazione in programma questa settimana</i>"
             else:
-                # Raggruppamento formazioni per giorno
-                formazioni_per_giorno = {}
-                for formazione in formazioni:
-                    data_str = self._extract_date_from_formazione(formazione)
-                    if data_str:
-                        if data_str not in formazioni_per_giorno:
-                            formazioni_per_giorno[data_str] = []
-                        formazioni_per_giorno[data_str].append(formazione)
-                
-                # Ordinamento e formattazione per giorno
-                for data in sorted(formazioni_per_giorno.keys()):
-                    day_name = self._get_day_name(data)
-                    message += f"📆 <b>{day_name} {data}</b>:\n"
+                # Giorni in ordine cronologico (chiavi date, non stringhe dd/mm)
+                for giorno, formazioni in formazioni_per_giorno.items():
+                    day_name = self._get_day_name(giorno)
+                    message += f"📆 <b>{day_name} {giorno.strftime('%d/%m/%Y')}</b>:\n"
                     
-                    # Formazioni del giorno ordinate per ora
-                    for formazione in formazioni_per_giorno[data]:
+                    for formazione in formazioni:
                         # Formattazione Area: lista → stringa pulita
                         area_raw = formazione.get('Area', 'N/A')
                         if isinstance(area_raw, list) and area_raw:
@@ -151,6 +164,9 @@ class TelegramCommands:
             
             await update.message.reply_text(message, parse_mode='HTML')
             
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ /settimana oltre la scadenza di {self.command_deadline}s, calendario non ancora disponibile")
+            await update.message.reply_text(self.LOADING_MESSAGE)
         except Exception as e:
             logger.error(f"Errore nel comando /settimana: {e}")
             await update.message.reply_text("❌ Errore nel recupero delle formazioni della settimana")
@@ -241,6 +257,9 @@ class TelegramCommands:
             
             await update.message.reply_text(message, parse_mode='HTML')
             
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ /{period_name} oltre la scadenza di {self.command_deadline}s, calendario non ancora disponibile")
+            await update.message.reply_text(self.LOADING_MESSAGE)
         except Exception as e:
             logger.error(f"Errore nel comando /{period_name}: {e}")
             await update.message.reply_text(f"❌ Errore nel recupero delle formazioni di {period_name}")
@@ -253,42 +272,32 @@ class TelegramCommands:
         """
         Recupera formazioni calendarizzate per data specifica.
         
-        PROCESSO:
-        1. Recupera tutte le formazioni 'Calendarizzate' da Notion
-        2. Filtra per target_date
-        3. Ordina per orario crescente
+        Lookup sull'indice calendario: nessuna query Notion finché l'indice è valido.
         
         Args:
             target_date (date): Data specifica per filtraggio
             
         Returns:
             List[Dict]: Formazioni ordinate per ora
+            
+        Raises:
+            asyncio.TimeoutError: Calendario non disponibile entro command_deadline
         """
         if self.notion_service is None:
             return []
         
         try:
-            # Recupero tutte le formazioni calendarizzate
-            all_formazioni = await self.notion_service.get_formazioni_by_status('Calendarizzata')
-            
-            # Filtraggio per data target
-            formazioni_del_giorno = []
-            for formazione in all_formazioni:
-                formazione_date = self._extract_date_from_formazione(formazione)
-                if formazione_date and formazione_date == target_date.strftime('%d/%m/%Y'):
-                    formazioni_del_giorno.append(formazione)
-            
-            # Ordinamento per orario
-            sorted_formazioni = sorted(formazioni_del_giorno, key=lambda x: self._extract_time_from_formazione(x))
-            
-            logger.info(f"Recuperate {len(sorted_formazioni)} formazioni per {target_date.strftime('%d/%m/%Y')}")
-            return sorted_formazioni
+            formazioni_del_giorno = await self.schedule.get_day(target_date, timeout=self.command_deadline)
+            logger.info(f"Recuperate {len(formazioni_del_giorno)} formazioni per {target_date.strftime('%d/%m/%Y')}")
+            return formazioni_del_giorno
             
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
             logger.error(f"Errore nel recupero formazioni per data {target_date}: {e}")
             return []
     
-    async def _get_formazioni_by_date_range(self, start_date, end_date) -> List[Dict]:
+    async def _get_formazioni_by_date_range(self, start_date, end_date) -> Dict[date, List[Dict]]:
         """
         Recupera formazioni calendarizzate in range di date per /settimana.
         
@@ -297,65 +306,30 @@ class TelegramCommands:
             end_date (date): Data fine range (inclusa)
             
         Returns:
-            List[Dict]: Formazioni nel range (non ordinate)
+            Dict[date, List[Dict]]: Giorno → formazioni ordinate per ora (giorni in ordine cronologico)
+            
+        Raises:
+            asyncio.TimeoutError: Calendario non disponibile entro command_deadline
         """
         if self.notion_service is None:
-            return []
+            return {}
         
         try:
-            # Recupero base da Notion
-            all_formazioni = await self.notion_service.get_formazioni_by_status('Calendarizzata')
-            
-            # Filtraggio per range di date
-            formazioni_periodo = []
-            for formazione in all_formazioni:
-                formazione_date_str = self._extract_date_from_formazione(formazione)
-                if formazione_date_str:
-                    try:
-                        formazione_date = datetime.strptime(formazione_date_str, '%d/%m/%Y').date()
-                        if start_date <= formazione_date <= end_date:
-                            formazioni_periodo.append(formazione)
-                    except ValueError:
-                        logger.warning(f"Data non parsabile: {formazione_date_str}")
-                        continue
-            
-            logger.info(f"Recuperate {len(formazioni_periodo)} formazioni per range {start_date}-{end_date}")
+            formazioni_periodo = await self.schedule.get_range(start_date, end_date, timeout=self.command_deadline)
+            logger.info(f"Recuperate {sum(map(len, formazioni_periodo.values()))} formazioni "
+                        f"per range {start_date}-{end_date}")
             return formazioni_periodo
             
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
             logger.error(f"Errore nel recupero formazioni per range {start_date}-{end_date}: {e}")
-            return []
+            return {}
     
     # ===============================
     # UTILITY PARSING DATE
     # ===============================
     
-    def _extract_date_from_formazione(self, formazione: Dict) -> Optional[str]:
-        """
-        Estrae data in formato dd/mm/yyyy da formazione.
-        
-        FORMATI SUPPORTATI:
-        - ISO: "2024-09-22T14:30:00Z" → "22/09/2024"
-        - Custom: "22/09/2024 14:30" → "22/09/2024"
-        
-        Returns:
-            Optional[str]: Data "dd/mm/yyyy" o None se parsing fallisce
-        """
-        try:
-            data_ora = formazione.get('Data/Ora')
-            if not isinstance(data_ora, str):
-                return None
-                
-            if 'T' in data_ora:  # ISO format
-                dt = datetime.fromisoformat(data_ora.replace('Z', '+00:00'))
-                return dt.strftime('%d/%m/%Y')
-            else:  # Custom format  
-                dt = datetime.strptime(data_ora, '%d/%m/%Y %H:%M')
-                return dt.strftime('%d/%m/%Y')
-                
-        except Exception:
-            return None
-    
     def _extract_time_from_formazione(self, formazione: Dict) -> str:
         """
         Estrae orario in formato HH:MM da formazione.
@@ -363,31 +337,15 @@ class TelegramCommands:
         Returns:
             str: Orario "HH:MM" o "N/A" se estrazione fallisce
         """
-        try:
-            data_ora = formazione.get('Data/Ora')
-            if not isinstance(data_ora, str):
-                return 'N/A'
-                
-            if 'T' in data_ora:  # ISO format
-                dt = datetime.fromisoformat(data_ora.replace('Z', '+00:00'))
-                return dt.strftime('%H:%M')
-            else:  # Custom format
-                dt = datetime.strptime(data_ora, '%d/%m/%Y %H:%M')
-                return dt.strftime('%H:%M')
-                
-        except Exception:
-            return 'N/A'
+        data_inizio = get_data_inizio(formazione)
+        return data_inizio.strftime('%H:%M') if data_inizio else 'N/A'
     
-    def _get_day_name(self, date_str: str) -> str:
+    def _get_day_name(self, day: date) -> str:
         """
-        Converte data dd/mm/yyyy in nome giorno italiano.
+        Converte una data in nome giorno italiano.
         
         Returns:
-            str: Nome giorno ("Lunedì", "Martedì", ...) o "N/A" se errore
+            str: Nome giorno ("Lunedì", "Martedì", ...)
         """
-        try:
-            dt = datetime.strptime(date_str, '%d/%m/%Y')
-            days = ['Lunedì', 'Martedì', 'Mercoledì', 'Giovedì', 'Venerdì', 'Sabato', 'Domenica']
-            return days[dt.weekday()]
-        except Exception:
-            return 'N/A'
\ No newline at end of file
+        days = ['Lunedì', 'Martedì', 'Mercoledì', 'Giovedì', 'Venerdì', 'Sabato', 'Domenica']
+        return days[day.weekday()]
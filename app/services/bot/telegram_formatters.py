@@ -6,11 +6,17 @@ Questo modulo si occupa di:
 - Parsing e conversione date da diversi formati
 - Gestione template per main_group vs area_group
 - Fallback per errori di formattazione
+- Cache dei messaggi renderizzati (anteprima e conferma condividono il testo)
+- Template compilati e validati al caricamento (placeholder sconosciuti segnalati subito)
 """
 
 import logging
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
+
+from app.services.notion.formazione import Formazione
+from app.services.render_cache import RenderCache, template_version
+from app.services.template_compiler import CompiledTemplate, TemplateCompileError
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +30,18 @@ class TelegramFormatter:
     - Formattazione messaggi feedback request
     - Parsing date multi-formato (ISO, custom)
     - Gestione template personalizzati per tipo gruppo
+    - Cache render per (dati formazione, tipo template, versione template)
+    - Compilazione template al caricamento con validazione dei placeholder
     """
     
+    # Campi disponibili nei template (placeholder ammessi)
+    TRAINING_FIELDS = ('nome', 'area', 'data_ora', 'codice', 'link_teams')
+    FEEDBACK_FIELDS = ('nome', 'area', 'codice', 'feedback_link')
+    
+    # Segnaposto del link Teams nel testo in cache (sostituito dopo il render):
+    # l'anteprima non ha ancora il link, la conferma sì, il corpo resta lo stesso
+    LINK_TEAMS_MARKER = '\x00link_teams\x00'
+    
     def __init__(self, templates: Dict):
         """
         Inizializza formatter con template YAML.
@@ -33,9 +49,63 @@ class TelegramFormatter:
         Args:
             templates (Dict): Template strutturati da file YAML
         """
+        self.render_cache = RenderCache(name='telegram')
         self.templates = templates
         logger.debug("TelegramFormatter inizializzato")
     
+    @property
+    def templates(self) -> Dict:
+        """Template YAML correnti."""
+        return self._templates
+    
+    @templates.setter
+    def templates(self, templates: Dict):
+        # Nuovi template → nuova versione: i messaggi in cache non vengono più riusati
+        self._templates = templates
+        self.template_version = template_version(templates)
+        self._compile_templates()
+    
+    def _compile_templates(self):
+        """
+        Compila i template usati dal formatter e ne valida i placeholder.
+        
+        Template mancanti → messaggio '❌ Template ... non trovato' (come prima).
+        Template non validi → errore nel log ora, messaggio di errore al render.
+        """
+        training_templates = self.templates.get('training_notification', {}).get('telegram', {})
+        feedback_templates = self.templates.get('feedback_request', {}).get('telegram', {})
+        
+        sources = {
+            'main_group': (training_templates.get('main_group', '❌ Template main_group non trovato'),
+                           self.TRAINING_FIELDS, 'training_notification.telegram.main_group'),
+            'area_group': (training_templates.get('area_group', '❌ Template area_group non trovato'),
+                           self.TRAINING_FIELDS, 'training_notification.telegram.area_group'),
+            'feedback': (feedback_templates.get('message', '❌ Template feedback non trovato'),
+                         self.FEEDBACK_FIELDS, 'feedback_request.telegram.message')
+        }
+        
+        self._compiled: Dict[str, Optional[CompiledTemplate]] = {}
+        self._link_after_render: Dict[str, bool] = {}
+        self.template_errors: Dict[str, str] = {}
+        for key, (source, fields, name) in sources.items():
+            try:
+                self._compiled[key] = CompiledTemplate(source, fields, name)
+                # Link sostituibile dopo il render solo se usato come {link_teams} semplice (senza format spec)
+                self._link_after_render[key] = (
+                    'link_teams' not in self._compiled[key].fields
+                    or source.count('link_teams') == source.count('{link_teams}')
+                )
+            except TemplateCompileError as e:
+                self._compiled[key] = None
+                self.template_errors[name] = str(e)
+                logger.error(f"❌ Template Telegram non valido | {e}")
+    
+    def get_render_stats(self) -> Dict:
+        """Statistiche cache render (hit = messaggi riusati senza nuova formattazione)."""
+        stats = self.render_cache.get_stats()
+        stats['template_version'] = self.template_version
+        return stats
+    
     def format_training_message(self, training_data: Dict, group_key: str) -> str:
         """
         Formatta messaggio notifica formazione usando template appropriato.
@@ -50,6 +120,12 @@ class TelegramFormatter:
             
         Returns:
             str: Messaggio HTML formattato pronto per Telegram
+            
+        CACHE:
+        Stessi dati + stesso tipo template (main/area) + stessa versione template
+        → stesso testo, renderizzato una sola volta (es: anteprima poi conferma).
+        Il link Teams non fa parte della chiave: viene inserito dopo il render,
+        così la conferma (link appena creato) riusa il corpo dell'anteprima.
         """
         # Estrazione dati con fallback 'N/A'
         nome = training_data.get('Nome', 'N/A')
@@ -65,8 +141,34 @@ class TelegramFormatter:
         codice = training_data.get('Codice', 'N/A')
         link_teams = training_data.get('Link Teams', 'N/A')
 
-        # Parsing e formattazione data (supporta ISO e formato custom)
-        data_formattata = self._format_date_time(data_ora)
+        # Formazione: datetime già parsato, altrimenti parsing (ISO e formato custom)
+        if isinstance(training_data, Formazione) and training_data.data_inizio:
+            data_source = training_data.data_inizio
+        else:
+            data_source = data_ora
+        
+        template_kind = 'main_group' if group_key == 'main_group' else 'area_group'
+        if not self._link_after_render.get(template_kind, False):
+            # Template non valido o link con format spec: link nella chiave, nessuna sostituzione
+            cache_key = ('training', template_kind, self.template_version, nome, area, data_source, codice, link_teams)
+            return self.render_cache.get_or_render(
+                cache_key,
+                lambda: self._render_training_message(nome, area, data_source, codice, link_teams, group_key)
+            )
+        
+        cache_key = ('training', template_kind, self.template_version, nome, area, data_source, codice)
+        body = self.render_cache.get_or_render(
+            cache_key,
+            lambda: self._render_training_message(nome, area, data_source, codice, self.LINK_TEAMS_MARKER, group_key)
+        )
+        return body.replace(self.LINK_TEAMS_MARKER, str(link_teams))
+    
+    def _render_training_message(self, nome, area, data_source, codice, link_teams, group_key: str) -> str:
+        """Render del template training (senza cache)."""
+        if isinstance(data_source, datetime):
+            data_formattata = data_source.strftime('%d/%m/%Y %H:%M')
+        else:
+            data_formattata = self._format_date_time(data_source)
         
         # Preparazione dati per template
         template_data = {
@@ -77,17 +179,15 @@ class TelegramFormatter:
             'link_teams': link_teams
         }
         
-        # Selezione template appropriato
-        training_templates = self.templates.get('training_notification', {}).get('telegram', {})
-        
-        if group_key == 'main_group':
-            template = training_templates.get('main_group', '❌ Template main_group non trovato')
-        else:
-            template = training_templates.get('area_group', '❌ Template area_group non trovato')
+        # Selezione template appropriato (già compilato e validato)
+        template = self._compiled['main_group' if group_key == 'main_group' else 'area_group']
+        if template is None:
+            # Template non valido, errore già segnalato al caricamento
+            return f"❌ Errore nella formattazione del messaggio per la formazione: {nome}"
         
         # Formattazione con gestione errori
         try:
-            formatted_message = template.format(**template_data)
+            formatted_message = template.render(template_data)
             logger.debug(f"Messaggio training formattato per {group_key}: {len(formatted_message)} caratteri")
             return formatted_message
         except (KeyError, ValueError) as e:
@@ -123,6 +223,14 @@ class TelegramFormatter:
         
         codice = training_data.get('Codice', 'N/A')
         
+        cache_key = ('feedback', self.template_version, nome, area, codice, feedback_link)
+        return self.render_cache.get_or_render(
+            cache_key,
+            lambda: self._render_feedback_message(nome, area, codice, feedback_link, group_key)
+        )
+    
+    def _render_feedback_message(self, nome, area, codice, feedback_link: str, group_key: str) -> str:
+        """Render del template feedback (senza cache)."""
         # Preparazione dati template
         template_data = {
             'nome': nome,
@@ -131,14 +239,14 @@ class TelegramFormatter:
             'feedback_link': feedback_link
         }
         
-        # Recupero template feedback (unico per tutti i gruppi)
-        feedback_template = (self.templates.get('feedback_request', {})
-                           .get('telegram', {})
-                           .get('message', '❌ Template feedback non trovato'))
+        # Template feedback (unico per tutti i gruppi, già compilato e validato)
+        feedback_template = self._compiled['feedback']
+        if feedback_template is None:
+            return f"❌ Errore nella formattazione del messaggio feedback per la formazione: {nome}"
         
         # Formattazione con gestione errori
         try:
-            formatted_message = feedback_template.format(**template_data)
+            formatted_message = feedback_template.render(template_data)
             logger.debug(f"Messaggio feedback formattato per {group_key}: {len(formatted_message)} caratteri")
             return formatted_message
         except (KeyError, ValueError) as e:
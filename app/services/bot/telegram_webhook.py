@@ -0,0 +1,140 @@
+"""
+Telegram Webhook - Ricezione update via endpoint HTTP locale
+
+Questo modulo gestisce:
+- Server aiohttp che riceve gli update Telegram (POST JSON) su un path locale
+- Verifica header X-Telegram-Bot-Api-Secret-Token
+- Inoltro degli update alla stessa Application usata in polling (update_queue)
+- Statistiche update ricevuti / rifiutati
+
+Alternativa a updater.start_polling(): nessuna connessione long-poll sempre
+aperta, gli update arrivano appena Telegram li consegna. L'endpoint va esposto
+(reverse proxy HTTPS) sull'URL registrato con set_webhook.
+"""
+
+import hmac
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from aiohttp import web
+from telegram import Update
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramWebhookServer:
+    """
+    Endpoint HTTP per gli update Telegram in modalità webhook.
+
+    RESPONSABILITÀ:
+    - Avviare/fermare il server aiohttp sull'event loop del bot
+    - Validare secret token e JSON degli update
+    - Accodare gli Update nella update_queue dell'Application (stessi handler del polling)
+
+    Risponde 200 appena l'update è accodato: l'elaborazione dei comandi
+    avviene nell'Application, non nella richiesta HTTP.
+    """
+
+    SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+    DEFAULT_HOST = '127.0.0.1'
+    DEFAULT_PORT = 8443
+    DEFAULT_PATH = '/telegram/webhook'
+
+    def __init__(self, application, host: str = None, port: int = None,
+                 path: str = None, secret_token: str = None):
+        """
+        Configura il server webhook (avviato con start()).
+
+        Args:
+            application: Application Telegram che elabora gli update
+            host: Interfaccia di ascolto (default env TELEGRAM_WEBHOOK_HOST o 127.0.0.1)
+            port: Porta di ascolto, 0 = porta libera (default env TELEGRAM_WEBHOOK_PORT o 8443)
+            path: Path dell'endpoint (default env TELEGRAM_WEBHOOK_PATH o /telegram/webhook)
+            secret_token: Secret atteso nell'header (default env TELEGRAM_WEBHOOK_SECRET, None = nessuna verifica)
+        """
+        self.application = application
+        self.host = host or os.getenv('TELEGRAM_WEBHOOK_HOST', self.DEFAULT_HOST)
+        self.port = int(port if port is not None else os.getenv('TELEGRAM_WEBHOOK_PORT', self.DEFAULT_PORT))
+        self.path = path or os.getenv('TELEGRAM_WEBHOOK_PATH', self.DEFAULT_PATH)
+        self.secret_token = secret_token if secret_token is not None else os.getenv('TELEGRAM_WEBHOOK_SECRET')
+
+        self._runner: Optional[web.AppRunner] = None
+        self._lock = threading.Lock()
+        self._stats = {'received': 0, 'rejected': 0, 'invalid': 0}
+
+    # ===============================
+    # LIFECYCLE SERVER
+    # ===============================
+
+    async def start(self):
+        """Avvia il server HTTP sull'event loop corrente."""
+        app = web.Application()
+        app.router.add_post(self.path, self._handle_update)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        logger.info(f"✅ Webhook Telegram in ascolto | Endpoint: http://{self.host}:{self.bound_port}{self.path} | "
+                    f"Secret: {'sì' if self.secret_token else 'no'}")
+
+    async def stop(self):
+        """Ferma il server HTTP (nessun effetto se non avviato)."""
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+        logger.info("✅ Webhook Telegram fermato")
+
+    @property
+    def bound_port(self) -> Optional[int]:
+        """Porta effettiva di ascolto (utile con port=0)."""
+        if self._runner is None or not self._runner.addresses:
+            return None
+        return self._runner.addresses[0][1]
+
+    # ===============================
+    # GESTIONE UPDATE
+    # ===============================
+
+    async def _handle_update(self, request: web.Request) -> web.Response:
+        """
+        Riceve un update Telegram e lo accoda nell'Application.
+
+        Returns:
+            web.Response: 200 accodato, 403 secret errato, 400 JSON non valido
+        """
+        if self.secret_token and not hmac.compare_digest(
+            request.headers.get(self.SECRET_HEADER, ''), self.secret_token
+        ):
+            self._count('rejected')
+            logger.warning(f"⚠️ Update webhook rifiutato: secret token non valido | Da: {request.remote}")
+            return web.Response(status=403)
+
+        try:
+            data = await request.json()
+            if not isinstance(data, dict):
+                raise ValueError(f"atteso oggetto JSON, ricevuto {type(data).__name__}")
+            update = Update.de_json(data, self.application.bot)
+        except (json.JSONDecodeError, TypeError, KeyError, ValueError) as e:
+            self._count('invalid')
+            logger.warning(f"⚠️ Update webhook non valido | Error: {e}")
+            return web.Response(status=400)
+
+        await self.application.update_queue.put(update)
+        self._count('received')
+        logger.debug(f"📥 Update webhook accodato | ID: {update.update_id}")
+        return web.Response(status=200)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict:
+        """Statistiche webhook: update ricevuti, rifiutati (secret) e non validi."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,152 @@
+"""
+Metrics - Istogrammi latenza in-process
+
+Questo modulo gestisce:
+- Istogramma a bucket geometrici (memoria costante, percentili con errore < 10%)
+- Registro istogrammi per operazione (es: 'databases.query', 'pages.update')
+- Conteggi, error rate e byte ricevuti per operazione
+
+Thread-safe: registrazioni da Flask (thread per richiesta), bot e loop background.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable
+
+
+class LatencyHistogram:
+    """
+    Istogramma latenze con bucket geometrici.
+
+    RESPONSABILITÀ:
+    - Registrare durata, esito e byte di ogni chiamata
+    - Stimare p50/p95/p99 dai bucket (limite superiore del bucket, max reale come tetto)
+    - Occupare memoria costante indipendentemente dal numero di chiamate
+    """
+
+    # Bucket: da MIN_MS a MAX_MS, ognuno GROWTH volte il precedente
+    MIN_MS = 1.0
+    MAX_MS = 120_000.0
+    GROWTH = 1.1
+
+    _LOG_GROWTH = math.log(GROWTH)
+    _BUCKETS = int(math.ceil(math.log(MAX_MS / MIN_MS) / _LOG_GROWTH)) + 1
+
+    def __init__(self):
+        """Inizializza istogramma vuoto."""
+        self._counts = [0] * (self._BUCKETS + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+
+    def _bucket_index(self, duration_ms: float) -> int:
+        if duration_ms <= self.MIN_MS:
+            return 0
+        return min(self._BUCKETS, int(math.log(duration_ms / self.MIN_MS) / self._LOG_GROWTH) + 1)
+
+    def _bucket_upper_ms(self, index: int) -> float:
+        return self.MIN_MS * (self.GROWTH ** index)
+
+    def record(self, duration_ms: float, error: bool = False, bytes_received: int = 0):
+        """
+        Registra una chiamata.
+
+        Args:
+            duration_ms: Durata in millisecondi
+            error: True se la chiamata è fallita
+            bytes_received: Byte del body di risposta
+        """
+        index = self._bucket_index(duration_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.errors += 1 if error else 0
+            self.bytes_received += bytes_received
+            self.total_ms += duration_ms
+            self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+            self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Stima percentile in millisecondi.
+
+        Args:
+            quantile: Quantile tra 0 e 1 (es: 0.95)
+
+        Returns:
+            float: Latenza stimata (0 se nessuna chiamata registrata)
+        """
+        with self._lock:
+            return self._percentile_locked(quantile)
+
+    def _percentile_locked(self, quantile: float) -> float:
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(quantile * self.count))
+        cumulative = 0
+        for index, bucket_count in enumerate(self._counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if index == self._BUCKETS:
+                    return self.max_ms  # Bucket di overflow: nessun limite superiore
+                return min(self._bucket_upper_ms(index), self.max_ms)
+        return self.max_ms
+
+    def snapshot(self) -> Dict:
+        """Statistiche correnti (count, error_rate, percentili, byte)."""
+        with self._lock:
+            count = self.count
+            return {
+                'count': count,
+                'errors': self.errors,
+                'error_rate': round(self.errors / count, 4) if count else 0.0,
+                'avg_ms': round(self.total_ms / count, 2) if count else 0.0,
+                'min_ms': round(self.min_ms or 0.0, 2),
+                'p50_ms': round(self._percentile_locked(0.50), 2),
+                'p95_ms': round(self._percentile_locked(0.95), 2),
+                'p99_ms': round(self._percentile_locked(0.99), 2),
+                'max_ms': round(self.max_ms, 2),
+                'bytes_received': self.bytes_received,
+                'avg_bytes': round(self.bytes_received / count) if count else 0
+            }
+
+
+class OperationMetrics:
+    """
+    Registro istogrammi latenza per operazione.
+
+    Le operazioni vengono create alla prima registrazione.
+    """
+
+    def __init__(self, operations: Iterable[str] = ()):
+        """
+        Inizializza registro.
+
+        Args:
+            operations: Operazioni da mostrare anche prima della prima chiamata
+        """
+        self._histograms: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in operations}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, duration_ms: float, error: bool = False, bytes_received: int = 0):
+        """Registra una chiamata per l'operazione indicata."""
+        histogram = self._histograms.get(operation)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(operation, LatencyHistogram())
+        histogram.record(duration_ms, error=error, bytes_received=bytes_received)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Statistiche per operazione (nome → snapshot istogramma)."""
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
+
+    def reset(self):
+        """Azzera tutte le metriche (es: dopo un deploy o per misure mirate)."""
+        with self._lock:
+            self._histograms = {name: LatencyHistogram() for name in self._histograms}
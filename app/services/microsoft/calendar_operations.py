@@ -143,11 +143,13 @@ class CalendarOperations:
             elif not areas:
                 areas = ['default']
             
-            # 1. Converti data da Notion a ISO
-            data_iso = self._convert_notion_date_to_iso(data_ora)
+            # 1. Data inizio: già parsata nel record Formazione, altrimenti conversione da stringa
+            start_dt = getattr(formazione_data, 'data_inizio', None)
+            if start_dt is None:
+                data_iso = self._convert_notion_date_to_iso(data_ora)
+                start_dt = datetime.fromisoformat(data_iso.replace('Z', '+00:00'))
             
             # 2. Calcola data fine (+1 ora)
-            start_dt = datetime.fromisoformat(data_iso.replace('Z', '+00:00'))
             end_dt = start_dt + timedelta(hours=1)
             
             start_time = {
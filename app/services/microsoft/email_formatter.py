@@ -2,6 +2,8 @@
 Email Formatter - Template engine per corpo eventi calendario.
 
 Carica template YAML e rende il corpo degli eventi con interpolazione variabili.
+Testi renderizzati in cache: anteprima e conferma condividono oggetto e corpo.
+Template compilati al caricamento: placeholder sconosciuti → errore all'avvio.
 Pattern simile a: bot/telegram_formatters.py
 """
 
@@ -11,6 +13,9 @@ from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
 
+from app.services.render_cache import RenderCache, template_version
+from app.services.template_compiler import CompiledTemplate, TemplateCompileError
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +32,9 @@ class EmailFormatter:
     Simile a: TelegramFormatter
     """
     
+    # Campi disponibili nei template calendar_event (subject e body)
+    TEMPLATE_FIELDS = ('Nome', 'Codice', 'Data', 'Area')
+    
     def __init__(self, template_path: Optional[str] = None):
         """
         Inizializza il formatter caricando i template.
@@ -41,8 +49,17 @@ class EmailFormatter:
         
         self.template_path = Path(template_path)
         self.templates = self._load_templates()
+        self.template_version = template_version(self.templates)
+        self._compiled = self._compile_templates()
+        self.render_cache = RenderCache(name='email')
         logger.info(f"EmailFormatter inizializzato | Template: {self.template_path}")
     
+    def get_render_stats(self) -> Dict:
+        """Statistiche cache render (hit = oggetto/corpo riusati senza nuova formattazione)."""
+        stats = self.render_cache.get_stats()
+        stats['template_version'] = self.template_version
+        return stats
+    
     def _load_templates(self) -> Dict:
         """
         Carica i template dal file YAML.
@@ -70,6 +87,59 @@ class EmailFormatter:
             logger.error(f"❌ Errore caricamento templates | Error: {e}")
             raise EmailFormatterError(f"Failed to load templates: {e}")
     
+    def _compile_templates(self) -> Dict[str, CompiledTemplate]:
+        """
+        Compila subject e body di calendar_event validando i placeholder.
+        
+        Returns:
+            Dict con i template compilati presenti ('subject', 'body')
+            
+        Raises:
+            EmailFormatterError: Se un template ha sintassi o placeholder non validi
+        """
+        event_templates = (self.templates or {}).get('calendar_event') or {}
+        compiled = {}
+        for key in ('subject', 'body'):
+            if key not in event_templates:
+                continue
+            try:
+                compiled[key] = CompiledTemplate(event_templates[key], self.TEMPLATE_FIELDS, f"calendar_event.{key}")
+            except TemplateCompileError as e:
+                logger.error(f"❌ Template calendario non valido | {e}")
+                raise EmailFormatterError(str(e))
+        return compiled
+    
+    def _cache_key(self, kind: str, formazione_data: Dict) -> tuple:
+        """Chiave cache render: dati che alimentano i template (datetime già parsato se record Formazione)."""
+        data_inizio = getattr(formazione_data, 'data_inizio', None)
+        area_value = formazione_data.get('Area', 'N/A')
+        return (
+            kind, self.template_version,
+            formazione_data.get('Nome', 'N/A'), formazione_data.get('Codice', 'N/A'),
+            data_inizio or formazione_data.get('Data/Ora', ''),
+            tuple(area_value) if isinstance(area_value, list) else area_value
+        )
+    
+    def _template_values(self, formazione_data: Dict) -> Dict:
+        """Valori dei campi TEMPLATE_FIELDS per una formazione."""
+        # Formatta la data in italiano (datetime già parsato se record Formazione)
+        data_inizio = getattr(formazione_data, 'data_inizio', None)
+        data_formattata = self._format_date(data_inizio or formazione_data.get('Data/Ora', ''))
+        
+        # Se Area è una lista, unisci con virgola
+        area_value = formazione_data.get('Area', 'N/A')
+        if isinstance(area_value, list):
+            area_str = ', '.join(area_value)
+        else:
+            area_str = str(area_value)
+        
+        return {
+            'Nome': formazione_data.get('Nome', 'N/A'),
+            'Codice': formazione_data.get('Codice', 'N/A'),
+            'Data': data_formattata,
+            'Area': area_str
+        }
+    
     def _format_date(self, date_value) -> str:
         """
         Formatta una data in formato leggibile italiano.
@@ -125,29 +195,23 @@ class EmailFormatter:
         Raises:
             EmailFormatterError: Se il template è mancante o i dati sono invalidi
         """
+        return self.render_cache.get_or_render(
+            self._cache_key('calendar_body', formazione_data),
+            lambda: self._render_calendar_body(formazione_data)
+        )
+    
+    def _render_calendar_body(self, formazione_data: Dict) -> str:
+        """Render del corpo evento (senza cache)."""
         try:
             if 'calendar_event' not in self.templates:
                 raise EmailFormatterError("Missing 'calendar_event' template")
             
-            template = self.templates['calendar_event']['body']
-            
-            # Formatta la data in italiano
-            data_formattata = self._format_date(formazione_data.get('Data/Ora', ''))
-            
-            # Se Area è una lista, unisci con virgola
-            area_value = formazione_data.get('Area', 'N/A')
-            if isinstance(area_value, list):
-                area_str = ', '.join(area_value)
-            else:
-                area_str = str(area_value)
+            template = self._compiled.get('body')
+            if template is None:
+                raise EmailFormatterError("Missing 'calendar_event.body' template")
             
             # Interpolazione variabili (senza teams_link, viene aggiunto automaticamente)
-            body = template.format(
-                Nome=formazione_data.get('Nome', 'N/A'),
-                Codice=formazione_data.get('Codice', 'N/A'),
-                Data=data_formattata,
-                Area=area_str
-            )
+            body = template.render(self._template_values(formazione_data))
             
             # Converti newline in <br> per HTML
             body_html = body.replace('\n', '<br>')
@@ -155,6 +219,8 @@ class EmailFormatter:
             logger.debug(f"Calendar body formattato | Formazione: {formazione_data.get('Nome', 'unknown')}")
             return body_html
             
+        except EmailFormatterError:
+            raise
         except KeyError as e:
             logger.error(f"❌ Template variable mancante | Error: {e}")
             raise EmailFormatterError(f"Missing variable in template: {e}")
@@ -167,18 +233,25 @@ class EmailFormatter:
         Genera il subject dell'evento calendario.
         
         Args:
-            formazione_data: Dati formazione (usa campo 'Nome' di Notion)
+            formazione_data: Dati formazione (stessi campi del body: Nome, Codice, Data, Area)
             
         Returns:
             Subject formattato
         """
+        return self.render_cache.get_or_render(
+            self._cache_key('subject', formazione_data),
+            lambda: self._render_subject(formazione_data)
+        )
+    
+    def _render_subject(self, formazione_data: Dict) -> str:
+        """Render dell'oggetto evento (senza cache)."""
         try:
-            if 'calendar_event' not in self.templates:
+            template = self._compiled.get('subject')
+            if template is None:
                 # Fallback se manca il template
                 return formazione_data.get('Nome', 'Formazione')
             
-            template = self.templates['calendar_event']['subject']
-            subject = template.format(Nome=formazione_data.get('Nome', 'N/A'))
+            subject = template.render(self._template_values(formazione_data))
             
             # Rimuovi whitespace extra
             return subject.strip()
@@ -13,16 +13,29 @@ ARCHITETTURA MODULARE:
 - NotionDataParser: Parsing e mapping dati
 - NotionCrudOperations: Operazioni database
 - NotionDiagnostics: Monitoring e debug
+- NotionLocalMirror: Replica SQLite locale (opzionale, sync incrementale)
+- SingleFlight: Coalescing letture identiche concorrenti
+- NotionFreshnessCache: Fetch condizionale (sonda last_edited_time, opzionale)
 """
 
+import asyncio
+import json
 import logging
-from typing import List, Dict, Optional
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, List, Dict, Optional
 
-from .notion_client import NotionClient, NotionClientError
+from .notion_client import NotionClient, NotionClientError, is_transient_error
 from .query_builder import NotionQueryBuilder
 from .data_parser import NotionDataParser
 from .crud_operations import NotionCrudOperations
 from .diagnostics import NotionDiagnostics
+from .local_mirror import NotionLocalMirror
+from .freshness_cache import NotionFreshnessCache
+from .formazione import Formazione, get_data_inizio
+from app.services.single_flight import SingleFlight
 
 
 logger = logging.getLogger(__name__)
@@ -39,15 +52,37 @@ class NotionService:
     - API pubblica semplificata
     - Error handling centralizzato
     - Delegation pattern per operazioni specifiche
+    
+    MIRROR LOCALE (opzionale, NOTION_MIRROR_PATH):
+    Le letture per status/area vengono servite da SQLite, sincronizzato
+    in modo incrementale (solo pagine modificate dopo il watermark).
+    Le scritture vanno su Notion e vengono poi applicate al mirror.
+    
+    SINGLE-FLIGHT:
+    get_formazione_by_id e get_formazioni_by_status concorrenti con gli
+    stessi argomenti (anche da thread/event loop diversi) condividono
+    un'unica richiesta a Notion.
+    
+    FETCH CONDIZIONALE (opzionale, NOTION_CONDITIONAL_FETCH=true):
+    Prima di ripetere una query già eseguita, una sonda page_size=1
+    (pagina modificata più di recente) verifica se il database è cambiato;
+    se non lo è, vengono restituiti i risultati precedenti senza scansione.
     """
     
-    def __init__(self, token: str = None, database_id: str = None):
+    # Intervalli sync mirror (secondi)
+    MIRROR_SYNC_SECONDS = 60
+    MIRROR_FULL_SYNC_SECONDS = 3600
+    
+    def __init__(self, token: str = None, database_id: str = None, mirror_path: str = None,
+                 conditional_fetch: bool = None):
         """
         Inizializza NotionService con architettura modulare.
         
         Args:
             token: Token Notion (da .env se None)
             database_id: ID database formazioni (da .env se None)
+            mirror_path: Path SQLite mirror locale (da .env se None, disabilitato se assente)
+            conditional_fetch: Fetch condizionale con sonda di freschezza (da .env se None)
         """
         try:
             # Inizializzazione moduli in ordine di dipendenza
@@ -57,6 +92,21 @@ class NotionService:
             self.crud_operations = NotionCrudOperations(self.client)
             self.diagnostics = NotionDiagnostics(self.client)
             
+            # Mirror locale opzionale
+            mirror_path = mirror_path or os.getenv('NOTION_MIRROR_PATH')
+            self.mirror = NotionLocalMirror(mirror_path) if mirror_path else None
+            self.mirror_sync_seconds = int(os.getenv('NOTION_MIRROR_SYNC_SECONDS', self.MIRROR_SYNC_SECONDS))
+            self.mirror_full_sync_seconds = int(os.getenv('NOTION_MIRROR_FULL_SYNC_SECONDS', self.MIRROR_FULL_SYNC_SECONDS))
+            self._mirror_sync_lock = threading.Lock()
+            
+            # Letture identiche concorrenti → una sola richiesta (copia per ogni chiamante)
+            self._single_flight = SingleFlight(name='notion', copy_result=_copy_formazioni)
+            
+            # Fetch condizionale: risultati riusati finché la sonda non rileva modifiche
+            if conditional_fetch is None:
+                conditional_fetch = os.getenv('NOTION_CONDITIONAL_FETCH', 'False').lower() == 'true'
+            self.freshness = NotionFreshnessCache() if conditional_fetch else None
+            
             logger.info("✅ NotionService modulare inizializzato | Componenti: Client, QueryBuilder, DataParser, CRUD, Diagnostics")
             
         except Exception as e:
@@ -85,18 +135,10 @@ class NotionService:
         logger.info(f"Query formazioni by status | Status: '{status}'")
         
         try:
-            # 1. Costruisci query con QueryBuilder
-            query = self.query_builder.build_status_filter_query(
-                status=status,
-                database_id=self.client.get_database_id()
+            formazioni = await self._single_flight.do(
+                ('by_status', status), lambda: self._fetch_formazioni_by_status(status)
             )
             
-            # 2. Esegui query con Client
-            response = self.client.get_client().databases.query(**query)
-            
-            # 3. Parsa risultati con DataParser
-            formazioni = self.data_parser.parse_formazioni_list(response)
-            
             logger.info(f"✅ Formazioni recuperate | Status: '{status}' | Count: {len(formazioni)}")
             return formazioni
             
@@ -104,7 +146,388 @@ class NotionService:
             logger.error(f"❌ Errore query formazioni | Status: '{status}' | Error: {e}")
             raise NotionServiceError(f"Errore recupero formazioni: {e}")
     
-    async def update_formazione(self, notion_id: str, updates: Dict) -> bool:
+    async def _fetch_formazioni_by_status(self, status: str) -> List[Dict]:
+        """Esecuzione effettiva di get_formazioni_by_status (mirror o query paginata)."""
+        if self.mirror is not None:
+            return await self._read_from_mirror(self.mirror.get_by_status, status)
+        
+        # 1. Costruisci query con QueryBuilder
+        query = self.query_builder.build_status_filter_query(
+            status=status,
+            database_id=self.client.get_database_id()
+        )
+        
+        # 2. Esegui query paginata e parsa risultati (tutte le pagine)
+        return await self._collect_formazioni(query)
+    
+    async def get_formazioni_grouped_by_status(self, statuses: List[str]) -> Dict:
+        """
+        Recupera formazioni di più status con una sola scansione paginata.
+        
+        OTTIMIZZAZIONE DASHBOARD: una query "or" invece di una per status,
+        risultati suddivisi localmente (ordine per data preservato).
+        
+        Args:
+            statuses: Status da recuperare (es: ["Programmata", "Calendarizzata", "Conclusa"])
+            
+        Returns:
+            Dict: {
+                'formazioni': {status: List[Dict]},
+                'stats': {status.lower(): count, 'totale': count}
+            }
+            
+        Raises:
+            NotionServiceError: Errori API o parsing dati
+        """
+        logger.info(f"Query formazioni raggruppate per status | Status: {statuses}")
+        
+        try:
+            grouped = {status: [] for status in statuses}
+            
+            if self.mirror is not None:
+                await self._ensure_mirror_fresh()
+                for status in statuses:
+                    grouped[status] = self.mirror.get_by_status(status)
+            else:
+                query = self.query_builder.build_multi_status_filter_query(
+                    statuses=statuses,
+                    database_id=self.client.get_database_id()
+                )
+                
+                for formazione in await self._collect_formazioni(query):
+                    group = grouped.get(formazione.get('Stato'))
+                    if group is not None:
+                        group.append(formazione)
+            
+            stats = {status.lower(): len(formazioni) for status, formazioni in grouped.items()}
+            stats['totale'] = sum(len(formazioni) for formazioni in grouped.values())
+            
+            logger.info(f"✅ Formazioni raggruppate | Totale: {stats['totale']} | Stats: {stats}")
+            return {'formazioni': grouped, 'stats': stats}
+            
+        except Exception as e:
+            logger.error(f"❌ Errore query raggruppata | Status: {statuses} | Error: {e}")
+            raise NotionServiceError(f"Errore recupero formazioni raggruppate: {e}")
+    
+    async def get_formazioni_in_range(self, status: str, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Recupera formazioni con status dato in un range di giorni (estremi inclusi).
+        
+        FILTRO LATO SERVER: Notion restituisce solo le righe del periodo
+        (non tutto lo storico dello status), indipendentemente dalla sua dimensione.
+        
+        NOTA TIMEZONE: il range inviato a Notion è allargato di un giorno per lato,
+        poi rifinito sul giorno di Data/Ora (stessa convenzione del parser).
+        
+        Args:
+            status: Status formazione (es: "Calendarizzata")
+            start_date: Primo giorno del range
+            end_date: Ultimo giorno del range
+            
+        Returns:
+            List[Dict]: Formazioni nel range ordinate per data/ora
+            
+        Raises:
+            NotionServiceError: Errori API o parsing dati
+        """
+        logger.info(f"Query formazioni in range | Status: '{status}' | Range: {start_date} - {end_date}")
+        
+        try:
+            if self.mirror is not None:
+                formazioni = await self._read_from_mirror(self.mirror.get_by_date_range, status, start_date, end_date)
+            else:
+                query = self.query_builder.build_date_range_filter_query(
+                    start_date=(start_date - timedelta(days=1)).isoformat(),
+                    end_date=(end_date + timedelta(days=1)).isoformat(),
+                    database_id=self.client.get_database_id(),
+                    status=status
+                )
+                
+                formazioni = [
+                    formazione for formazione in await self._collect_formazioni(query)
+                    if self._is_in_day_range(formazione, start_date, end_date)
+                ]
+            
+            logger.info(f"✅ Formazioni recuperate | Status: '{status}' | Range: {start_date} - {end_date} | Count: {len(formazioni)}")
+            return formazioni
+            
+        except Exception as e:
+            logger.error(f"❌ Errore query range | Status: '{status}' | Range: {start_date} - {end_date} | Error: {e}")
+            raise NotionServiceError(f"Errore recupero formazioni per range: {e}")
+    
+    @staticmethod
+    def _is_in_day_range(formazione: Dict, start_date: date, end_date: date) -> bool:
+        """Verifica se il giorno di inizio (orario da calendario, come Data/Ora) cade nel range."""
+        data_inizio = get_data_inizio(formazione)
+        if data_inizio is None:
+            return False
+        return start_date <= data_inizio.date() <= end_date
+    
+    async def iter_formazioni(self, query: Dict) -> AsyncIterator[Dict]:
+        """
+        Itera formazioni di una query seguendo la paginazione Notion.
+        
+        STREAMING PAGINATO:
+        - Segue has_more/next_cursor fino all'ultima pagina
+        - Richiede la pagina successiva PRIMA di parsare quella corrente
+          (fetch e parsing si sovrappongono)
+        - In memoria al massimo una response raw + quella in arrivo
+        
+        Args:
+            query: Query strutturata da NotionQueryBuilder
+            
+        Yields:
+            Dict: Formazione normalizzata (pagina per pagina)
+        """
+        async for response in self._iter_responses(query):
+            # Parsing pagina corrente mentre la successiva è in volo
+            for formazione in self.data_parser.parse_formazioni_list(response):
+                yield formazione
+    
+    async def _iter_responses(self, query: Dict) -> AsyncIterator[Dict]:
+        """
+        Itera le response raw di una query paginata (con prefetch pagina successiva).
+        
+        Args:
+            query: Query strutturata da NotionQueryBuilder
+            
+        Yields:
+            Dict: Response Notion di ogni pagina di risultati
+        """
+        query = await self._apply_projection(query)
+        await self._ensure_parser_compiled()
+        client = self.client.get_client()
+        pending = asyncio.ensure_future(client.databases.query(**query))
+        pages_count = 0
+        
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                pages_count += 1
+                
+                # Avvia subito il fetch della pagina successiva
+                next_cursor = response.get('next_cursor')
+                if response.get('has_more') and next_cursor:
+                    next_query = {**query, 'start_cursor': next_cursor}
+                    pending = asyncio.ensure_future(client.databases.query(**next_query))
+                    # Cede il controllo: la richiesta parte prima del parsing (CPU-bound)
+                    await asyncio.sleep(0)
+                
+                yield response
+            
+            logger.debug(f"Query paginata completata | Pagine: {pages_count}")
+        finally:
+            # Consumer interrotto a metà: non lasciare fetch orfani
+            if pending is not None:
+                pending.cancel()
+    
+    async def _apply_projection(self, query: Dict) -> Dict:
+        """
+        Aggiunge filter_properties alla query (solo property lette dal parser).
+        
+        Response più piccole: meno JSON da scaricare e parsare per pagina.
+        Schema non disponibile → query invariata.
+        """
+        if 'filter_properties' in query:
+            return query
+        
+        property_ids = await self.client.get_property_ids(self.data_parser.PARSED_PROPERTIES)
+        if not property_ids:
+            return query
+        return {**query, 'filter_properties': property_ids}
+    
+    async def _ensure_parser_compiled(self):
+        """
+        Compila il parser bulk dallo schema database (già in cache nel client).
+        
+        Schema non disponibile → resta il parser generico (stesso risultato, più lento).
+        """
+        if self.data_parser.is_compiled:
+            return
+        try:
+            schema = await self.client.get_database_schema()
+        except Exception as e:
+            logger.warning(f"⚠️ Schema database non disponibile, parser generico | Error: {e}")
+            return
+        self.data_parser.compile_schema(schema)
+    
+    async def _collect_formazioni(self, query: Dict) -> List[Dict]:
+        """
+        Raccoglie in lista tutte le formazioni di una query paginata.
+        
+        Con fetch condizionale attivo la scansione viene evitata se la sonda
+        di freschezza conferma che il database non è cambiato.
+        """
+        if self.freshness is None:
+            return [formazione async for formazione in self.iter_formazioni(query)]
+        
+        key = json.dumps(query, sort_keys=True, default=str)
+        try:
+            marker = await self._probe_freshness()
+        except Exception as e:
+            logger.warning(f"⚠️ Sonda freschezza fallita, scansione completa | Error: {e}")
+            return [formazione async for formazione in self.iter_formazioni(query)]
+        
+        cached = self.freshness.get(key, marker)
+        if cached is not None:
+            logger.debug(f"Database invariato, risultati riusati | Count: {len(cached)}")
+            return cached
+        
+        # Database cambiato: la cache query del client potrebbe essere obsoleta
+        fetched_at = datetime.now(timezone.utc)
+        with self.client.bypass_cache():
+            formazioni = [formazione async for formazione in self.iter_formazioni(query)]
+        self.freshness.store(key, formazioni, marker, fetched_at)
+        return formazioni
+    
+    async def _probe_freshness(self):
+        """
+        Marker di freschezza del database (pagina modificata più di recente).
+        
+        Sonda riusata per PROBE_TTL_SECONDS: le letture di una stessa
+        dashboard condividono una sola richiesta.
+        """
+        marker = self.freshness.get_probe()
+        if marker is not None:
+            return marker
+        
+        query = self.query_builder.build_freshness_probe_query(self.client.get_database_id())
+        with self.client.bypass_cache():
+            response = await self.client.get_client().databases.query(**query)
+        
+        marker = self.freshness.marker_from_response(response)
+        self.freshness.set_probe(marker)
+        return marker
+    
+    def _invalidate_reads(self, notion_id: str = None):
+        """Dopo una scrittura: scarta cache query, letture in volo e risultati condizionali."""
+        self.client.invalidate_cache(notion_id)
+        self._single_flight.forget()
+        if self.freshness is not None:
+            self.freshness.invalidate()
+    
+    # ===============================
+    # MIRROR LOCALE
+    # ===============================
+    
+    async def sync_mirror(self, full: bool = False) -> Dict:
+        """
+        Sincronizza il mirror locale con Notion.
+        
+        SYNC INCREMENTALE: solo pagine con last_edited_time >= watermark.
+        SYNC COMPLETO: tutte le pagine, rimuove dal mirror quelle eliminate
+        (Notion non restituisce le pagine cancellate nel delta).
+        
+        Args:
+            full: True per sync completo
+            
+        Returns:
+            Dict: Riepilogo sync {'mode', 'upserted', 'deleted', 'watermark'}
+            
+        Raises:
+            NotionServiceError: Mirror non configurato
+        """
+        if self.mirror is None:
+            raise NotionServiceError("Mirror locale non configurato (NOTION_MIRROR_PATH)")
+        
+        watermark = None if full else self.mirror.get_watermark()
+        query = self.query_builder.build_last_edited_filter_query(
+            since=watermark,
+            database_id=self.client.get_database_id()
+        )
+        
+        upserts, deleted_ids, seen_ids = [], [], set()
+        new_watermark = watermark
+        
+        # Il delta deve riflettere lo stato reale: niente cache query
+        with self.client.bypass_cache():
+            async for response in self._iter_responses(query):
+                for page in response.get('results', []):
+                    edited = page.get('last_edited_time')
+                    if edited and (new_watermark is None or edited > new_watermark):
+                        new_watermark = edited
+                    
+                    if page.get('archived') or page.get('in_trash'):
+                        deleted_ids.append(page.get('id'))
+                        continue
+                    
+                    formazione = self.data_parser.parse_single_formazione(page)
+                    if formazione is None:
+                        # Pagina diventata incompleta: non più servibile
+                        deleted_ids.append(page.get('id'))
+                        continue
+                    
+                    upserts.append((formazione, edited))
+                    seen_ids.add(formazione['id'])
+        
+        upserted = self.mirror.apply_changes(upserts, deleted_ids)
+        removed = len(deleted_ids)
+        if full:
+            removed += self.mirror.retain_only(seen_ids)
+        self.mirror.mark_synced(new_watermark, full=full)
+        
+        mode = 'full' if full else 'delta'
+        logger.info(f"✅ Mirror sincronizzato | Modo: {mode} | Aggiornate: {upserted} | Rimosse: {removed}")
+        return {'mode': mode, 'upserted': upserted, 'deleted': removed, 'watermark': new_watermark}
+    
+    async def _ensure_mirror_fresh(self):
+        """
+        Sincronizza il mirror se l'ultimo sync è più vecchio dell'intervallo.
+        
+        - Un solo sync alla volta (richieste concorrenti servono il mirror attuale)
+        - Sync completo periodico per rilevare pagine eliminate
+        - Notion non raggiungibile → si servono i dati locali (se presenti)
+        """
+        since_sync = self.mirror.seconds_since_sync()
+        if since_sync is not None and since_sync < self.mirror_sync_seconds:
+            return
+        
+        while not self._mirror_sync_lock.acquire(blocking=False):
+            if self.mirror.is_initialized():
+                return
+            # Primo sync in corso altrove: attendi che il mirror sia popolato
+            await asyncio.sleep(0.05)
+        
+        try:
+            # Un altro sync potrebbe essere appena terminato
+            since_sync = self.mirror.seconds_since_sync()
+            if since_sync is not None and since_sync < self.mirror_sync_seconds:
+                return
+            
+            last_full = self.mirror.get_last_full_sync_time()
+            full = last_full is None or time.time() - last_full >= self.mirror_full_sync_seconds
+            await self.sync_mirror(full=full)
+            
+        except Exception as e:
+            if not self.mirror.is_initialized():
+                raise
+            logger.warning(f"⚠️ Sync mirror fallito, uso dati locali | Error: {e}")
+        finally:
+            self._mirror_sync_lock.release()
+    
+    async def _read_from_mirror(self, reader, *args) -> List[Dict]:
+        """Esegue una lettura sul mirror dopo averne verificato la freschezza."""
+        await self._ensure_mirror_fresh()
+        return reader(*args)
+    
+    def get_change_marker(self) -> Optional[int]:
+        """
+        Marker economico che cambia quando le formazioni locali cambiano.
+        
+        Con mirror abilitato è la revisione SQLite: il file è condiviso tra
+        processi, quindi una scrittura fatta da Flask è visibile al processo bot
+        senza chiamate Notion. Senza mirror ritorna None (nessun segnale:
+        le cache dei chiamanti si affidano alla sola scadenza).
+        
+        Returns:
+            Optional[int]: Revisione mirror o None
+        """
+        if self.mirror is None:
+            return None
+        return self.mirror.get_revision()
+    
+    async def update_formazione(self, notion_id: str, updates: Dict) -> Optional[Formazione]:
         """
         Aggiorna formazione con campi multipli in una singola operazione atomica.
         
@@ -116,22 +539,34 @@ class NotionService:
             updates: Dict con campi da aggiornare (es: {'Stato': 'Calendarizzata', 'Codice': 'IT-01'})
             
         Returns:
-            bool: True se aggiornamento riuscito
+            Formazione: Formazione aggiornata (dalla response di Notion, nessuna rilettura),
+                        None se la scrittura è riuscita ma la pagina aggiornata non è parsabile
             
         Raises:
-            NotionServiceError: Errori API o validazione
+            NotionServiceError: Aggiornamento fallito (errori API o validazione)
         """
         logger.info(f"Aggiornamento formazione | ID: ...{notion_id[-8:]} | Campi: {list(updates.keys())}")
         
         try:
-            success = await self.crud_operations.update_multiple_fields(notion_id, updates)
+            formazione = await self.crud_operations.update_multiple_fields(notion_id, updates, self.data_parser)
             
-            if success:
+            # Le query in cache (o in volo) potrebbero contenere la formazione modificata
+            self._invalidate_reads(notion_id)
+            
+            # Scrittura confermata da Notion: allinea subito il mirror con la pagina aggiornata
+            # (o con i soli campi scritti se la pagina restituita non è parsabile)
+            if self.mirror is not None:
+                if formazione is not None:
+                    self.mirror.upsert_formazione(formazione)
+                else:
+                    self.mirror.patch_formazione(notion_id, updates)
+            
+            if formazione is not None:
                 logger.info(f"Formazione {notion_id} aggiornata con successo")
             else:
-                logger.error(f"Fallito aggiornamento formazione {notion_id}")
+                logger.warning(f"⚠️ Formazione {notion_id} aggiornata, pagina restituita non parsabile")
             
-            return success
+            return formazione
             
         except Exception as e:
             logger.error(f"❌ Errore aggiornamento formazione | ID: ...{notion_id[-8:]} | Error: {e}")
@@ -145,7 +580,7 @@ class NotionService:
         Mantenuto per backward compatibility.
         """
         logger.warning("⚠️ DEPRECATED: update_formazione_status | Usa update_formazione invece")
-        return await self.update_formazione(notion_id, {'Stato': new_status})
+        return await self._update_succeeded(notion_id, {'Stato': new_status})
     
     async def update_codice_e_link(self, notion_id: str, codice: str, link_teams: str) -> bool:
         """
@@ -155,34 +590,61 @@ class NotionService:
         Mantenuto per backward compatibility.
         """
         logger.warning("⚠️ DEPRECATED: update_codice_e_link | Usa update_formazione invece")
-        return await self.update_formazione(notion_id, {
+        return await self._update_succeeded(notion_id, {
             'Codice': codice,
             'Link Teams': link_teams
         })
     
+    async def _update_succeeded(self, notion_id: str, updates: Dict) -> bool:
+        """Esito booleano di update_formazione (True anche se la pagina restituita non è parsabile)."""
+        try:
+            await self.update_formazione(notion_id, updates)
+            return True
+        except NotionServiceError:
+            return False
+    
     async def get_formazione_by_id(self, notion_id: str) -> Optional[Dict]:
         """
         Recupera formazione specifica per ID Notion.
         
-        Delega a CrudOperations.
+        Delega a CrudOperations (chiamate concorrenti sullo stesso ID coalescenti).
         """
-        return await self.crud_operations.get_formazione_by_id(notion_id, self.data_parser)
+        return await self._single_flight.do(
+            ('by_id', notion_id),
+            lambda: self.crud_operations.get_formazione_by_id(notion_id, self.data_parser)
+        )
     
-    async def test_connection(self) -> Dict:
+    async def test_connection(self, force: bool = False) -> Dict:
         """
         Testa connessione API Notion e configurazione database.
         
-        Delega a Diagnostics.
+        Delega a Diagnostics (probe concorrenti, risultato in cache per
+        NOTION_HEALTH_CACHE_SECONDS; force=True per ripetere subito).
+        """
+        return await self.diagnostics.test_connection(force=force)
+    
+    def get_readiness(self) -> Dict:
+        """
+        Readiness istantanea per health probe esterni (ultimo stato noto).
+        
+        Delega a Diagnostics: nessuna chiamata Notion nel chiamante,
+        stato rinfrescato in background quando scaduto.
         """
-        return await self.diagnostics.test_connection()
+        return self.diagnostics.get_readiness()
     
     def get_service_stats(self) -> Dict:
         """
-        Statistiche interne servizio per monitoring.
+        Statistiche interne servizio per monitoring (incluse hit/miss cache query).
         
-        Delega a Diagnostics.
+        Delega a Diagnostics (+ stato mirror locale se abilitato).
         """
-        return self.diagnostics.get_service_stats()
+        stats = self.diagnostics.get_service_stats()
+        stats['single_flight'] = self._single_flight.get_stats()
+        if self.freshness is not None:
+            stats['conditional_fetch'] = self.freshness.get_stats()
+        if self.mirror is not None:
+            stats['mirror'] = self.mirror.get_stats()
+        return stats
     
     # ===============================
     # API ESTESE - NUOVE FUNZIONALITÀ
@@ -197,13 +659,15 @@ class NotionService:
         logger.info(f"Query formazioni by area | Area: '{area}'")
         
         try:
-            query = self.query_builder.build_area_filter_query(
-                area=area,
-                database_id=self.client.get_database_id()
-            )
-            
-            response = self.client.get_client().databases.query(**query)
-            formazioni = self.data_parser.parse_formazioni_list(response)
+            if self.mirror is not None:
+                formazioni = await self._read_from_mirror(self.mirror.get_by_area, area)
+            else:
+                query = self.query_builder.build_area_filter_query(
+                    area=area,
+                    database_id=self.client.get_database_id()
+                )
+                
+                formazioni = await self._collect_formazioni(query)
             
             logger.info(f"✅ Formazioni recuperate | Area: '{area}' | Count: {len(formazioni)}")
             return formazioni
@@ -221,14 +685,16 @@ class NotionService:
         logger.info(f"Query formazioni con filtri combinati | Status: '{status}' | Area: '{area}'")
         
         try:
-            query = self.query_builder.build_combined_filter_query(
-                status=status,
-                area=area,
-                database_id=self.client.get_database_id()
-            )
-            
-            response = self.client.get_client().databases.query(**query)
-            formazioni = self.data_parser.parse_formazioni_list(response)
+            if self.mirror is not None:
+                formazioni = await self._read_from_mirror(self.mirror.get_by_status_and_area, status, area)
+            else:
+                query = self.query_builder.build_combined_filter_query(
+                    status=status,
+                    area=area,
+                    database_id=self.client.get_database_id()
+                )
+                
+                formazioni = await self._collect_formazioni(query)
             
             logger.info(f"✅ Formazioni recuperate | Filtri combinati | Count: {len(formazioni)}")
             return formazioni
@@ -249,18 +715,70 @@ class NotionService:
         """
         Aggiorna status per batch di formazioni.
         
-        NUOVA FUNZIONALITÀ per operazioni bulk.
+        NUOVA FUNZIONALITÀ per operazioni bulk (update concorrenti e rate-limited).
+        """
+        try:
+            result = await self.crud_operations.batch_update_status(formazioni_ids, new_status)
+        finally:
+            self._invalidate_reads()
+        
+        if self.mirror is not None:
+            failed_ids = set(result.get('failed_ids', []))
+            for notion_id in formazioni_ids:
+                if notion_id not in failed_ids:
+                    self.mirror.patch_formazione(notion_id, {'Stato': new_status})
+        
+        return result
+    
+    async def iter_batch_update_status(self, formazioni_ids: List[str], new_status: str) -> AsyncIterator[tuple]:
         """
-        return await self.crud_operations.batch_update_status(formazioni_ids, new_status)
+        Aggiorna status per batch di formazioni restituendo i risultati man mano.
+        
+        Update concorrenti e rate-limited (delega a CrudOperations);
+        mirror locale aggiornato per ogni update riuscito.
+        
+        Yields:
+            tuple: (ID formazione, successo) in ordine di completamento
+        """
+        try:
+            async for notion_id, success in self.crud_operations.iter_batch_update_status(formazioni_ids, new_status):
+                if success and self.mirror is not None:
+                    self.mirror.patch_formazione(notion_id, {'Stato': new_status})
+                yield notion_id, success
+        finally:
+            self._invalidate_reads()
+
+
+def _copy_formazioni(result):
+    """Copia risultato single-flight (formazione o lista) per un chiamante coalescente."""
+    if isinstance(result, list):
+        return [formazione.copy() for formazione in result]
+    return result.copy() if result is not None else None
 
 
 class NotionServiceError(Exception):
     """Eccezione specifica per errori NotionService."""
-    pass
+    
+    @property
+    def transient(self) -> bool:
+        """
+        True se causata da un errore transitorio Notion (429, 5xx, timeout) a retry esauriti.
+        
+        Ripetere subito l'operazione, anche divisa in più richieste, aggiunge
+        solo carico sul rate limit condiviso mentre Notion è in difficoltà.
+        """
+        cause = self.__cause__ or self.__context__
+        while cause is not None:
+            if is_transient_error(cause):
+                return True
+            cause = cause.__cause__ or cause.__context__
+        return False
 
 
 # Export pubblici per backward compatibility
 __all__ = [
     'NotionService',
-    'NotionServiceError'
+    'NotionServiceError',
+    'NotionLocalMirror',
+    'Formazione'
 ]
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+CompiledFormazioneParser - Parsing bulk compilato dallo schema database
+
+Questo modulo gestisce:
+- Compilazione, dallo schema (databases.retrieve), di un estrattore specializzato per property
+- Parsing di intere liste di pagine in un unico ciclo (niente dispatch generico per campo)
+- Validazione senza strutture temporanee, log aggregato delle pagine incomplete
+- Fallback al parser generico per pagine anomale
+
+Stesso output di NotionDataParser.parse_single_formazione (record Formazione).
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .formazione import DEFAULT_TIMEZONE, Formazione
+
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================
+# ESTRATTORI PER TIPO PROPERTY
+# ===============================
+
+def _compile_plain_text(key: str) -> Callable[[Optional[Dict]], str]:
+    """Estrattore testo per property title / rich_text."""
+    def extract(prop):
+        if not prop:
+            return ''
+        parts = prop.get(key)
+        if not parts:
+            return ''
+        if len(parts) == 1:
+            return parts[0].get('plain_text', '')
+        return ''.join([part.get('plain_text', '') for part in parts])
+    return extract
+
+
+def _compile_option_name(key: str) -> Callable[[Optional[Dict]], str]:
+    """Estrattore nome opzione per property status / select."""
+    def extract(prop):
+        if not prop:
+            return ''
+        option = prop.get(key)
+        return option.get('name', '') if option else ''
+    return extract
+
+
+def _extract_url(prop: Optional[Dict]) -> str:
+    """Estrattore property url."""
+    return (prop.get('url') or '') if prop else ''
+
+
+def _extract_multi_select(prop: Optional[Dict]) -> List[str]:
+    """Estrattore property multi_select come lista (valori vuoti esclusi)."""
+    if not prop:
+        return []
+    options = prop.get('multi_select')
+    if not options:
+        return []
+    return [name for option in options if (name := option.get('name'))]
+
+
+def _extract_select_as_list(prop: Optional[Dict]) -> List[str]:
+    """Estrattore property select come lista di un elemento."""
+    if not prop:
+        return []
+    option = prop.get('select')
+    name = option.get('name', '') if option else ''
+    return [name] if name else []
+
+
+def _compile_datetime(resolve_timezone: Callable) -> Callable[[Optional[Dict]], Tuple[Optional[datetime], str]]:
+    """
+    Estrattore property date → (datetime aware, 'dd/mm/YYYY HH:MM').
+
+    Stesse regole di NotionDataParser.extract_datetime_property:
+    offset originale, altrimenti time_zone della property o default;
+    solo data → 09:00. Data malformata → (None, stringa originale).
+    """
+    fromisoformat = datetime.fromisoformat
+
+    def extract(prop):
+        if not prop:
+            return None, ''
+        date_obj = prop.get('date')
+        if not date_obj:
+            return None, ''
+        start = date_obj.get('start')
+        if not start:
+            return None, ''
+        try:
+            if 'T' in start:
+                dt = fromisoformat(start.replace('Z', '+00:00'))
+            else:
+                dt = fromisoformat(start + 'T09:00:00')
+        except ValueError:
+            return None, start
+        if dt.tzinfo is None:
+            time_zone = date_obj.get('time_zone')
+            dt = dt.replace(tzinfo=resolve_timezone(time_zone) if time_zone else DEFAULT_TIMEZONE)
+        if len(start) >= 16 and start[10] == 'T' and start[13] == ':':
+            # Orario "da calendario" = cifre della stringa ISO (nessuna conversione di offset)
+            return dt, f"{start[8:10]}/{start[5:7]}/{start[:4]} {start[11:16]}"
+        return dt, f"{dt.day:02d}/{dt.month:02d}/{dt.year:04d} {dt.hour:02d}:{dt.minute:02d}"
+    return extract
+
+
+def _missing_text(prop) -> str:
+    return ''
+
+
+def _missing_list(prop) -> List[str]:
+    return []
+
+
+def _missing_date(prop) -> Tuple[None, str]:
+    return None, ''
+
+
+# Tipo valore atteso → {tipo property Notion → estrattore}
+_TEXT_EXTRACTORS = {
+    'title': _compile_plain_text('title'),
+    'rich_text': _compile_plain_text('rich_text'),
+    'status': _compile_option_name('status'),
+    'select': _compile_option_name('select'),
+    'url': _extract_url
+}
+_LIST_EXTRACTORS = {
+    'multi_select': _extract_multi_select,
+    'select': _extract_select_as_list
+}
+
+
+class CompiledFormazioneParser:
+    """
+    Parser formazioni specializzato sullo schema del database.
+
+    RESPONSABILITÀ:
+    - Scegliere UNA volta, in base al tipo dichiarato nello schema, l'estrattore di ogni property
+    - Parsare liste di pagine in un ciclo unico con estrattori già risolti
+    - Delegare al parser generico le pagine che sollevano eccezioni
+
+    Property dichiarate con un tipo diverso da quello usuale (es: 'Stato' come select)
+    vengono lette comunque con l'estrattore corretto.
+    """
+
+    # Campo formazione → tipo valore prodotto
+    FIELD_KINDS = {
+        'Nome': 'text',
+        'Area': 'list',
+        'Date': 'date',
+        'Stato': 'text',
+        'Codice': 'text',
+        'Link Teams': 'text',
+        'Periodo': 'text'
+    }
+
+    def __init__(self, schema: Dict[str, Dict], fallback: Callable[[Dict], Optional[Formazione]],
+                 resolve_timezone: Callable):
+        """
+        Compila estrattori dallo schema database.
+
+        Args:
+            schema: Schema da NotionClient.get_database_schema() (nome → {'id', 'type'})
+            fallback: Parser generico per singola pagina (pagine anomale)
+            resolve_timezone: Risoluzione time_zone IANA delle property date
+        """
+        self._fallback = fallback
+        self.property_types = {}
+
+        extractors = {}
+        for field, kind in self.FIELD_KINDS.items():
+            prop_type = (schema.get(field) or {}).get('type')
+            self.property_types[field] = prop_type
+            extractors[field] = self._compile_field(field, kind, prop_type, resolve_timezone)
+
+        self._nome = extractors['Nome']
+        self._area = extractors['Area']
+        self._date = extractors['Date']
+        self._stato = extractors['Stato']
+        self._codice = extractors['Codice']
+        self._link_teams = extractors['Link Teams']
+        self._periodo = extractors['Periodo']
+
+        logger.debug(f"Parser formazioni compilato | Tipi: {self.property_types}")
+
+    @staticmethod
+    def _compile_field(field: str, kind: str, prop_type: Optional[str], resolve_timezone: Callable) -> Callable:
+        """Estrattore per un campo (costante vuota se property assente o tipo non gestito)."""
+        if kind == 'date':
+            if prop_type == 'date':
+                return _compile_datetime(resolve_timezone)
+            extractor = None
+        elif kind == 'list':
+            extractor = _LIST_EXTRACTORS.get(prop_type)
+        else:
+            extractor = _TEXT_EXTRACTORS.get(prop_type)
+
+        if extractor is not None:
+            return extractor
+
+        if prop_type is None:
+            logger.warning(f"⚠️ Property '{field}' non presente nello schema database")
+        else:
+            logger.warning(f"⚠️ Property '{field}' di tipo non supportato: {prop_type}")
+        return {'date': _missing_date, 'list': _missing_list}.get(kind, _missing_text)
+
+    def parse_pages(self, pages: Iterable[Dict]) -> List[Formazione]:
+        """
+        Parsa una lista di pagine Notion in formazioni (scarta le incomplete).
+
+        Args:
+            pages: Pagine da response databases.query ('results')
+
+        Returns:
+            List[Formazione]: Formazioni valide, nell'ordine delle pagine
+        """
+        get_nome, get_area, get_date, get_stato = self._nome, self._area, self._date, self._stato
+        get_codice, get_link_teams, get_periodo = self._codice, self._link_teams, self._periodo
+
+        formazioni = []
+        append = formazioni.append
+        incomplete_ids = []
+
+        for page in pages:
+            try:
+                properties = page['properties']
+                notion_id = page.get('id')
+                nome = get_nome(properties.get('Nome'))
+                area = get_area(properties.get('Area'))
+                data_inizio, data_ora = get_date(properties.get('Date'))
+                stato = get_stato(properties.get('Stato'))
+
+                if not (nome and area and data_ora and stato and notion_id):
+                    incomplete_ids.append(notion_id)
+                    continue
+
+                append(Formazione(
+                    notion_id, nome, area, data_inizio, stato,
+                    get_codice(properties.get('Codice')),
+                    get_link_teams(properties.get('Link Teams')),
+                    get_periodo(properties.get('Periodo')),
+                    notion_id, data_ora
+                ))
+            except Exception:
+                # Pagina anomala: stesso comportamento (e log) del parser generico
+                formazione = self._fallback(page)
+                if formazione:
+                    append(formazione)
+
+        if incomplete_ids:
+            preview = ', '.join(str(notion_id)[:8] for notion_id in incomplete_ids[:5])
+            logger.warning(f"⚠️ Formazioni incomplete scartate: {len(incomplete_ids)} | ID: {preview}")
+
+        return formazioni
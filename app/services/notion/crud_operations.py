@@ -12,8 +12,9 @@ NotionCrudOperations - Operazioni CRUD su database Not                "propertie
 - Operazioni batch e transazioni
 """
 
+import asyncio
 import logging
-from typing import Dict, Optional, List
+from typing import AsyncIterator, Dict, Optional, List, Tuple
 from notion_client.errors import APIResponseError
 
 
@@ -31,6 +32,9 @@ class NotionCrudOperations:
     - Gestione errori operazioni critiche
     """
     
+    # Update in volo contemporaneamente nei batch (il ritmo lo decide il rate limiter)
+    BATCH_MAX_CONCURRENCY = 5
+    
     def __init__(self, notion_client):
         """
         Inizializza CRUD operations.
@@ -38,9 +42,14 @@ class NotionCrudOperations:
         Args:
             notion_client: Client Notion autenticato
         """
-        self.client = notion_client.get_client()
+        self.notion_client = notion_client
         logger.debug("NotionCrudOperations inizializzato")
     
+    @property
+    def client(self):
+        """Client Notion asincrono dell'event loop corrente."""
+        return self.notion_client.get_client()
+    
     async def update_formazione_status(self, notion_id: str, new_status: str) -> bool:
         """
         Aggiorna status di una formazione specifica.
@@ -59,7 +68,7 @@ class NotionCrudOperations:
         logger.info(f"Aggiorno status | ID: ...{notion_id[-8:]} | Status: {new_status}")
         
         try:
-            response = self.client.pages.update(
+            response = await self.client.pages.update(
                 page_id=notion_id,
                 properties={
                     "Stato": {
@@ -117,7 +126,7 @@ class NotionCrudOperations:
                     "url": link_teams
                 }
             
-            response = self.client.pages.update(
+            response = await self.client.pages.update(
                 page_id=notion_id,
                 properties=properties
             )
@@ -151,7 +160,13 @@ class NotionCrudOperations:
         logger.debug(f"Recupero formazione | ID: ...{notion_id[-8:]}")
         
         try:
-            response = self.client.pages.retrieve(page_id=notion_id)
+            # Projection: solo le property lette dal parser
+            retrieve_kwargs = {'page_id': notion_id}
+            property_ids = await self.notion_client.get_property_ids(data_parser.PARSED_PROPERTIES)
+            if property_ids:
+                retrieve_kwargs['filter_properties'] = property_ids
+            
+            response = await self.client.pages.retrieve(**retrieve_kwargs)
             formazione = data_parser.parse_single_formazione(response)
             
             if formazione:
@@ -168,18 +183,26 @@ class NotionCrudOperations:
             logger.error(f"Errore generico recupero formazione {notion_id}: {e}")
             return None
     
-    async def update_multiple_fields(self, notion_id: str, updates: Dict) -> bool:
+    async def update_multiple_fields(self, notion_id: str, updates: Dict, data_parser) -> Optional[Dict]:
         """
         Aggiorna multipli campi in una singola operazione.
         
         OPERAZIONE ATOMICA per aggiornamenti complessi.
+        pages.update restituisce la pagina completa aggiornata: viene parsata
+        e ritornata, così il chiamante non deve rileggerla (read-your-writes).
         
         Args:
             notion_id: ID interno Notion della formazione
             updates: Dizionario con campi da aggiornare
+            data_parser: Parser per conversione pagina aggiornata
         
         Returns:
-            bool: True se aggiornamento successful
+            Formazione: Formazione aggiornata, o None se la scrittura è riuscita
+                        ma la pagina aggiornata non è parsabile
+        
+        Raises:
+            APIResponseError: Aggiornamento rifiutato da Notion (nessuna scrittura)
+            Exception: Altri errori di rete/client durante l'aggiornamento
         """
         logger.info(f"Aggiorno multipli campi | ID: ...{notion_id[-8:]} | Campi: {list(updates.keys())}")
         
@@ -198,26 +221,66 @@ class NotionCrudOperations:
                     properties["Link Teams"] = {"url": value}
                 # Aggiungi altri campi se necessario
             
-            response = self.client.pages.update(
+            response = await self.client.pages.update(
                 page_id=notion_id,
                 properties=properties
             )
             
             logger.info(f"✅ Multipli campi aggiornati | ID: ...{notion_id[-8:]} | Campi: {list(updates.keys())}")
-            return True
             
         except APIResponseError as e:
             logger.error(f"Errore aggiornamento multiplo {notion_id}: {e}")
-            return False
+            raise
         except Exception as e:
             logger.error(f"Errore generico aggiornamento multiplo {notion_id}: {e}")
-            return False
+            raise
+        
+        # Scrittura già confermata: un errore di parsing non la rende fallita
+        formazione = data_parser.parse_single_formazione(response)
+        if formazione is None:
+            logger.warning(f"⚠️ Pagina aggiornata non parsabile | ID: ...{notion_id[-8:]}")
+        return formazione
+    
+    async def iter_batch_update_status(self, formazioni_ids: List[str], new_status: str,
+                                       max_concurrency: int = None) -> AsyncIterator[Tuple[str, bool]]:
+        """
+        Aggiorna status per batch di formazioni, restituendo i risultati man mano.
+        
+        CONCORRENZA LIMITATA:
+        - Al massimo max_concurrency update in volo
+        - Ogni richiesta passa dal rate limiter condiviso del client (con retry
+          su 429/5xx): la durata totale dipende dal limite Notion, non dalla
+          somma delle latenze
+        
+        Args:
+            formazioni_ids: Lista ID formazioni da aggiornare
+            new_status: Nuovo status per tutte
+            max_concurrency: Update simultanei (default BATCH_MAX_CONCURRENCY)
+        
+        Yields:
+            Tuple[str, bool]: (ID formazione, successo) in ordine di completamento
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.BATCH_MAX_CONCURRENCY)
+        
+        async def update_one(notion_id: str) -> Tuple[str, bool]:
+            async with semaphore:
+                return notion_id, await self.update_formazione_status(notion_id, new_status)
+        
+        tasks = [asyncio.ensure_future(update_one(notion_id)) for notion_id in formazioni_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer interrotto: annulla gli update non ancora partiti
+            for task in tasks:
+                task.cancel()
     
     async def batch_update_status(self, formazioni_ids: List[str], new_status: str) -> Dict:
         """
         Aggiorna status per batch di formazioni.
         
         UTILE PER: Operazioni bulk (es: chiusura fine anno)
+        Update concorrenti e rate-limited (vedi iter_batch_update_status).
         
         Args:
             formazioni_ids: Lista ID formazioni da aggiornare
@@ -234,12 +297,15 @@ class NotionCrudOperations:
             'total': len(formazioni_ids)
         }
         
-        for notion_id in formazioni_ids:
-            success = await self.update_formazione_status(notion_id, new_status)
+        async for notion_id, success in self.iter_batch_update_status(formazioni_ids, new_status):
             if success:
                 results['success_count'] += 1
             else:
                 results['failed_ids'].append(notion_id)
         
+        # failed_ids nello stesso ordine dell'input (indipendente dai tempi di risposta)
+        position = {notion_id: index for index, notion_id in enumerate(formazioni_ids)}
+        results['failed_ids'].sort(key=position.get)
+        
         logger.info(f"✅ Batch update completato | Successo: {results['success_count']}/{results['total']}")
-        return results
\ No newline at end of file
+        return results
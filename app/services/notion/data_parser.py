@@ -6,11 +6,16 @@ Questo modulo gestisce:
 - Mapping da formato Notion a formato interno
 - Validazione e normalizzazione dati
 - Gestione robusta di campi malformati
+- Fast path compilato dallo schema database per parsing bulk
 """
 
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .compiled_parser import CompiledFormazioneParser
+from .formazione import DATA_ORA_FORMAT, DEFAULT_TIMEZONE, Formazione
 
 
 logger = logging.getLogger(__name__)
@@ -27,15 +32,37 @@ class NotionDataParser:
     - Normalizzazione formati (date, testi, URL)
     """
     
+    # Property lette da parse_single_formazione (projection delle response Notion)
+    PARSED_PROPERTIES = ('Nome', 'Area', 'Date', 'Stato', 'Codice', 'Link Teams', 'Periodo')
+    
     def __init__(self):
         """Inizializza data parser."""
+        self._compiled = None
         logger.debug("NotionDataParser inizializzato")
     
+    @property
+    def is_compiled(self) -> bool:
+        """True se il fast path compilato dallo schema è attivo."""
+        return self._compiled is not None
+    
+    def compile_schema(self, schema: Optional[Dict[str, Dict]]):
+        """
+        Compila il parser bulk dallo schema database (una volta per schema).
+        
+        Args:
+            schema: Schema da NotionClient.get_database_schema() (None = torna al parser generico)
+        """
+        self._compiled = CompiledFormazioneParser(
+            schema, fallback=self.parse_single_formazione, resolve_timezone=self._resolve_timezone
+        ) if schema else None
+    
     def parse_formazioni_list(self, notion_response: Dict) -> List[Dict]:
         """
         Parsa lista completa formazioni da response Notion.
         
         METODO PRINCIPALE per parsing bulk data.
+        Con schema compilato (compile_schema) usa il fast path, altrimenti
+        parse_single_formazione pagina per pagina: stesso risultato.
         
         Args:
             notion_response: Response completa da API Notion
@@ -43,18 +70,22 @@ class NotionDataParser:
         Returns:
             List[Dict]: Lista formazioni normalizzate (filtra malformate)
         """
-        logger.debug(f"Parsing formazioni da Notion | Records raw: {len(notion_response.get('results', []))}")
+        pages = notion_response.get('results', [])
+        logger.debug(f"Parsing formazioni da Notion | Records raw: {len(pages)}")
         
-        formazioni = []
-        for page in notion_response.get('results', []):
-            formazione = self.parse_single_formazione(page)
-            if formazione:  # Filtra righe malformate
-                formazioni.append(formazione)
+        if self._compiled is not None:
+            formazioni = self._compiled.parse_pages(pages)
+        else:
+            formazioni = []
+            for page in pages:
+                formazione = self.parse_single_formazione(page)
+                if formazione:  # Filtra righe malformate
+                    formazioni.append(formazione)
         
-        logger.info(f"✅ Parsing completato | Formazioni valide: {len(formazioni)}/{len(notion_response.get('results', []))}")
+        logger.info(f"✅ Parsing completato | Formazioni valide: {len(formazioni)}/{len(pages)}")
         return formazioni
     
-    def parse_single_formazione(self, page: Dict) -> Optional[Dict]:
+    def parse_single_formazione(self, page: Dict) -> Optional[Formazione]:
         """
         Parsa singola pagina Notion in formazione interna.
         
@@ -68,11 +99,14 @@ class NotionDataParser:
         - Periodo: select → Periodo (string)
         - id: page.id → id (string, pronto per uso diretto)
         
+        La data è parsata una sola volta: Formazione.data_inizio (datetime aware)
+        e 'Data/Ora' (stringa) derivano dallo stesso valore.
+        
         Args:
             page: Pagina singola da API Notion
         
         Returns:
-            Dict: Formazione normalizzata o None se parsing fallisce
+            Formazione: Record normalizzato (accesso dict-style) o None se parsing fallisce
         """
         try:
             properties = page.get('properties', {})
@@ -81,7 +115,9 @@ class NotionDataParser:
             # Estrazione campi obbligatori
             nome = self.extract_page_title_property(properties.get('Nome'))
             area_list = self.extract_multi_select_property_as_list(properties.get('Area'))
-            data_ora = self.extract_date_property(properties.get('Date'))
+            data_inizio = self.extract_datetime_property(properties.get('Date'))
+            data_ora = (data_inizio.strftime(DATA_ORA_FORMAT) if data_inizio
+                        else self.extract_date_property(properties.get('Date')))
             status = self.extract_status_property(properties.get('Stato'))
             
             # Validazione campi critici
@@ -106,17 +142,18 @@ class NotionDataParser:
             periodo = self.extract_select_property(properties.get('Periodo')) or ''
             
             # Costruzione formazione normalizzata - FORMATO PRONTO ALL'USO
-            formazione = {
-                'id': notion_id,                # ✅ ID pronto per uso diretto
-                'Nome': nome,
-                'Area': area_list,              # ✅ Già lista: ["IT", "R&D"]
-                'Data/Ora': data_ora,
-                'Stato': status,
-                'Codice': codice,
-                'Link Teams': link_teams,
-                'Periodo': periodo,
-                '_notion_id': notion_id         # Mantieni per backward compatibility
-            }
+            formazione = Formazione(
+                id=notion_id,                   # ✅ ID pronto per uso diretto
+                nome=nome,
+                area=area_list,                 # ✅ Già lista: ["IT", "R&D"]
+                data_inizio=data_inizio,        # ✅ datetime aware, parsato una volta
+                stato=status,
+                codice=codice,
+                link_teams=link_teams,
+                periodo=periodo,
+                notion_id=notion_id,            # Mantieni per backward compatibility
+                data_ora=data_ora
+            )
             
             logger.debug(f"Formazione parsata | Nome: {nome} | Area: {', '.join(area_list)} | Data: {data_ora}")
             return formazione
@@ -241,11 +278,42 @@ class NotionDataParser:
         if not date_prop or not date_prop.get('date'):
             return ''
         
+        start_date = date_prop['date'].get('start')
+        
+        if not start_date:
+            return ''
+        
+        dt = self.extract_datetime_property(date_prop)
+        if dt is None:
+            return start_date  # Fallback a stringa originale
+        
+        # Formattazione output standard
+        formatted_date = dt.strftime(DATA_ORA_FORMAT)
+        logger.debug(f"Data convertita | Input: {start_date} | Output: {formatted_date}")
+        return formatted_date
+    
+    def extract_datetime_property(self, date_prop: Dict) -> Optional[datetime]:
+        """
+        Estrae inizio da property Date di Notion come datetime timezone-aware.
+        
+        - ISO con offset (…Z, …+02:00) → offset originale
+        - ISO senza offset → time_zone della property o timezone di default
+        - Solo data → 09:00 nella timezone di default
+        
+        Args:
+            date_prop: Property Date da API Notion
+        
+        Returns:
+            datetime: Inizio formazione, o None se assente/malformato
+        """
+        if not date_prop or not date_prop.get('date'):
+            return None
+        
         date_obj = date_prop['date']
         start_date = date_obj.get('start')
         
         if not start_date:
-            return ''
+            return None
         
         try:
             # Parsing data ISO da Notion
@@ -255,12 +323,20 @@ class NotionDataParser:
             else:
                 # Solo data, aggiungi orario default
                 dt = datetime.fromisoformat(start_date + 'T09:00:00')
-            
-            # Formattazione output standard
-            formatted_date = dt.strftime('%d/%m/%Y %H:%M')
-            logger.debug(f"Data convertita | Input: {start_date} | Output: {formatted_date}")
-            return formatted_date
-            
         except Exception as e:
             logger.warning(f"⚠️ Errore parsing data | Input: '{start_date}' | Error: {e}")
-            return start_date  # Fallback a stringa originale
\ No newline at end of file
+            return None
+        
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=self._resolve_timezone(date_obj.get('time_zone')))
+        return dt
+    
+    @staticmethod
+    def _resolve_timezone(time_zone: Optional[str]):
+        """Timezone IANA della property Date (default se assente o sconosciuta)."""
+        if time_zone:
+            try:
+                return ZoneInfo(time_zone)
+            except (ZoneInfoNotFoundError, ValueError):
+                pass
+        return DEFAULT_TIMEZONE
\ No newline at end of file
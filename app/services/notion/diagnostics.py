@@ -6,12 +6,21 @@ Questo modulo gestisce:
 - Performance monitoring e metriche
 - Error reporting e debugging
 - Validazione configurazione sistema
+- Readiness istantanea (ultimo stato noto, refresh in background)
 """
 
+import asyncio
+import copy
 import logging
-from typing import Dict
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
 from notion_client.errors import APIResponseError
 
+from app.services.single_flight import SingleFlight
+
 
 logger = logging.getLogger(__name__)
 
@@ -25,21 +34,47 @@ class NotionDiagnostics:
     - Performance metrics e statistiche
     - Validazione configurazione completa
     - Error reporting strutturato
+    
+    CACHE HEALTH CHECK:
+    Risultato di test_connection e info database riusati per
+    health_cache_seconds: probe ravvicinati non costano chiamate Notion.
     """
     
-    def __init__(self, notion_client):
+    # Validità risultato health check / info database (secondi)
+    HEALTH_CACHE_SECONDS = 30
+    
+    def __init__(self, notion_client, health_cache_seconds: float = None):
         """
         Inizializza diagnostics.
         
         Args:
             notion_client: Client Notion per test
+            health_cache_seconds: Validità cache health check (da .env se None)
         """
-        self.client = notion_client.get_client()
+        self.notion_client = notion_client
         self.database_id = notion_client.get_database_id()
         self.config_info = notion_client.get_config_info()
+        
+        if health_cache_seconds is None:
+            health_cache_seconds = float(os.getenv('NOTION_HEALTH_CACHE_SECONDS', self.HEALTH_CACHE_SECONDS))
+        self.health_cache_seconds = health_cache_seconds
+        
+        # Ultimo health check e ultima databases.retrieve: (valore, istante monotonic)
+        self._health = None
+        self._database_info = None
+        self._health_lock = threading.Lock()
+        self._readiness_refreshing = False
+        # Probe concorrenti (anche da thread diversi) → una sola chiamata per tipo
+        self._single_flight = SingleFlight(name='notion-health', copy_result=copy.deepcopy)
+        
         logger.debug("NotionDiagnostics inizializzato")
     
-    async def test_connection(self) -> Dict:
+    @property
+    def client(self):
+        """Client Notion asincrono dell'event loop corrente."""
+        return self.notion_client.get_client()
+    
+    async def test_connection(self, force: bool = False) -> Dict:
         """
         Test completo connessione API Notion e accesso database.
         
@@ -49,9 +84,26 @@ class NotionDiagnostics:
         - Accesso database formazioni
         - Validazione permissions
         
+        users.me e databases.retrieve vengono eseguiti in parallelo;
+        il risultato è riusato per health_cache_seconds.
+        
+        Args:
+            force: True per ignorare il risultato in cache
+        
         Returns:
-            Dict: Risultati dettagliati test connessione
+            Dict: Risultati dettagliati test connessione ('cached': True se dalla cache)
         """
+        if not force:
+            cached = self._get_cached(self._health)
+            if cached is not None:
+                result = copy.deepcopy(cached)
+                result['cached'] = True
+                return result
+        
+        return await self._single_flight.do(('test_connection', force), lambda: self._run_connection_test(force))
+    
+    async def _run_connection_test(self, force: bool) -> Dict:
+        """Esecuzione effettiva di test_connection (probe concorrenti)."""
         logger.info("Avvio test connessione Notion API...")
         
         result = {
@@ -61,24 +113,29 @@ class NotionDiagnostics:
             'database_info': None,
             'permissions': {},
             'error': None,
-            'response_time_ms': None
+            'response_time_ms': None,
+            'checked_at': None,
+            'cached': False
         }
         
-        try:
-            import time
-            start_time = time.time()
-            
-            # Test 1: Connessione base API
-            user_info = self.client.users.me()
+        start_time = time.time()
+        
+        # Test 1 + Test 2 in parallelo: connessione base API e accesso database formazioni
+        user_info, database_info = await asyncio.gather(
+            self.client.users.me(),
+            self._retrieve_database(force=force),
+            return_exceptions=True
+        )
+        
+        if not isinstance(user_info, BaseException):
             result['connection_ok'] = True
             result['user_info'] = {
                 'name': user_info.get('name', 'Unknown'),
                 'type': user_info.get('type', 'Unknown'),
                 'id': user_info.get('id', 'Unknown')[:8] + '...'  # ID parziale
             }
-            
-            # Test 2: Accesso database formazioni
-            database_info = self.client.databases.retrieve(database_id=self.database_id)
+        
+        if not isinstance(database_info, BaseException):
             result['database_accessible'] = True
             result['database_info'] = {
                 'title': self._extract_database_title(database_info),
@@ -90,21 +147,121 @@ class NotionDiagnostics:
             
             # Test 3: Permissions check
             result['permissions'] = self._check_database_permissions(database_info)
-            
-            # Timing
-            end_time = time.time()
-            result['response_time_ms'] = int((end_time - start_time) * 1000)
-            
-            logger.info("Test connessione completato con successo")
-            
-        except APIResponseError as e:
-            result['error'] = f"Errore API Notion: {e}"
-            logger.error(result['error'])
-        except Exception as e:
-            result['error'] = f"Errore generico: {e}"
+        
+        # Primo errore in ordine di test (autenticazione prima dell'accesso database)
+        error = next((e for e in (user_info, database_info) if isinstance(e, BaseException)), None)
+        if isinstance(error, asyncio.CancelledError):
+            raise error
+        if isinstance(error, APIResponseError):
+            result['error'] = f"Errore API Notion: {error}"
+        elif error is not None:
+            result['error'] = f"Errore generico: {error}"
+        
+        # Timing
+        result['response_time_ms'] = int((time.time() - start_time) * 1000)
+        result['checked_at'] = datetime.now(timezone.utc).isoformat()
+        
+        if result['error']:
             logger.error(result['error'])
+        else:
+            logger.info("Test connessione completato con successo")
         
-        return result
+        with self._health_lock:
+            self._health = (result, time.monotonic())
+        return copy.deepcopy(result)
+    
+    async def _retrieve_database(self, force: bool = False) -> Dict:
+        """
+        databases.retrieve con cache (condivisa da test_connection e validate_database_structure).
+        
+        Args:
+            force: True per ignorare la response in cache
+        
+        Returns:
+            Dict: Response raw databases.retrieve
+        """
+        if not force:
+            cached = self._get_cached(self._database_info)
+            if cached is not None:
+                return cached
+        
+        async def retrieve():
+            database_info = await self.client.databases.retrieve(database_id=self.database_id)
+            with self._health_lock:
+                self._database_info = (database_info, time.monotonic())
+            return database_info
+        
+        return await self._single_flight.do(('database', force), retrieve)
+    
+    def _get_cached(self, entry: Optional[tuple]):
+        """Valore di una entry (valore, istante) se ancora entro health_cache_seconds."""
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if time.monotonic() - stored_at >= self.health_cache_seconds:
+            return None
+        return value
+    
+    def get_readiness(self) -> Dict:
+        """
+        Readiness istantanea: ultimo stato noto, senza chiamate Notion.
+        
+        Se lo stato manca o è più vecchio di health_cache_seconds viene
+        avviato un test_connection in background (uno alla volta):
+        il chiamante riceve subito lo stato precedente.
+        
+        Returns:
+            Dict: {'ready', 'state' ('ready' | 'not_ready' | 'unknown'), 'stale',
+                   'checked_at', 'age_seconds', 'error'}
+        """
+        with self._health_lock:
+            health = self._health
+        
+        if health is None:
+            self._schedule_readiness_refresh()
+            return {'ready': False, 'state': 'unknown', 'stale': True,
+                    'checked_at': None, 'age_seconds': None, 'error': None}
+        
+        result, checked_at = health
+        age = time.monotonic() - checked_at
+        stale = age >= self.health_cache_seconds
+        if stale:
+            self._schedule_readiness_refresh()
+        
+        ready = result['connection_ok'] and result['database_accessible']
+        return {
+            'ready': ready,
+            'state': 'ready' if ready else 'not_ready',
+            'stale': stale,
+            'checked_at': result['checked_at'],
+            'age_seconds': round(age, 1),
+            'error': result['error']
+        }
+    
+    def _schedule_readiness_refresh(self):
+        """Avvia test_connection sul loop di background del client (se non già in corso)."""
+        with self._health_lock:
+            if self._readiness_refreshing:
+                return
+            self._readiness_refreshing = True
+        
+        async def refresh():
+            try:
+                await self.test_connection(force=True)
+            except Exception as e:
+                logger.warning(f"⚠️ Refresh readiness Notion fallito | Error: {e}")
+            finally:
+                with self._health_lock:
+                    self._readiness_refreshing = False
+        
+        coro = refresh()
+        try:
+            self.notion_client.submit_background(coro)
+        except Exception as e:
+            coro.close()
+            with self._health_lock:
+                self._readiness_refreshing = False
+            logger.warning(f"⚠️ Impossibile avviare refresh readiness | Error: {e}")
     
     def get_service_stats(self) -> Dict:
         """
@@ -115,6 +272,7 @@ class NotionDiagnostics:
         - Performance indicators
         - Resource usage
         - Cache statistics
+        - Latenze per operazione Notion (p50/p95/p99, error rate, byte)
         
         Returns:
             Dict: Metriche complete servizio
@@ -122,8 +280,11 @@ class NotionDiagnostics:
         return {
             'service_name': 'NotionService',
             'version': '2.0.0-modular',
-            'notion_client_version': 'notion-client==2.2.1',
+            'notion_client_version': 'notion-client==2.2.1 (AsyncClient)',
             'configuration': self.config_info,
+            'cache': self.notion_client.get_cache_stats(),
+            'rate_limit': self.notion_client.get_rate_limit_stats(),
+            'latency': self.notion_client.get_latency_stats(),
             'modules': {
                 'client': 'NotionClient',
                 'query_builder': 'NotionQueryBuilder', 
@@ -136,7 +297,9 @@ class NotionDiagnostics:
                 'update_status': True,
                 'update_codice_link': True,
                 'batch_operations': True,
-                'diagnostics': True
+                'query_cache': True,
+                'diagnostics': True,
+                'readiness': True
             }
         }
     
@@ -174,7 +337,7 @@ class NotionDiagnostics:
         }
         
         try:
-            database_info = self.client.databases.retrieve(database_id=self.database_id)
+            database_info = await self._retrieve_database()
             properties = database_info.get('properties', {})
             
             # Verifica campi obbligatori
@@ -0,0 +1,213 @@
+"""
+Formazione - Record compatto per formazioni normalizzate
+
+Questo modulo gestisce:
+- Record con __slots__ prodotto da NotionDataParser (niente dict per istanza)
+- Data/ora parsata UNA volta in datetime timezone-aware
+- Accesso dict-style (formazione['Nome'], .get(), **) per template e chiamanti esistenti
+- Helper per ottenere il datetime anche da formazioni dict (mock, dati legacy)
+"""
+
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+# Formato stringa 'Data/Ora' usato in tutto il sistema
+DATA_ORA_FORMAT = '%d/%m/%Y %H:%M'
+
+# Timezone di riferimento per date senza offset (stessa di CalendarOperations)
+try:
+    DEFAULT_TIMEZONE = ZoneInfo('Europe/Rome')
+except ZoneInfoNotFoundError:  # Windows senza pacchetto tzdata
+    DEFAULT_TIMEZONE = datetime.now().astimezone().tzinfo or timezone.utc
+
+
+class Formazione(MutableMapping):
+    """
+    Formazione normalizzata con layout a slot.
+
+    RESPONSABILITÀ:
+    - Memorizzare i campi della formazione senza __dict__ per istanza
+    - Esporre data_inizio (datetime aware) calcolata una sola volta
+    - Mantenere le stesse chiavi del vecchio dict ('Nome', 'Data/Ora', ...)
+
+    Chiavi non previste vengono conservate in un dict extra (creato solo se serve).
+    """
+
+    __slots__ = (
+        'id', 'nome', 'area', 'data_ora', 'data_inizio', 'stato',
+        'codice', 'link_teams', 'periodo', 'notion_id', '_extra'
+    )
+
+    # Chiave dict → slot (ordine = ordine di iterazione, come il vecchio dict)
+    FIELDS = {
+        'id': 'id',
+        'Nome': 'nome',
+        'Area': 'area',
+        'Data/Ora': 'data_ora',
+        'Stato': 'stato',
+        'Codice': 'codice',
+        'Link Teams': 'link_teams',
+        'Periodo': 'periodo',
+        '_notion_id': 'notion_id'
+    }
+
+    def __init__(self, id: str, nome: str, area: List[str], data_inizio: Optional[datetime],
+                 stato: str, codice: str = '', link_teams: str = '', periodo: str = '',
+                 notion_id: Optional[str] = None, data_ora: Optional[str] = None):
+        """
+        Crea record formazione.
+
+        Args:
+            id: ID pagina Notion
+            nome: Nome formazione
+            area: Lista aree (es: ["IT", "R&D"])
+            data_inizio: Inizio formazione (timezone-aware)
+            stato: Status formazione
+            codice: Codice formazione
+            link_teams: URL meeting Teams
+            periodo: Periodo (SPRING, AUTUMN, ...)
+            notion_id: ID per backward compatibility (default = id)
+            data_ora: Stringa 'dd/mm/YYYY HH:MM' (default = derivata da data_inizio)
+        """
+        self.id = id
+        self.nome = nome
+        self.area = area
+        self.data_inizio = data_inizio
+        self.data_ora = data_ora if data_ora is not None else (
+            data_inizio.strftime(DATA_ORA_FORMAT) if data_inizio else ''
+        )
+        self.stato = stato
+        self.codice = codice
+        self.link_teams = link_teams
+        self.periodo = periodo
+        self.notion_id = notion_id if notion_id is not None else id
+        self._extra = None
+
+    @classmethod
+    def from_dict(cls, data: Dict, data_inizio: Optional[datetime] = None) -> 'Formazione':
+        """
+        Crea record da dict formazione (mirror locale, dati legacy).
+        
+        Args:
+            data: Dict con le chiavi standard ('Nome', 'Data/Ora', ...)
+            data_inizio: Datetime già noto (evita il parsing di 'Data/Ora')
+        """
+        data_ora = data.get('Data/Ora', '')
+        formazione = cls(
+            id=data.get('id'),
+            nome=data.get('Nome', ''),
+            area=list(data.get('Area', [])),
+            data_inizio=data_inizio if data_inizio is not None else parse_data_ora(data_ora),
+            stato=data.get('Stato', ''),
+            codice=data.get('Codice', ''),
+            link_teams=data.get('Link Teams', ''),
+            periodo=data.get('Periodo', ''),
+            notion_id=data.get('_notion_id', data.get('id')),
+            data_ora=data_ora
+        )
+        for key, value in data.items():
+            if key not in cls.FIELDS:
+                formazione[key] = value
+        return formazione
+
+    def to_dict(self) -> Dict:
+        """Dict semplice (serializzazione JSON)."""
+        return dict(self.items())
+
+    def copy(self) -> 'Formazione':
+        """Copia superficiale (come dict.copy(), lista aree inclusa)."""
+        clone = Formazione.__new__(Formazione)
+        for slot in self.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        clone.area = list(self.area) if isinstance(self.area, list) else self.area
+        clone._extra = dict(self._extra) if self._extra else None
+        return clone
+
+    # ===============================
+    # PROTOCOLLO MAPPING
+    # ===============================
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self.FIELDS.get(key)
+        if slot is not None:
+            return getattr(self, slot)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        slot = self.FIELDS.get(key)
+        if slot == 'data_ora':
+            # Nuova data: ricalcola subito il datetime
+            self.data_ora = value
+            self.data_inizio = parse_data_ora(value)
+        elif slot is not None:
+            setattr(self, slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if self._extra is not None and key in self._extra:
+            del self._extra[key]
+        elif key in self.FIELDS:
+            raise TypeError(f"Campo '{key}' obbligatorio: non rimovibile da Formazione")
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"Formazione(id={self.id!r}, nome={self.nome!r}, data_ora={self.data_ora!r}, stato={self.stato!r})"
+
+
+def parse_data_ora(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """
+    Converte Data/Ora in datetime timezone-aware.
+
+    FORMATI SUPPORTATI:
+    - 'dd/mm/YYYY HH:MM' (formato interno) → DEFAULT_TIMEZONE
+    - ISO con offset ("2024-09-22T14:30:00Z") → offset originale
+    - datetime naive → DEFAULT_TIMEZONE
+
+    Returns:
+        datetime aware, o None se il valore non è parsabile
+    """
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, str) and value:
+        try:
+            if 'T' in value:
+                dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            else:
+                dt = datetime.strptime(value, DATA_ORA_FORMAT)
+        except ValueError:
+            return None
+    else:
+        return None
+
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=DEFAULT_TIMEZONE)
+
+
+def get_data_inizio(formazione) -> Optional[datetime]:
+    """
+    Datetime di inizio di una formazione (record o dict).
+
+    Formazione → valore già calcolato (nessun parsing).
+    Dict → parsing di 'Data/Ora' (mock, dati non provenienti dal parser).
+    """
+    if isinstance(formazione, Formazione):
+        return formazione.data_inizio
+    if isinstance(formazione, dict):
+        return parse_data_ora(formazione.get('Data/Ora'))
+    return None
@@ -0,0 +1,185 @@
+"""
+NotionFreshnessCache - Risultati query validati da una sonda di freschezza
+
+Questo modulo gestisce:
+- Risultati parsati delle query, associati al marker del database al momento del fetch
+- Marker di freschezza: pagina modificata più di recente (id, last_edited_time)
+- Riuso della sonda per pochi secondi (letture della stessa dashboard)
+- Statistiche sonde / hit / miss
+
+La sonda (query page_size=1 ordinata per last_edited_time) costa una richiesta
+minima: se il marker non è cambiato, la scansione completa viene evitata.
+
+LIMITI NOTI:
+- last_edited_time ha granularità al minuto: risultati letti entro un minuto
+  dall'ultima modifica non sono verificabili e vengono sempre riletti
+- Le pagine eliminate non cambiano il marker: età massima dei risultati limitata
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# (ID pagina, last_edited_time) della pagina modificata più di recente
+FreshnessMarker = Tuple[Optional[str], Optional[str]]
+
+
+class NotionFreshnessCache:
+    """
+    Cache risultati query con validazione tramite marker di freschezza.
+
+    RESPONSABILITÀ:
+    - Conservare le formazioni di ogni query con il marker letto PRIMA del fetch
+    - Restituire copie dei risultati solo se il marker attuale è identico
+    - Scartare risultati non verificabili (granularità al minuto) o troppo vecchi
+
+    Thread-safe: letture da Flask (thread per richiesta) e bot.
+    """
+
+    MAX_ENTRIES = 64
+    MAX_AGE_SECONDS = 600
+    PROBE_TTL_SECONDS = 5
+    EDIT_GRANULARITY_SECONDS = 60
+
+    def __init__(self, max_age_seconds: float = None, probe_ttl_seconds: float = None):
+        """
+        Inizializza cache vuota.
+
+        Args:
+            max_age_seconds: Età massima risultati (limite per pagine eliminate)
+            probe_ttl_seconds: Validità di una sonda (riuso tra letture ravvicinate)
+        """
+        self.max_age_seconds = self.MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        self.probe_ttl_seconds = self.PROBE_TTL_SECONDS if probe_ttl_seconds is None else probe_ttl_seconds
+
+        self._entries: OrderedDict = OrderedDict()
+        self._probe: Optional[Tuple[FreshnessMarker, float]] = None
+        self._lock = threading.Lock()
+        self._stats = {'probes': 0, 'hits': 0, 'misses': 0, 'unverifiable': 0}
+
+    # ===============================
+    # SONDA
+    # ===============================
+
+    @staticmethod
+    def marker_from_response(response: Dict) -> FreshnessMarker:
+        """
+        Estrae il marker dalla response della sonda.
+
+        Args:
+            response: Response databases.query (page_size=1, ordinata per last_edited_time)
+
+        Returns:
+            FreshnessMarker: (id, last_edited_time), (None, None) se database vuoto
+        """
+        results = response.get('results') or []
+        if not results:
+            return None, None
+        page = results[0]
+        return page.get('id'), page.get('last_edited_time')
+
+    def get_probe(self) -> Optional[FreshnessMarker]:
+        """Marker dell'ultima sonda se ancora valida, altrimenti None."""
+        with self._lock:
+            if self._probe is None:
+                return None
+            marker, probed_at = self._probe
+            if time.monotonic() - probed_at >= self.probe_ttl_seconds:
+                return None
+            return marker
+
+    def set_probe(self, marker: FreshnessMarker):
+        """Registra il marker di una sonda appena eseguita."""
+        with self._lock:
+            self._probe = (marker, time.monotonic())
+            self._stats['probes'] += 1
+
+    # ===============================
+    # RISULTATI
+    # ===============================
+
+    def get(self, key: str, marker: FreshnessMarker) -> Optional[List[Dict]]:
+        """
+        Risultati in cache per la query se il database non è cambiato.
+
+        Args:
+            key: Chiave query (JSON ordinato)
+            marker: Marker attuale del database
+
+        Returns:
+            List[Dict]: Copia delle formazioni, None se da rileggere
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is None or entry['marker'] != marker
+                    or time.monotonic() - entry['stored_at'] >= self.max_age_seconds):
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            formazioni = entry['formazioni']
+        return [formazione.copy() for formazione in formazioni]
+
+    def store(self, key: str, formazioni: List[Dict], marker: FreshnessMarker, fetched_at: datetime):
+        """
+        Salva i risultati di una query con il marker letto prima del fetch.
+
+        Risultati letti entro EDIT_GRANULARITY_SECONDS dall'ultima modifica
+        non vengono salvati: una modifica successiva nello stesso minuto
+        potrebbe lasciare il marker invariato.
+
+        Args:
+            key: Chiave query (JSON ordinato)
+            formazioni: Formazioni parsate
+            marker: Marker del database letto PRIMA del fetch
+            fetched_at: Inizio del fetch (datetime aware UTC)
+        """
+        if not self._is_verifiable(marker, fetched_at):
+            logger.debug(f"Risultati non salvati: modifica recente non verificabile | Marker: {marker}")
+            with self._lock:
+                self._stats['unverifiable'] += 1
+            return
+
+        with self._lock:
+            self._entries[key] = {
+                'formazioni': [formazione.copy() for formazione in formazioni],
+                'marker': marker,
+                'stored_at': time.monotonic()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def _is_verifiable(self, marker: FreshnessMarker, fetched_at: datetime) -> bool:
+        """True se l'ultima modifica precede il fetch di almeno un minuto intero."""
+        edited = marker[1]
+        if edited is None:
+            return True
+        try:
+            edited_at = datetime.fromisoformat(edited.replace('Z', '+00:00'))
+        except ValueError:
+            return False
+        return fetched_at - edited_at >= timedelta(seconds=self.EDIT_GRANULARITY_SECONDS)
+
+    def invalidate(self):
+        """Svuota risultati e sonda (dopo scritture dal servizio)."""
+        with self._lock:
+            self._entries.clear()
+            self._probe = None
+
+    def get_stats(self) -> Dict:
+        """Statistiche cache: sonde, hit (scansioni evitate), miss, risultati non verificabili."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
@@ -0,0 +1,365 @@
+"""
+NotionLocalMirror - Replica locale SQLite del database formazioni
+
+Questo modulo gestisce:
+- Storage locale delle formazioni già normalizzate (tabelle indicizzate)
+- Record Formazione ricostruiti con data_inizio già parsata
+- Watermark last_edited_time per sync incrementale
+- Revisione incrementata a ogni modifica (segnale di cambiamento tra processi)
+- Letture locali per status, area e range di date
+- Patch locali dopo le scritture su Notion
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from .formazione import Formazione, get_data_inizio
+
+
+logger = logging.getLogger(__name__)
+
+
+class NotionLocalMirror:
+    """
+    Mirror SQLite del database Notion formazioni.
+    
+    RESPONSABILITÀ:
+    - Persistenza formazioni normalizzate (payload JSON + colonne indicizzate)
+    - Tracciamento watermark e orario ultimo sync
+    - Query locali sub-millisecondo (funzionano anche con Notion down)
+    - Applicazione delle scritture già confermate da Notion
+    
+    Il mirror NON parla con Notion: il sync è orchestrato da NotionService.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS formazioni (
+            id TEXT PRIMARY KEY,
+            stato TEXT NOT NULL,
+            data_start TEXT,
+            data_giorno TEXT,
+            data_inizio TEXT,
+            last_edited_time TEXT,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_formazioni_stato_data ON formazioni (stato, data_start);
+        CREATE INDEX IF NOT EXISTS idx_formazioni_giorno ON formazioni (data_giorno, data_start);
+        
+        CREATE TABLE IF NOT EXISTS formazioni_aree (
+            formazione_id TEXT NOT NULL,
+            area TEXT NOT NULL,
+            PRIMARY KEY (formazione_id, area)
+        );
+        CREATE INDEX IF NOT EXISTS idx_formazioni_aree_area ON formazioni_aree (area);
+        
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    # Campi aggiornabili localmente (stessi supportati da update_multiple_fields)
+    PATCHABLE_FIELDS = ('Stato', 'Codice', 'Link', 'Link Teams')
+    
+    def __init__(self, db_path: str):
+        """
+        Inizializza mirror e crea schema se assente.
+        
+        Args:
+            db_path: Path file SQLite (':memory:' per test)
+        """
+        self.db_path = db_path
+        
+        db_dir = os.path.dirname(db_path) if db_path != ':memory:' else ''
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+        
+        # Connessione unica condivisa tra thread (Flask threaded + loop background)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        
+        with self._lock:
+            if db_path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+        
+        logger.info(f"NotionLocalMirror inizializzato | DB: {db_path} | Formazioni: {self.count()}")
+    
+    # ===============================
+    # STATO SYNC
+    # ===============================
+    
+    def get_watermark(self) -> Optional[str]:
+        """Ritorna last_edited_time massimo già sincronizzato (None se mai sincronizzato)."""
+        return self._get_state('watermark')
+    
+    def get_last_sync_time(self) -> Optional[float]:
+        """Timestamp epoch dell'ultimo sync riuscito."""
+        value = self._get_state('last_sync')
+        return float(value) if value else None
+    
+    def get_last_full_sync_time(self) -> Optional[float]:
+        """Timestamp epoch dell'ultimo sync completo (rileva anche pagine eliminate)."""
+        value = self._get_state('last_full_sync')
+        return float(value) if value else None
+    
+    def seconds_since_sync(self) -> Optional[float]:
+        """Secondi dall'ultimo sync (None se mai sincronizzato)."""
+        last_sync = self.get_last_sync_time()
+        return time.time() - last_sync if last_sync else None
+    
+    def is_initialized(self) -> bool:
+        """True se il mirror ha completato almeno un sync."""
+        return self.get_last_sync_time() is not None
+    
+    def get_revision(self) -> int:
+        """
+        Contatore modifiche del mirror, incrementato a ogni scrittura che cambia le formazioni.
+        
+        Letto dal file SQLite: vede anche le scritture di altri processi
+        (es: Flask calendarizza, il processo bot ricostruisce il calendario).
+        """
+        value = self._get_state('revision')
+        return int(value) if value else 0
+    
+    def mark_synced(self, watermark: Optional[str], full: bool = False):
+        """Registra sync completato con nuovo watermark."""
+        now = str(time.time())
+        with self._lock:
+            if watermark:
+                self._set_state('watermark', watermark)
+            self._set_state('last_sync', now)
+            if full:
+                self._set_state('last_full_sync', now)
+            self._conn.commit()
+    
+    # ===============================
+    # SCRITTURE
+    # ===============================
+    
+    def upsert_formazione(self, formazione: Dict, last_edited_time: Optional[str] = None):
+        """
+        Inserisce o aggiorna una formazione normalizzata.
+        
+        Args:
+            formazione: Formazione prodotta da NotionDataParser
+            last_edited_time: Timestamp ultima modifica Notion della pagina
+        """
+        with self._lock:
+            self._upsert(formazione, last_edited_time)
+            self._bump_revision()
+            self._conn.commit()
+    
+    def apply_changes(self, upserts: Iterable[tuple], deleted_ids: Iterable[str] = ()) -> int:
+        """
+        Applica un batch di modifiche in un'unica transazione.
+        
+        Args:
+            upserts: Coppie (formazione, last_edited_time)
+            deleted_ids: ID da rimuovere (pagine archiviate o non più valide)
+        
+        Returns:
+            int: Numero di formazioni inserite/aggiornate
+        """
+        count = 0
+        with self._lock:
+            for formazione, last_edited_time in upserts:
+                self._upsert(formazione, last_edited_time)
+                count += 1
+            deleted = 0
+            for notion_id in deleted_ids:
+                self._delete(notion_id)
+                deleted += 1
+            if count or deleted:
+                self._bump_revision()
+            self._conn.commit()
+        return count
+    
+    def retain_only(self, notion_ids: Iterable[str]) -> int:
+        """
+        Rimuove le formazioni non presenti nell'insieme dato (dopo sync completo).
+        
+        Returns:
+            int: Numero di formazioni rimosse
+        """
+        keep = set(notion_ids)
+        with self._lock:
+            existing = [row['id'] for row in self._conn.execute("SELECT id FROM formazioni")]
+            removed = [notion_id for notion_id in existing if notion_id not in keep]
+            for notion_id in removed:
+                self._delete(notion_id)
+            if removed:
+                self._bump_revision()
+            self._conn.commit()
+        return len(removed)
+    
+    def patch_formazione(self, notion_id: str, updates: Dict) -> bool:
+        """
+        Applica localmente un aggiornamento già confermato da Notion.
+        
+        Args:
+            notion_id: ID formazione
+            updates: Campi aggiornati (es: {'Stato': 'Calendarizzata', 'Codice': '...'})
+        
+        Returns:
+            bool: True se la formazione era presente nel mirror
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, data_inizio FROM formazioni WHERE id = ?", (notion_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            
+            formazione = self._row_to_formazione(row)
+            for field, value in updates.items():
+                if field in self.PATCHABLE_FIELDS:
+                    formazione[field] = value
+            
+            self._upsert(formazione, None)
+            self._bump_revision()
+            self._conn.commit()
+        
+        logger.debug(f"Mirror aggiornato | ID: ...{notion_id[-8:]} | Campi: {list(updates.keys())}")
+        return True
+    
+    # ===============================
+    # LETTURE
+    # ===============================
+    
+    def get_by_status(self, status: str) -> List[Dict]:
+        """Formazioni con status dato, ordinate per data."""
+        return self._select(
+            "SELECT payload, data_inizio FROM formazioni WHERE stato = ? ORDER BY data_start",
+            (status,)
+        )
+    
+    def get_by_area(self, area: str) -> List[Dict]:
+        """Formazioni che includono l'area data, ordinate per data."""
+        return self._select(
+            "SELECT f.payload, f.data_inizio FROM formazioni f "
+            "JOIN formazioni_aree a ON a.formazione_id = f.id "
+            "WHERE a.area = ? ORDER BY f.data_start",
+            (area,)
+        )
+    
+    def get_by_status_and_area(self, status: str, area: str) -> List[Dict]:
+        """Formazioni con status e area dati, ordinate per data."""
+        return self._select(
+            "SELECT f.payload, f.data_inizio FROM formazioni f "
+            "JOIN formazioni_aree a ON a.formazione_id = f.id "
+            "WHERE f.stato = ? AND a.area = ? ORDER BY f.data_start",
+            (status, area)
+        )
+    
+    def get_by_date_range(self, status: str, start_date: date, end_date: date) -> List[Dict]:
+        """
+        Formazioni con status dato in un range di giorni (estremi inclusi).
+        
+        Usa l'indice su data_giorno: lookup per /oggi, /domani, /settimana.
+        """
+        return self._select(
+            "SELECT payload, data_inizio FROM formazioni "
+            "WHERE data_giorno BETWEEN ? AND ? AND stato = ? ORDER BY data_start",
+            (start_date.isoformat(), end_date.isoformat(), status)
+        )
+    
+    def count(self) -> int:
+        """Numero formazioni nel mirror."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM formazioni").fetchone()[0]
+    
+    def get_stats(self) -> Dict:
+        """Statistiche mirror per monitoring."""
+        since = self.seconds_since_sync()
+        return {
+            'db_path': self.db_path,
+            'formazioni': self.count(),
+            'watermark': self.get_watermark(),
+            'revision': self.get_revision(),
+            'seconds_since_sync': round(since, 1) if since is not None else None
+        }
+    
+    def close(self):
+        """Chiude la connessione SQLite."""
+        with self._lock:
+            self._conn.close()
+    
+    # ===============================
+    # HELPER INTERNI (chiamare con lock acquisito)
+    # ===============================
+    
+    def _upsert(self, formazione: Dict, last_edited_time: Optional[str]):
+        """Scrive riga formazione + aree (lock già acquisito)."""
+        notion_id = formazione['id']
+        start = get_data_inizio(formazione)
+        # Ordinamento e indice giorno sull'orario "da calendario" (come Data/Ora)
+        wall_time = start.replace(tzinfo=None) if start else None
+        
+        self._conn.execute(
+            "INSERT INTO formazioni (id, stato, data_start, data_giorno, data_inizio, last_edited_time, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET stato = excluded.stato, data_start = excluded.data_start, "
+            "data_giorno = excluded.data_giorno, data_inizio = excluded.data_inizio, payload = excluded.payload, "
+            "last_edited_time = COALESCE(excluded.last_edited_time, formazioni.last_edited_time)",
+            (
+                notion_id,
+                formazione.get('Stato', ''),
+                wall_time.isoformat(timespec='minutes') if wall_time else None,
+                wall_time.date().isoformat() if wall_time else None,
+                start.isoformat() if start else None,
+                last_edited_time,
+                json.dumps(dict(formazione), ensure_ascii=False)
+            )
+        )
+        self._conn.execute("DELETE FROM formazioni_aree WHERE formazione_id = ?", (notion_id,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO formazioni_aree (formazione_id, area) VALUES (?, ?)",
+            [(notion_id, area) for area in formazione.get('Area', [])]
+        )
+    
+    def _delete(self, notion_id: str):
+        """Rimuove formazione e aree (lock già acquisito)."""
+        self._conn.execute("DELETE FROM formazioni WHERE id = ?", (notion_id,))
+        self._conn.execute("DELETE FROM formazioni_aree WHERE formazione_id = ?", (notion_id,))
+    
+    def _bump_revision(self):
+        """Incrementa la revisione nella stessa transazione della modifica (lock già acquisito)."""
+        self._conn.execute(
+            "INSERT INTO sync_state (key, value) VALUES ('revision', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+    
+    def _select(self, sql: str, params: tuple) -> List[Formazione]:
+        """Esegue SELECT e ricostruisce i record Formazione."""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_formazione(row) for row in rows]
+    
+    @staticmethod
+    def _row_to_formazione(row) -> Formazione:
+        """Payload JSON + data_inizio ISO → Formazione (nessun parsing di Data/Ora)."""
+        data_inizio = datetime.fromisoformat(row['data_inizio']) if row['data_inizio'] else None
+        return Formazione.from_dict(json.loads(row['payload']), data_inizio=data_inizio)
+    
+    def _get_state(self, key: str) -> Optional[str]:
+        """Legge valore da sync_state."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+    
+    def _set_state(self, key: str, value: str):
+        """Scrive valore in sync_state (lock già acquisito)."""
+        self._conn.execute(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
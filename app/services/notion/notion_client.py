@@ -6,15 +6,75 @@ Questo modulo gestisce:
 - Validazione configurazione critica
 - Gestione credenziali e sicurezza
 - Error handling di base per connessione
+- Transport asincrono con connection pool unico (sul loop di background, condiviso da tutti i loop)
+- Cache risultati query con TTL e stale-while-revalidate
+- Schema database (ID property) per projection delle response
+- Rate limiting centralizzato e retry con backoff (429 / Retry-After, 5xx)
+- Istogrammi latenza per operazione (query, retrieve, update)
 """
 
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import importlib.util
+import json
 import logging
 import os
-from notion_client import Client
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import unquote
+
+import httpx
+from notion_client import AsyncClient
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from app.services.metrics import OperationMetrics
+from app.services.rate_limiter import TokenBucket
 
 
 logger = logging.getLogger(__name__)
 
+# Richieste eseguite in questo contesto ignorano la cache query (es: sync mirror)
+_cache_bypass: contextvars.ContextVar = contextvars.ContextVar('notion_cache_bypass', default=False)
+
+# Byte del body dell'ultima response ricevuta nel contesto corrente (metriche).
+# Contatore mutabile: scritto dal loop del connection pool, letto dal chiamante
+_response_bytes: contextvars.ContextVar = contextvars.ContextVar('notion_response_bytes', default=None)
+
+
+class NotionAsyncClient(AsyncClient):
+    """
+    AsyncClient Notion che instrada ogni richiesta attraverso NotionClient.
+    
+    Tutti gli endpoint (databases, pages, users) passano da request():
+    il wrapper applica qui le ottimizzazioni trasversali (cache query,
+    rate limiting, retry).
+    """
+    
+    def __init__(self, owner: 'NotionClient', **kwargs):
+        super().__init__(**kwargs)
+        self._owner = owner
+    
+    async def request(self, path: str, method: str, query: Optional[Dict] = None,
+                      body: Optional[Dict] = None, auth: Optional[str] = None) -> Any:
+        """Richiesta API instradata tramite NotionClient (cache, rate limit, retry)."""
+        return await self._owner._dispatch(self, path, method, query, body, auth)
+    
+    async def send_request(self, path: str, method: str, query: Optional[Dict] = None,
+                           body: Optional[Dict] = None, auth: Optional[str] = None) -> Any:
+        """Richiesta HTTP diretta verso Notion (nessuna cache, nessun retry)."""
+        return await super().request(path, method, query, body, auth)
+    
+    def _parse_response(self, response: httpx.Response) -> Any:
+        """Parsing response SDK + dimensione body per le metriche."""
+        received = _response_bytes.get()
+        if received is not None:
+            received[0] = len(response.content)
+        return super()._parse_response(response)
+
 
 class NotionClient:
     """
@@ -22,18 +82,49 @@ class NotionClient:
     
     RESPONSABILITÀ:
     - Configurazione e validazione credenziali
-    - Inizializzazione client Notion ufficiale  
-    - Gestione connessione base
+    - Inizializzazione client Notion ufficiale (AsyncClient, non bloccante)
+    - Gestione connessione base e connection pool HTTP/2
     - Cache configurazione per ottimizzazioni
+    
+    EVENT LOOP:
+    Le connessioni httpx sono legate all'event loop che le ha aperte.
+    Flask crea un loop per richiesta, il bot ne usa uno persistente:
+    le richieste HTTP vengono quindi eseguite tutte sul loop di background
+    (lo stesso dei refresh cache), proprietario dell'unico connection pool.
+    Le route Flask riusano le connessioni keep-alive tra una richiesta e
+    l'altra e nessun pool resta aperto su un loop già chiuso.
     """
     
-    def __init__(self, token: str = None, database_id: str = None):
+    # Limiti connection pool (unico, condiviso da tutti gli event loop)
+    MAX_CONNECTIONS = 10
+    MAX_KEEPALIVE_CONNECTIONS = 10
+    
+    # Cache query: entro CACHE_FRESH_SECONDS la risposta è servita così com'è,
+    # fino a _cache_ttl è servita subito e rinfrescata in background
+    CACHE_FRESH_SECONDS = 30
+    CACHE_MAX_ENTRIES = 256
+    
+    # Limite medio richieste Notion (documentato: 3 req/s per integrazione)
+    RATE_LIMIT_PER_SECOND = 3.0
+    
+    # Retry su errori transitori: 429 sempre, 5xx/timeout solo se ripetibili
+    MAX_RETRIES = 4
+    RETRY_BASE_SECONDS = 0.5
+    RETRY_MAX_SECONDS = 30.0
+    RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+    
+    # Operazioni sempre presenti nelle metriche latenza
+    TRACKED_OPERATIONS = ('databases.query', 'databases.retrieve', 'pages.retrieve', 'pages.update')
+    
+    def __init__(self, token: str = None, database_id: str = None,
+                 transport: httpx.AsyncBaseTransport = None):
         """
         Inizializza client Notion con autenticazione.
         
         Args:
             token: Token Notion (da .env se None)
             database_id: ID database formazioni (da .env se None)
+            transport: Transport httpx alternativo (test, proxy); default rete reale
         
         Raises:
             ValueError: Se credenziali mancanti
@@ -46,18 +137,58 @@ class NotionClient:
         # Validazione configurazione critica
         self._validate_credentials()
         
-        # Inizializzazione client Notion
+        # HTTP/2 solo se il pacchetto h2 è disponibile
+        self.http2_enabled = importlib.util.find_spec('h2') is not None
+        self._transport = transport
+        
+        # Inizializzazione client Notion (HTTP eseguito sul loop di background)
         try:
-            self.client = Client(auth=self.token)
+            self.client = self._create_async_client()
             logger.info("NotionClient inizializzato | Database ID: ...%s", self.database_id[-8:] if len(self.database_id) > 8 else self.database_id)
         except Exception as e:
             logger.error(f"❌ Errore inizializzazione NotionClient | Error: {e}")
             raise
         
-        # Cache per ottimizzazioni
+        # Cache per ottimizzazioni (chiave: query normalizzata → (response, timestamp))
         self._cache_ttl = 300  # 5 minuti
         self._last_cache_time = None
         self._cached_data = {}
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        self._refreshing_keys = set()
+        self._cache_stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'background_refreshes': 0,
+            'invalidations': 0
+        }
+        
+        # Event loop dedicato ai refresh in background (avviato on demand)
+        self._background_loop = None
+        self._background_lock = threading.Lock()
+        
+        # Schema database (nome property → {'id', 'type'}), caricato una sola volta
+        self._database_schema = None
+        
+        # Token bucket condiviso da tutte le operazioni verso Notion (tutti gli event loop)
+        self.rate_limiter = TokenBucket(
+            rate=float(os.getenv('NOTION_RATE_LIMIT_PER_SECOND', self.RATE_LIMIT_PER_SECOND)),
+            name='notion'
+        )
+        self.max_retries = int(os.getenv('NOTION_MAX_RETRIES', self.MAX_RETRIES))
+        self._retry_lock = threading.Lock()
+        self._retry_stats = {
+            'retries': 0,
+            'rate_limited': 0,
+            'server_errors': 0,
+            'timeouts': 0,
+            'retry_wait_seconds': 0.0,
+            'gave_up': 0
+        }
+        
+        # Istogrammi latenza per operazione (ogni tentativo HTTP effettivo)
+        self.metrics = OperationMetrics(self.TRACKED_OPERATIONS)
     
     def _validate_credentials(self):
         """Valida che tutte le credenziali necessarie siano configurate."""
@@ -66,14 +197,440 @@ class NotionClient:
         if not self.database_id or not self.database_id.strip():
             raise ValueError("NOTION_DATABASE_ID non configurato")
     
-    def get_client(self) -> Client:
-        """Ritorna client Notion autenticato."""
+    def _create_async_client(self) -> AsyncClient:
+        """Crea AsyncClient Notion con connection pool httpx (keep-alive, HTTP/2)."""
+        http_client = httpx.AsyncClient(
+            http2=self.http2_enabled,
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONNECTIONS,
+                max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS
+            ),
+            transport=self._transport
+        )
+        return NotionAsyncClient(self, auth=self.token, client=http_client)
+    
+    def get_client(self) -> NotionAsyncClient:
+        """
+        Ritorna client Notion autenticato.
+        
+        Utilizzabile da qualsiasi event loop: le richieste HTTP vengono
+        eseguite sul loop di background (vedi _send_on_pool).
+        
+        Returns:
+            NotionAsyncClient: Client condiviso da tutti i chiamanti
+        """
         return self.client
     
+    async def aclose(self):
+        """Chiude il connection pool condiviso (sul loop che lo possiede)."""
+        await self._send_on_pool(self.client.aclose())
+    
+    async def _send_on_pool(self, coro) -> Any:
+        """
+        Esegue una coroutine HTTP sul loop di background, proprietario del connection pool.
+        
+        Dal loop di background stesso (refresh cache) la coroutine è attesa direttamente;
+        da altri loop il chiamante attende senza bloccare il proprio loop e una
+        cancellazione viene propagata alla richiesta in corso.
+        """
+        background = self._get_background_loop()
+        if asyncio.get_running_loop() is background:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, background))
+    
+    # ===============================
+    # DISPATCH RICHIESTE E CACHE QUERY
+    # ===============================
+    
+    async def _send(self, client: NotionAsyncClient, path: str, method: str,
+                    query: Optional[Dict], body: Optional[Dict], auth: Optional[str]) -> Any:
+        """
+        Invia una richiesta a Notion attraverso rate limiter e retry.
+        
+        Ogni tentativo viene registrato negli istogrammi latenza (self.metrics).
+        
+        RETRY:
+        - 429 (rate_limited): sempre, Notion non ha eseguito la richiesta
+        - 5xx e timeout: solo per richieste ripetibili (vedi _is_retryable_request)
+        - Attesa = Retry-After se presente, altrimenti backoff esponenziale con jitter
+        - Un 429 mette in pausa l'intero bucket: rallentano tutti i chiamanti
+        
+        Raises:
+            HTTPResponseError, RequestTimeoutError: Se l'errore non è transitorio
+                o i tentativi (max_retries) sono esauriti
+        """
+        attempt = 0
+        operation = self._operation_name(path, method)
+        while True:
+            await self.rate_limiter.acquire()
+            received = [0]
+            _response_bytes.set(received)
+            start = time.perf_counter()
+            try:
+                response = await self._send_on_pool(client.send_request(path, method, query, body, auth))
+            except Exception as e:
+                self.metrics.record(operation, (time.perf_counter() - start) * 1000,
+                                    error=True, bytes_received=received[0])
+                if not isinstance(e, (HTTPResponseError, RequestTimeoutError)):
+                    raise
+                delay = self._get_retry_delay(e, attempt, path, method)
+                if delay is None:
+                    raise
+                if attempt >= self.max_retries:
+                    with self._retry_lock:
+                        self._retry_stats['gave_up'] += 1
+                    logger.warning(f"⚠️ Richiesta Notion fallita dopo {attempt + 1} tentativi | {method} {path} | Error: {e}")
+                    raise
+                
+                attempt += 1
+                with self._retry_lock:
+                    self._retry_stats['retries'] += 1
+                    self._retry_stats['retry_wait_seconds'] += delay
+                logger.info(f"🔄 Retry Notion {attempt}/{self.max_retries} tra {delay:.2f}s | {method} {path} | Error: {e}")
+                await asyncio.sleep(delay)
+            else:
+                self.metrics.record(operation, (time.perf_counter() - start) * 1000,
+                                    bytes_received=received[0])
+                return response
+    
+    @staticmethod
+    def _operation_name(path: str, method: str) -> str:
+        """
+        Nome operazione per le metriche (es: 'databases.query', 'pages.update').
+        
+        Il path contiene ID diversi per ogni pagina: si usa solo la risorsa.
+        """
+        parts = path.strip('/').split('/')
+        resource = parts[0]
+        if resource == 'databases' and parts[-1] == 'query':
+            return 'databases.query'
+        if method == 'GET':
+            return f'{resource}.retrieve' if len(parts) > 1 else f'{resource}.list'
+        if method == 'PATCH':
+            return f'{resource}.update'
+        if method == 'POST':
+            return f'{resource}.create'
+        return f'{resource}.{method.lower()}'
+    
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        """
+        Istogrammi latenza per operazione Notion.
+        
+        Un campione per ogni tentativo HTTP (retry inclusi), escluse le risposte
+        servite dalla cache e le attese del rate limiter.
+        
+        Returns:
+            Dict: operazione → {count, errors, error_rate, avg/min/p50/p95/p99/max_ms, bytes_received}
+        """
+        return self.metrics.get_stats()
+    
+    def _get_retry_delay(self, error: Exception, attempt: int, path: str, method: str) -> Optional[float]:
+        """
+        Calcola attesa prima del prossimo tentativo.
+        
+        Returns:
+            float: Secondi di attesa, o None se l'errore non va ritentato
+        """
+        if isinstance(error, RequestTimeoutError):
+            if not self._is_retryable_request(path, method):
+                return None
+            with self._retry_lock:
+                self._retry_stats['timeouts'] += 1
+            return self._backoff_delay(attempt)
+        
+        if error.status not in self.RETRYABLE_STATUS:
+            return None
+        
+        if error.status == 429:
+            with self._retry_lock:
+                self._retry_stats['rate_limited'] += 1
+            retry_after = self._parse_retry_after(error.headers)
+            if retry_after is not None:
+                self.rate_limiter.pause(retry_after)
+                return retry_after
+            return self._backoff_delay(attempt)
+        
+        if not self._is_retryable_request(path, method):
+            return None
+        with self._retry_lock:
+            self._retry_stats['server_errors'] += 1
+        retry_after = self._parse_retry_after(error.headers)
+        return retry_after if retry_after is not None else self._backoff_delay(attempt)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Backoff esponenziale con full jitter (evita retry sincronizzati tra worker)."""
+        ceiling = min(self.RETRY_MAX_SECONDS, self.RETRY_BASE_SECONDS * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+    
+    def _parse_retry_after(self, headers) -> Optional[float]:
+        """Header Retry-After in secondi (None se assente o non numerico)."""
+        value = headers.get('retry-after') if headers is not None else None
+        if value is None:
+            return None
+        try:
+            return min(max(float(value), 0.0), self.RETRY_MAX_SECONDS)
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _is_retryable_request(path: str, method: str) -> bool:
+        """
+        Richieste ripetibili senza effetti duplicati dopo un 5xx/timeout.
+        
+        GET, PATCH (update pagina: stessi valori) e query database sono idempotenti;
+        POST di creazione (pages.create) no: un retry potrebbe duplicare la pagina.
+        """
+        if method in ('GET', 'PATCH', 'DELETE'):
+            return True
+        return NotionClient._is_cacheable(path, method)
+    
+    def get_rate_limit_stats(self) -> Dict:
+        """
+        Statistiche rate limiter e retry per monitoring.
+        
+        Returns:
+            Dict: Attese token bucket, retry per causa, attesa totale retry
+        """
+        with self._retry_lock:
+            stats = dict(self._retry_stats)
+        stats['retry_wait_seconds'] = round(stats['retry_wait_seconds'], 3)
+        stats['max_retries'] = self.max_retries
+        stats['limiter'] = self.rate_limiter.get_stats()
+        return stats
+    
+    
+    async def _dispatch(self, client: NotionAsyncClient, path: str, method: str,
+                        query: Optional[Dict], body: Optional[Dict], auth: Optional[str]) -> Any:
+        """
+        Punto unico di passaggio per ogni richiesta API Notion.
+        
+        Ogni richiesta effettiva (non servita dalla cache) passa da _send:
+        token bucket condiviso + retry su errori transitori + metriche latenza.
+        
+        CACHE (solo databases.query):
+        - Entry fresca → ritorno immediato (hit)
+        - Entry scaduta ma entro _cache_ttl → ritorno immediato + refresh in background (stale hit)
+        - Entry assente o troppo vecchia → richiesta a Notion (miss)
+        
+        Letture puntuali (pages.retrieve) e scritture non passano dalla cache:
+        il workflow di calendarizzazione deve sempre vedere lo stato reale.
+        """
+        if _cache_bypass.get() or not self._is_cacheable(path, method):
+            return await self._send(client, path, method, query, body, auth)
+        
+        key = self._make_cache_key(path, query, body)
+        now = time.monotonic()
+        refresh_needed = False
+        
+        with self._cache_lock:
+            entry = self._cached_data.get(key)
+            if entry is not None:
+                response, cached_at = entry
+                age = now - cached_at
+                if age < self.CACHE_FRESH_SECONDS:
+                    self._cache_stats['hits'] += 1
+                    return response
+                if age < self._cache_ttl:
+                    self._cache_stats['stale_hits'] += 1
+                    if key not in self._refreshing_keys:
+                        self._refreshing_keys.add(key)
+                        refresh_needed = True
+                else:
+                    entry = None
+            if entry is None:
+                self._cache_stats['misses'] += 1
+        
+        if entry is not None:
+            if refresh_needed:
+                self._schedule_refresh(key, path, method, query, body, auth)
+            return response
+        
+        return await self._fetch_and_store(client, key, path, method, query, body, auth)
+    
+    async def _fetch_and_store(self, client: NotionAsyncClient, key: str, path: str, method: str,
+                               query: Optional[Dict], body: Optional[Dict], auth: Optional[str]) -> Any:
+        """Esegue la query e salva la risposta (se nessuna invalidazione è avvenuta nel frattempo)."""
+        generation = self._cache_generation
+        response = await self._send(client, path, method, query, body, auth)
+        
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                if key not in self._cached_data and len(self._cached_data) >= self.CACHE_MAX_ENTRIES:
+                    # Evict entry più vecchia
+                    oldest_key = min(self._cached_data, key=lambda k: self._cached_data[k][1])
+                    del self._cached_data[oldest_key]
+                self._cached_data[key] = (response, time.monotonic())
+                self._last_cache_time = time.time()
+        return response
+    
+    def _schedule_refresh(self, key: str, path: str, method: str,
+                          query: Optional[Dict], body: Optional[Dict], auth: Optional[str]):
+        """
+        Rinfresca una entry stale sul loop di background.
+        
+        Non usa il loop corrente: in Flask ogni richiesta ha un loop che viene
+        chiuso (cancellando i task pendenti) appena la risposta è pronta.
+        """
+        async def refresh():
+            try:
+                await self._fetch_and_store(self.get_client(), key, path, method, query, body, auth)
+                with self._cache_lock:
+                    self._cache_stats['background_refreshes'] += 1
+                logger.debug("Cache query Notion rinfrescata in background")
+            except Exception as e:
+                logger.warning(f"⚠️ Refresh cache Notion fallito, mantengo dati stale | Error: {e}")
+            finally:
+                with self._cache_lock:
+                    self._refreshing_keys.discard(key)
+        
+        self.submit_background(refresh())
+    
+    def submit_background(self, coro) -> concurrent.futures.Future:
+        """
+        Esegue una coroutine sul loop di background (refresh senza bloccare il chiamante).
+        
+        Args:
+            coro: Coroutine da eseguire
+        
+        Returns:
+            concurrent.futures.Future: Risultato della coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_background_loop())
+    
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        """Ritorna (avviandolo se necessario) l'event loop dei task in background."""
+        with self._background_lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name='notion-background',
+                    daemon=True
+                )
+                thread.start()
+                self._background_loop = loop
+            return self._background_loop
+    
+    @staticmethod
+    @contextlib.contextmanager
+    def bypass_cache():
+        """
+        Context manager: le query eseguite all'interno vanno sempre a Notion.
+        
+        Vale anche per i task avviati nel blocco (contextvars).
+        Usato dal sync del mirror locale, che deve vedere i delta reali.
+        """
+        token = _cache_bypass.set(True)
+        try:
+            yield
+        finally:
+            _cache_bypass.reset(token)
+    
+    def invalidate_cache(self, notion_id: str = None):
+        """
+        Invalida le query in cache dopo una scrittura.
+        
+        Un cambio di stato può far entrare/uscire la pagina da qualsiasi query
+        filtrata: tutte le entry del database sono quindi considerate impattate.
+        
+        Args:
+            notion_id: ID pagina modificata (solo per logging)
+        """
+        with self._cache_lock:
+            removed = len(self._cached_data)
+            self._cached_data.clear()
+            self._cache_generation += 1
+            self._cache_stats['invalidations'] += 1
+        
+        target = f"...{notion_id[-8:]}" if notion_id else 'all'
+        logger.debug(f"Cache query Notion invalidata | Pagina: {target} | Entry rimosse: {removed}")
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        Statistiche cache query per monitoring.
+        
+        Returns:
+            Dict: Contatori hit/miss, entry correnti e hit rate
+        """
+        with self._cache_lock:
+            stats = dict(self._cache_stats)
+            stats['entries'] = len(self._cached_data)
+        
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['stale_hits']) / lookups, 3) if lookups else 0.0
+        stats['fresh_seconds'] = self.CACHE_FRESH_SECONDS
+        stats['ttl_seconds'] = self._cache_ttl
+        return stats
+    
+    @staticmethod
+    def _is_cacheable(path: str, method: str) -> bool:
+        """Solo le query database (POST databases/{id}/query) sono cacheabili."""
+        return method == 'POST' and path.startswith('databases/') and path.endswith('/query')
+    
+    @staticmethod
+    def _make_cache_key(path: str, query: Optional[Dict], body: Optional[Dict]) -> str:
+        """Chiave cache: query normalizzata (ordine chiavi indifferente)."""
+        return json.dumps({'path': path, 'query': query or {}, 'body': body or {}},
+                          sort_keys=True, default=str)
+    
     def get_database_id(self) -> str:
         """Ritorna ID database formazioni."""
         return self.database_id
     
+    # ===============================
+    # SCHEMA DATABASE
+    # ===============================
+    
+    async def get_database_schema(self) -> Dict[str, Dict]:
+        """
+        Ritorna schema database (nome property → {'id', 'type'}).
+        
+        Caricato con una sola databases.retrieve e riusato per tutta la vita
+        del client: lo schema cambia solo con modifiche manuali al database.
+        
+        Returns:
+            Dict: Schema property (ID già decodificati, pronti per query string)
+        """
+        if self._database_schema is None:
+            database = await self.get_client().databases.retrieve(database_id=self.database_id)
+            self._database_schema = {
+                name: {'id': unquote(prop.get('id', '')), 'type': prop.get('type')}
+                for name, prop in database.get('properties', {}).items()
+            }
+            logger.debug(f"Schema database caricato | Property: {len(self._database_schema)}")
+        return self._database_schema
+    
+    async def get_property_ids(self, property_names: Iterable[str]) -> Optional[List[str]]:
+        """
+        Risolve nomi property in ID per filter_properties (projection).
+        
+        Args:
+            property_names: Nomi property da includere nelle response
+        
+        Returns:
+            List[str]: ID property, o None se lo schema non è disponibile
+                       (le chiamate proseguono senza projection)
+        """
+        try:
+            schema = await self.get_database_schema()
+        except Exception as e:
+            logger.warning(f"⚠️ Schema database non disponibile, nessuna projection | Error: {e}")
+            return None
+        
+        property_ids = []
+        for name in property_names:
+            prop = schema.get(name)
+            if prop and prop['id']:
+                property_ids.append(prop['id'])
+            else:
+                logger.warning(f"⚠️ Property '{name}' non presente nello schema database")
+        
+        return property_ids or None
+    
+    def invalidate_schema(self):
+        """Forza ricaricamento schema alla prossima richiesta (es: property rinominate)."""
+        self._database_schema = None
+    
     def get_config_info(self) -> dict:
         """
         Informazioni configurazione per debugging.
@@ -85,10 +642,26 @@ class NotionClient:
             'token_configured': bool(self.token),
             'database_id_configured': bool(self.database_id),
             'database_id_preview': self.database_id[:8] + '...' if self.database_id else None,
-            'cache_ttl_seconds': self._cache_ttl
+            'cache_ttl_seconds': self._cache_ttl,
+            'transport': 'async',
+            'http2_enabled': self.http2_enabled,
+            'rate_limit_per_second': self.rate_limiter.rate,
+            'max_retries': self.max_retries
         }
 
 
+def is_transient_error(error: Exception) -> bool:
+    """
+    Errore transitorio Notion: 429, 5xx ritentabili o timeout.
+    
+    Sono gli errori gestiti dal retry di NotionClient: se arrivano al chiamante
+    i tentativi sono già esauriti e nuove richieste aggiungono solo carico.
+    """
+    if isinstance(error, RequestTimeoutError):
+        return True
+    return isinstance(error, HTTPResponseError) and error.status in NotionClient.RETRYABLE_STATUS
+
+
 class NotionClientError(Exception):
     """Eccezione specifica per errori NotionClient."""
     pass
\ No newline at end of file
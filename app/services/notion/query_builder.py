@@ -75,46 +75,101 @@ class NotionQueryBuilder:
         logger.debug(f"Query costruita per status '{status}'")
         return query
     
-    def build_date_range_filter_query(self, start_date: str, end_date: str, database_id: str) -> Dict:
+    def build_multi_status_filter_query(self, statuses: List[str], database_id: str) -> Dict:
         """
-        Costruisce query per range di date.
+        Costruisce query per più status in un'unica scansione ("or" tra status).
         
-        UTILE PER: Query settimane, mesi, periodi specifici.
+        UTILE PER: Dashboard (una query paginata invece di una per status).
+        
+        Args:
+            statuses: Lista status da includere
+            database_id: ID database target
+        
+        Returns:
+            Dict: Query strutturata per API Notion
+        """
+        logger.debug(f"Costruisco query multi-status: {statuses}")
+        
+        filters = [
+            {
+                "property": "Stato",
+                "status": {
+                    "equals": status
+                }
+            }
+            for status in statuses
+        ]
+        
+        query = {
+            "database_id": database_id,
+            "filter": {
+                "or": filters
+            } if len(filters) > 1 else filters[0],
+            "sorts": [
+                {
+                    "property": "Date",
+                    "direction": "ascending"
+                }
+            ],
+            "page_size": self.default_page_size
+        }
+        
+        return query
+    
+    def build_date_range_filter_query(self, start_date: str, end_date: str, database_id: str,
+                                      status: Optional[str] = None) -> Dict:
+        """
+        Costruisce query per range di date (opzionalmente filtrata per status).
+        
+        UTILE PER: Query settimane, mesi, periodi specifici, comandi bot /oggi /settimana.
         
         Args:
             start_date: Data inizio (ISO format)
             end_date: Data fine (ISO format)  
             database_id: ID database target
+            status: Status opzionale da combinare con il range
         
         Returns:
             Dict: Query con filtro date range
         """
-        logger.debug(f"Costruisco query per range: {start_date} - {end_date}")
+        logger.debug(f"Costruisco query per range: {start_date} - {end_date} | Status: {status}")
+        
+        filters = [
+            {
+                "property": "Date",
+                "date": {
+                    "on_or_after": start_date
+                }
+            },
+            {
+                "property": "Date", 
+                "date": {
+                    "on_or_before": end_date
+                }
+            }
+        ]
+        
+        # Aggiungi filtro status se specificato
+        if status:
+            filters.append({
+                "property": "Stato",
+                "status": {
+                    "equals": status
+                }
+            })
         
         query = {
             "database_id": database_id,
             "filter": {
-                "and": [
-                    {
-                        "property": "Date",
-                        "date": {
-                            "on_or_after": start_date
-                        }
-                    },
-                    {
-                        "property": "Date", 
-                        "date": {
-                            "on_or_before": end_date
-                        }
-                    }
-                ]
+                "and": filters
             },
             "sorts": [
                 {
                     "property": "Date",
                     "direction": "ascending"
                 }
-            ]
+            ],
+            "page_size": self.default_page_size
         }
         
         return query
@@ -201,6 +256,72 @@ class NotionQueryBuilder:
         
         return query
     
+    def build_last_edited_filter_query(self, since: Optional[str], database_id: str) -> Dict:
+        """
+        Costruisce query per pagine modificate dopo un watermark.
+        
+        UTILE PER: Sync incrementale del mirror locale (solo delta).
+        
+        NOTA: Notion confronta last_edited_time al minuto, quindi il filtro
+        usa on_or_after (le pagine già viste vengono semplicemente ri-salvate).
+        
+        Args:
+            since: Timestamp ISO ultimo sync (None = tutte le pagine)
+            database_id: ID database target
+        
+        Returns:
+            Dict: Query con filtro timestamp e ordinamento per ultima modifica
+        """
+        logger.debug(f"Costruisco query delta | Since: {since or 'inizio'}")
+        
+        query = {
+            "database_id": database_id,
+            "sorts": [
+                {
+                    "timestamp": "last_edited_time",
+                    "direction": "ascending"
+                }
+            ],
+            "page_size": self.default_page_size
+        }
+        
+        if since:
+            query["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {
+                    "on_or_after": since
+                }
+            }
+        
+        return query
+    
+    def build_freshness_probe_query(self, database_id: str) -> Dict:
+        """
+        Costruisce sonda di freschezza: pagina modificata più di recente.
+        
+        UTILE PER: Verificare a costo minimo se il database è cambiato
+        prima di ripetere una scansione completa (fetch condizionale).
+        
+        Proiezione sul solo titolo: la sonda legge id e last_edited_time.
+        
+        Args:
+            database_id: ID database target
+        
+        Returns:
+            Dict: Query page_size=1 ordinata per last_edited_time decrescente
+        """
+        return {
+            "database_id": database_id,
+            "sorts": [
+                {
+                    "timestamp": "last_edited_time",
+                    "direction": "descending"
+                }
+            ],
+            "page_size": 1,
+            "filter_properties": ["title"]
+        }
+    
     def validate_query_structure(self, query: Dict) -> bool:
         """
         Valida struttura query prima dell'invio.
@@ -0,0 +1,137 @@
+"""
+Rate Limiter - Token bucket condiviso per API esterne
+
+Questo modulo gestisce:
+- Token bucket thread-safe (Flask threaded + event loop del bot + loop background)
+- Attesa asincrona non bloccante fino al token disponibile
+- Metriche attese (quante richieste hanno atteso e per quanto)
+
+Usato da NotionClient (limite Notion ~3 req/s) e riusabile per altri servizi.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket a prenotazione.
+
+    RESPONSABILITÀ:
+    - Ricarica continua a `rate` token/secondo fino a `capacity` (burst)
+    - Prenotazione atomica del token sotto lock: ogni chiamante riceve
+      il proprio istante di partenza (ordine FIFO, nessuna corsa al token)
+    - Attesa fuori dal lock con asyncio.sleep (event loop mai bloccato)
+    """
+
+    def __init__(self, rate: float, capacity: float = None, name: str = 'default'):
+        """
+        Inizializza token bucket.
+
+        Args:
+            rate: Token ricaricati al secondo (richieste/secondo sostenute)
+            capacity: Token massimi accumulabili (burst); default = rate
+            name: Nome per logging e metriche
+        """
+        if rate <= 0:
+            raise ValueError("rate deve essere positivo")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self.name = name
+
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._stats = {
+            'acquired': 0,
+            'waited': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'pauses': 0
+        }
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Prenota token e ritorna i secondi da attendere prima di usarli.
+
+        Il saldo può andare in negativo: il debito viene ripagato dalla
+        ricarica, e chi prenota dopo attende di conseguenza.
+
+        Args:
+            tokens: Token da consumare
+
+        Returns:
+            float: Attesa in secondi (0 se token disponibili subito)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            self._tokens -= tokens
+            delay = max(0.0, -self._tokens / self.rate)
+
+            self._stats['acquired'] += 1
+            if delay > 0:
+                self._stats['waited'] += 1
+                self._stats['total_wait_seconds'] += delay
+                self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], delay)
+
+        return delay
+
+    def pause(self, seconds: float):
+        """
+        Sospende le prossime prenotazioni per almeno `seconds` secondi.
+
+        Usato quando il servizio remoto risponde 429 con Retry-After:
+        tutti i chiamanti rallentano, non solo quello respinto.
+
+        Args:
+            seconds: Secondi durante i quali nessun token è disponibile
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._stats['pauses'] += 1
+        logger.debug(f"Rate limit {self.name} | Pausa: {seconds:.3f}s")
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Attende (senza bloccare l'event loop) finché i token sono disponibili.
+
+        Args:
+            tokens: Token da consumare
+
+        Returns:
+            float: Secondi effettivamente attesi
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            logger.debug(f"Rate limit {self.name} | Attesa: {delay:.3f}s")
+            await asyncio.sleep(delay)
+        return delay
+
+    def get_stats(self) -> Dict:
+        """Metriche limiter per monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['rate_per_second'] = self.rate
+        stats['capacity'] = self.capacity
+        stats['avg_wait_seconds'] = (
+            round(stats['total_wait_seconds'] / stats['waited'], 4) if stats['waited'] else 0.0
+        )
+        stats['total_wait_seconds'] = round(stats['total_wait_seconds'], 4)
+        stats['max_wait_seconds'] = round(stats['max_wait_seconds'], 4)
+        return stats
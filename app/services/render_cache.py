@@ -0,0 +1,109 @@
+"""
+Render Cache - Cache dei messaggi renderizzati dai template
+
+Questo modulo gestisce:
+- Cache LRU thread-safe dei testi renderizzati (Telegram, oggetto/corpo email)
+- Versione dei template (hash del contenuto): template nuovi → chiavi nuove
+- Statistiche hit / miss
+
+Chiave = (tipo messaggio, versione template, dati che alimentano il template):
+anteprima e conferma con gli stessi dati restituiscono lo stesso testo senza
+renderizzarlo di nuovo; dati cambiati (es: link Teams aggiunto) → nuovo render.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+
+def template_version(templates) -> str:
+    """
+    Versione di un insieme di template (hash breve del contenuto).
+
+    Args:
+        templates: Template (dict da YAML)
+
+    Returns:
+        str: 12 caratteri esadecimali, cambia a ogni modifica dei template
+    """
+    payload = json.dumps(templates, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class RenderCache:
+    """
+    Cache LRU dei testi renderizzati.
+
+    RESPONSABILITÀ:
+    - Restituire il testo già renderizzato per la stessa chiave
+    - Renderizzare (una volta) e salvare alla prima richiesta
+    - Dati non hashable: render diretto, senza cache
+
+    Thread-safe: formatter condivisi tra richieste Flask e bot.
+    """
+
+    MAX_ENTRIES = 512
+
+    def __init__(self, max_entries: int = None, name: str = 'render'):
+        """
+        Inizializza cache vuota.
+
+        Args:
+            max_entries: Testi massimi in cache (LRU)
+            name: Nome per statistiche
+        """
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.name = name
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'uncacheable': 0}
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        """
+        Testo renderizzato per la chiave, render solo se assente.
+
+        Args:
+            key: Chiave (tupla hashable di tipo, versione template e dati)
+            render: Funzione di render (eccezioni propagate, nulla in cache)
+
+        Returns:
+            str: Testo renderizzato
+        """
+        try:
+            hash(key)
+        except TypeError:
+            with self._lock:
+                self._stats['uncacheable'] += 1
+            return render()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._entries[key]
+
+        value = render()
+
+        with self._lock:
+            self._stats['misses'] += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Svuota la cache (es: template ricaricati)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Statistiche cache: hit, miss, non cacheabili, testi in cache."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
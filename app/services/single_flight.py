@@ -0,0 +1,135 @@
+"""
+Single Flight - Coalescing richieste identiche concorrenti
+
+Questo modulo gestisce:
+- Una sola esecuzione per chiave tra chiamate concorrenti (le altre attendono il risultato)
+- Condivisione tra event loop diversi (loop per richiesta Flask + loop del bot)
+- Metriche chiamate coalescenti
+
+Usato da NotionService per letture puntuali e query per status.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Gruppo single-flight: chiamate con la stessa chiave condividono un'unica esecuzione.
+
+    RESPONSABILITÀ:
+    - Il primo chiamante (leader) esegue la funzione, gli altri ne attendono il risultato
+    - Future thread-safe (concurrent.futures): attendibile da qualsiasi event loop
+    - Leader annullato (es: loop Flask chiuso) → un chiamante in attesa diventa leader
+    - Copia del risultato per i chiamanti in attesa (nessun oggetto mutabile condiviso)
+
+    Nessuna cache: terminata l'esecuzione, la chiave viene rilasciata.
+    """
+
+    def __init__(self, name: str = 'default', copy_result: Optional[Callable[[Any], Any]] = None):
+        """
+        Inizializza gruppo single-flight.
+
+        Args:
+            name: Nome per logging e metriche
+            copy_result: Funzione applicata al risultato per ogni chiamante in attesa
+        """
+        self.name = name
+        self._copy_result = copy_result
+        self._calls: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0,
+            'executions': 0,
+            'coalesced': 0
+        }
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Esegue func una sola volta per tutte le chiamate concorrenti con la stessa chiave.
+
+        Args:
+            key: Chiave richiesta (es: ('by_id', notion_id))
+            func: Coroutine function senza argomenti da eseguire
+
+        Returns:
+            Risultato di func (copia per i chiamanti coalescenti)
+
+        Raises:
+            Eccezione sollevata da func (propagata a tutti i chiamanti)
+        """
+        while True:
+            with self._lock:
+                self._stats['calls'] += 1
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = concurrent.futures.Future()
+                    self._calls[key] = future
+                    self._stats['executions'] += 1
+                else:
+                    self._stats['coalesced'] += 1
+
+            if leader:
+                return await self._run(key, future, func)
+
+            try:
+                # shield: l'annullamento di un chiamante non annulla l'esecuzione condivisa
+                result = await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # Leader annullato: l'esecuzione va ripetuta
+                    with self._lock:
+                        self._stats['calls'] -= 1
+                    continue
+                raise
+
+            return self._copy_result(result) if self._copy_result else result
+
+    async def _run(self, key: Hashable, future: concurrent.futures.Future,
+                   func: Callable[[], Awaitable[Any]]) -> Any:
+        """Esecuzione leader: pubblica risultato o eccezione sul future condiviso."""
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def forget(self, key: Hashable = None):
+        """
+        Rilascia chiavi in volo: i prossimi chiamanti avviano una nuova esecuzione.
+
+        Usato dopo una scrittura, perché chi arriva dopo non riceva dati letti prima.
+
+        Args:
+            key: Chiave da rilasciare (None = tutte)
+        """
+        with self._lock:
+            if key is None:
+                self._calls.clear()
+            else:
+                self._calls.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """Metriche coalescing per monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        stats['coalesced_rate'] = round(stats['coalesced'] / stats['calls'], 3) if stats['calls'] else 0.0
+        return stats
@@ -0,0 +1,527 @@
+"""
+Telegram Outbox - Coda persistente SQLite per messaggi Telegram
+
+Questo modulo gestisce:
+- Accodamento messaggi con chiave di idempotenza (training_id, group_key, kind)
+- Worker in background (thread + event loop dedicati) che svuota la coda
+- Retry con backoff esponenziale, Retry-After di Telegram rispettato
+- Lease sui messaggi in invio: un processo terminato a metà non blocca la coda
+- Rinnovo del lease subito prima di ogni invio (fencing sul valore del lease)
+
+GARANZIA: un messaggio per chiave. Un re-invio della stessa formazione non
+duplica i messaggi già consegnati o in coda. Il lease viene rinnovato subito
+prima della chiamata a Telegram solo se nessun altro processo lo ha ripreso
+nel frattempo (attese anti-flood più lunghe del lease comprese): chi ha perso
+il lease non invia. Solo un crash tra la consegna a Telegram e la conferma
+locale (finestra di millisecondi) può produrre un secondo invio alla scadenza
+del lease.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import telegram
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(Exception):
+    """Lease di un messaggio ripreso da un altro worker: il messaggio non va inviato da qui."""
+    pass
+
+
+class TelegramOutbox:
+    """
+    Coda SQLite dei messaggi Telegram da consegnare.
+
+    RESPONSABILITÀ:
+    - Persistenza messaggi (sopravvivono a crash e riavvii)
+    - Idempotenza per (training_id, group_key, kind)
+    - Claim atomico dei messaggi da inviare (anche tra processi diversi)
+    - Stato consegna per messaggio: pending → sending → sent | failed
+
+    L'outbox NON parla con Telegram: la consegna è del OutboxWorker.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            training_id TEXT NOT NULL,
+            group_key TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            message TEXT NOT NULL,
+            parse_mode TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            lease_until REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            sent_at REAL,
+            UNIQUE (training_id, group_key, kind)
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Inizializza outbox e crea schema se assente.
+
+        Args:
+            db_path: Path file SQLite (':memory:' per test)
+        """
+        self.db_path = db_path
+
+        db_dir = os.path.dirname(db_path) if db_path != ':memory:' else ''
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Connessione unica condivisa tra thread (richieste Flask + worker)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock:
+            if db_path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+
+        logger.info(f"TelegramOutbox inizializzato | DB: {db_path} | Da consegnare: {self.count_unsent()}")
+
+    # ===============================
+    # ACCODAMENTO
+    # ===============================
+
+    def enqueue(self, training_id: str, kind: str, messages: Dict[str, str],
+                parse_mode: str = 'HTML') -> Dict[str, str]:
+        """
+        Accoda i messaggi di una formazione (idempotente).
+
+        Args:
+            training_id: ID formazione Notion
+            kind: Tipo comunicazione ('training', 'feedback')
+            messages: {group_key: messaggio formattato}
+            parse_mode: Modalità parsing Telegram
+
+        Returns:
+            Dict[str, str]: Stato per gruppo:
+                'queued'  - accodato ora (o riaccodato dopo un fallimento definitivo)
+                'pending' - già in coda, non duplicato
+                'sent'    - già consegnato, non reinviato
+        """
+        now = time.time()
+        statuses = {}
+
+        with self._lock:
+            for group_key, message in messages.items():
+                cursor = self._conn.execute(
+                    """INSERT OR IGNORE INTO outbox
+                       (training_id, group_key, kind, message, parse_mode, next_attempt_at, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (training_id, group_key, kind, message, parse_mode, now, now)
+                )
+                if cursor.rowcount:
+                    statuses[group_key] = 'queued'
+                    continue
+
+                # Chiave già presente: riaccoda solo i fallimenti definitivi (nuova conferma operatore)
+                cursor = self._conn.execute(
+                    """UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ?,
+                              lease_until = NULL, last_error = NULL, message = ?, parse_mode = ?
+                       WHERE training_id = ? AND group_key = ? AND kind = ? AND status = 'failed'""",
+                    (now, message, parse_mode, training_id, group_key, kind)
+                )
+                if cursor.rowcount:
+                    statuses[group_key] = 'queued'
+                else:
+                    row = self._conn.execute(
+                        "SELECT status FROM outbox WHERE training_id = ? AND group_key = ? AND kind = ?",
+                        (training_id, group_key, kind)
+                    ).fetchone()
+                    statuses[group_key] = 'sent' if row['status'] == 'sent' else 'pending'
+            self._conn.commit()
+
+        queued = sum(1 for status in statuses.values() if status == 'queued')
+        logger.info(f"📥 Messaggi accodati | Formazione: ...{str(training_id)[-8:]} | Tipo: {kind} | "
+                    f"Nuovi: {queued}/{len(statuses)}")
+        return statuses
+
+    # ===============================
+    # CONSEGNA (usato dal worker)
+    # ===============================
+
+    def claim_due(self, limit: int, lease_seconds: float) -> List[Dict]:
+        """
+        Prende in carico i messaggi da inviare ora.
+
+        Inclusi i messaggi 'sending' con lease scaduto (processo terminato a metà invio).
+
+        Args:
+            limit: Numero massimo di messaggi
+            lease_seconds: Durata presa in carico (poi riassegnabili)
+
+        Returns:
+            List[Dict]: Messaggi presi in carico (id, group_key, message, parse_mode, attempts,
+                        lease_until da passare a renew_lease)
+        """
+        now = time.time()
+        lease_until = now + lease_seconds
+        claimed = []
+
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT id, training_id, group_key, kind, message, parse_mode, attempts FROM outbox
+                   WHERE (status = 'pending' AND next_attempt_at <= ?)
+                      OR (status = 'sending' AND lease_until <= ?)
+                   ORDER BY next_attempt_at LIMIT ?""",
+                (now, now, limit)
+            ).fetchall()
+
+            for row in rows:
+                # Claim condizionato: un altro processo potrebbe averlo preso nel frattempo
+                cursor = self._conn.execute(
+                    """UPDATE outbox SET status = 'sending', lease_until = ?
+                       WHERE id = ? AND ((status = 'pending' AND next_attempt_at <= ?)
+                                         OR (status = 'sending' AND lease_until <= ?))""",
+                    (lease_until, row['id'], now, now)
+                )
+                if cursor.rowcount:
+                    claimed.append({**dict(row), 'lease_until': lease_until})
+            self._conn.commit()
+
+        return claimed
+
+    def renew_lease(self, message_id: int, lease_until: float, lease_seconds: float) -> Optional[float]:
+        """
+        Rinnova il lease di un messaggio preso in carico.
+
+        Rinnovo condizionato al lease ancora posseduto (stesso lease_until del claim
+        o dell'ultimo rinnovo): se un altro worker lo ha ripreso dopo la scadenza
+        il valore è cambiato e il rinnovo fallisce.
+
+        Args:
+            message_id: ID messaggio
+            lease_until: Scadenza lease posseduta (da claim_due o dal rinnovo precedente)
+            lease_seconds: Nuova durata del lease
+
+        Returns:
+            Optional[float]: Nuova scadenza, None se il lease non è più posseduto
+        """
+        renewed_until = time.time() + lease_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                """UPDATE outbox SET lease_until = ?
+                   WHERE id = ? AND status = 'sending' AND lease_until = ?""",
+                (renewed_until, message_id, lease_until)
+            )
+            self._conn.commit()
+        return renewed_until if cursor.rowcount else None
+
+    def mark_sent(self, message_id: int):
+        """Registra consegna avvenuta."""
+        with self._lock:
+            self._conn.execute(
+                """UPDATE outbox SET status = 'sent', sent_at = ?, attempts = attempts + 1,
+                          lease_until = NULL, last_error = NULL WHERE id = ?""",
+                (time.time(), message_id)
+            )
+            self._conn.commit()
+
+    def mark_retry(self, message_id: int, error: str, delay_seconds: float):
+        """Riprogramma un invio fallito dopo delay_seconds."""
+        with self._lock:
+            self._conn.execute(
+                """UPDATE outbox SET status = 'pending', attempts = attempts + 1, next_attempt_at = ?,
+                          lease_until = NULL, last_error = ? WHERE id = ?""",
+                (time.time() + delay_seconds, error, message_id)
+            )
+            self._conn.commit()
+
+    def mark_failed(self, message_id: int, error: str):
+        """Registra fallimento definitivo (nessun altro tentativo automatico)."""
+        with self._lock:
+            self._conn.execute(
+                """UPDATE outbox SET status = 'failed', attempts = attempts + 1,
+                          lease_until = NULL, last_error = ? WHERE id = ?""",
+                (error, message_id)
+            )
+            self._conn.commit()
+
+    # ===============================
+    # LETTURE
+    # ===============================
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Secondi al prossimo messaggio da inviare (None se coda vuota)."""
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT MIN(CASE WHEN status = 'pending' THEN next_attempt_at ELSE lease_until END) AS due
+                   FROM outbox WHERE status IN ('pending', 'sending')"""
+            ).fetchone()
+        if row['due'] is None:
+            return None
+        return max(0.0, row['due'] - time.time())
+
+    def count_unsent(self) -> int:
+        """Messaggi ancora da consegnare (in coda o in invio)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS n FROM outbox WHERE status IN ('pending', 'sending')"
+            ).fetchone()
+        return row['n']
+
+    def get_delivery_status(self, training_id: str, kind: str) -> Dict[str, Dict]:
+        """
+        Stato consegna dei messaggi di una formazione.
+
+        Returns:
+            Dict: {group_key: {'status', 'attempts', 'last_error', 'sent_at'}}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT group_key, status, attempts, last_error, sent_at FROM outbox
+                   WHERE training_id = ? AND kind = ? ORDER BY id""",
+                (training_id, kind)
+            ).fetchall()
+        return {row['group_key']: {key: row[key] for key in ('status', 'attempts', 'last_error', 'sent_at')}
+                for row in rows}
+
+    def get_stats(self) -> Dict:
+        """Statistiche outbox (messaggi per stato)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM outbox GROUP BY status").fetchall()
+        stats = {'pending': 0, 'sending': 0, 'sent': 0, 'failed': 0}
+        stats.update({row['status']: row['n'] for row in rows})
+        stats['db_path'] = self.db_path
+        return stats
+
+    def close(self):
+        """Chiude la connessione SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+class OutboxWorker:
+    """
+    Worker in background che consegna i messaggi dell'outbox.
+
+    RESPONSABILITÀ:
+    - Thread dedicato con event loop proprio (le richieste Flask chiudono il loro)
+    - Invii paralleli limitati, Bot condiviso per tutta la vita del worker
+    - Retry: Retry-After di Telegram, altrimenti backoff esponenziale con jitter
+    - Errori permanenti (chat inesistente, bot rimosso, messaggio non valido) → failed
+    - Lease rinnovato prima di ogni invio; lease perso → nessun invio (lo consegna chi l'ha ripreso)
+    """
+
+    MAX_ATTEMPTS = 8
+    RETRY_BASE_SECONDS = 2.0
+    RETRY_MAX_SECONDS = 300.0
+    LEASE_SECONDS = 60.0
+    # RetryAfter atteso durante un invio al massimo mezzo lease: oltre, il messaggio
+    # torna in coda con next_attempt_at = Retry-After invece di restare in carico
+    MAX_RETRY_WAIT_SECONDS = LEASE_SECONDS / 2
+    POLL_SECONDS = 5.0
+    BATCH_SIZE = 50
+
+    # Errori per cui un nuovo tentativo non cambierebbe l'esito
+    PERMANENT_ERRORS = (telegram.error.BadRequest, telegram.error.Forbidden,
+                        telegram.error.InvalidToken, ValueError)
+
+    def __init__(self, outbox: TelegramOutbox,
+                 deliver: Callable[[str, str, Optional[str]], Awaitable[None]],
+                 session: Callable = None, max_concurrent: int = 8):
+        """
+        Inizializza worker (avviato con start()).
+
+        Args:
+            outbox: Coda messaggi
+            deliver: Coroutine di invio (group_key, message, parse_mode, before_send=, max_retry_wait=),
+                     solleva in caso di errore. before_send() va chiamato subito prima di ogni
+                     tentativo di invio (rinnovo lease, solleva LeaseLost)
+            session: Factory async context manager attivo per tutta la vita del worker
+                     (es: TelegramService.bot_session)
+            max_concurrent: Invii contemporanei massimi
+        """
+        self.outbox = outbox
+        self._deliver = deliver
+        self._session = session
+        self.max_concurrent = max(1, max_concurrent)
+
+        self._thread = None
+        self._loop = None
+        self._wake_event = None
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._stats = {'delivered': 0, 'retried': 0, 'failed': 0, 'lease_lost': 0}
+
+    # ===============================
+    # LIFECYCLE
+    # ===============================
+
+    def start(self):
+        """Avvia il thread del worker (idempotente)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run_thread, name='telegram-outbox', daemon=True)
+            self._thread.start()
+        logger.info("📮 Worker outbox Telegram avviato")
+
+    def stop(self, timeout: float = 10.0):
+        """Ferma il worker dopo il batch in corso."""
+        self._stopping = True
+        self.wake()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        logger.info("📮 Worker outbox Telegram fermato")
+
+    def is_running(self) -> bool:
+        """True se il thread del worker è attivo."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def wake(self):
+        """Sveglia il worker (nuovi messaggi in coda). Chiamabile da qualsiasi thread."""
+        loop, event = self._loop, self._wake_event
+        if loop is not None and event is not None:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Loop già chiuso (worker in arresto)
+
+    def _run_thread(self):
+        try:
+            asyncio.run(self._run())
+        except Exception as e:
+            logger.critical(f"❌ Worker outbox Telegram terminato | Error: {e}", exc_info=True)
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+
+        session = self._session() if self._session else _null_session()
+        async with session:
+            while not self._stopping:
+                try:
+                    await self.drain_once()
+                except Exception as e:
+                    logger.error(f"❌ Errore worker outbox, riprovo | Error: {e}", exc_info=True)
+
+                if self._stopping:
+                    break
+                delay = self.outbox.seconds_until_next()
+                timeout = self.POLL_SECONDS if delay is None else min(delay, self.POLL_SECONDS)
+                try:
+                    await asyncio.wait_for(self._wake_event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake_event.clear()
+
+    # ===============================
+    # CONSEGNA
+    # ===============================
+
+    async def drain_once(self) -> int:
+        """
+        Consegna tutti i messaggi scaduti (a batch), in parallelo limitato.
+
+        Returns:
+            int: Messaggi elaborati
+        """
+        processed = 0
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def process(item: Dict):
+            async with semaphore:
+                await self._process(item)
+
+        while not self._stopping:
+            batch = self.outbox.claim_due(self.BATCH_SIZE, self.LEASE_SECONDS)
+            if not batch:
+                break
+            await asyncio.gather(*(process(item) for item in batch))
+            processed += len(batch)
+
+        return processed
+
+    async def _process(self, item: Dict):
+        """Invia un messaggio e ne registra l'esito nell'outbox."""
+        group_key = item['group_key']
+        lease = {'until': item['lease_until']}
+
+        def renew_lease():
+            # Dopo le attese anti-flood, subito prima della chiamata a Telegram
+            renewed = self.outbox.renew_lease(item['id'], lease['until'], self.LEASE_SECONDS)
+            if renewed is None:
+                raise LeaseLost(f"lease del messaggio {item['id']} ripreso da un altro worker")
+            lease['until'] = renewed
+
+        try:
+            await self._deliver(group_key, item['message'], item['parse_mode'],
+                                before_send=renew_lease, max_retry_wait=self.MAX_RETRY_WAIT_SECONDS)
+        except LeaseLost as e:
+            self._count('lease_lost')
+            logger.warning(f"⚠️ Invio outbox saltato, {e} | Gruppo: {group_key}")
+            return
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            attempts = item['attempts'] + 1
+
+            if isinstance(e, self.PERMANENT_ERRORS) or attempts >= self.MAX_ATTEMPTS:
+                self.outbox.mark_failed(item['id'], error)
+                self._count('failed')
+                logger.error(f"❌ Messaggio outbox non consegnabile | Gruppo: {group_key} | "
+                             f"Tentativi: {attempts} | Error: {error}")
+                return
+
+            delay = self._retry_delay(e, attempts)
+            self.outbox.mark_retry(item['id'], error, delay)
+            self._count('retried')
+            logger.warning(f"⚠️ Invio outbox fallito, nuovo tentativo tra {delay:.1f}s | Gruppo: {group_key} | "
+                           f"Tentativo: {attempts}/{self.MAX_ATTEMPTS} | Error: {error}")
+            return
+
+        self.outbox.mark_sent(item['id'])
+        self._count('delivered')
+
+    def _retry_delay(self, error: Exception, attempts: int) -> float:
+        """Attesa prima del prossimo tentativo: Retry-After se indicato, altrimenti backoff con jitter."""
+        if isinstance(error, telegram.error.RetryAfter):
+            retry_after = error.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            return float(retry_after)
+        ceiling = min(self.RETRY_MAX_SECONDS, self.RETRY_BASE_SECONDS * (2 ** (attempts - 1)))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict:
+        """Statistiche worker (consegnati, riprogrammati, falliti, lease persi) + stato coda."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['running'] = self.is_running()
+        stats['queue'] = self.outbox.get_stats()
+        return stats
+
+
+class _null_session:
+    """Async context manager vuoto (worker senza sessione)."""
+
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc_info):
+        return False
@@ -0,0 +1,165 @@
+"""
+Telegram Send Scheduler - Invii nel rispetto dei limiti anti-flood di Telegram
+
+Questo modulo gestisce:
+- Token bucket globale del bot (~30 messaggi/secondo)
+- Token bucket per chat (~20 messaggi/minuto per gruppo)
+- RetryAfter gestito automaticamente: pausa della chat e nuovo tentativo
+- Metriche attese e RetryAfter ricevuti
+
+I bucket sono per processo (il limite Telegram è per bot, non per event loop):
+un invio massivo rallenta i chiamanti invece di far perdere messaggi.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, TypeVar
+
+import telegram
+
+from app.services.rate_limiter import TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class TelegramSendScheduler:
+    """
+    Scheduler degli invii Telegram con limiti globali e per chat.
+
+    RESPONSABILITÀ:
+    - Attendere il token della chat e poi quello globale prima di ogni invio
+    - Dimensionare i bucket perché burst + ricarica non superino il limite
+      in nessuna finestra (es: 3 di burst + 17/minuto ≤ 20/minuto)
+    - Su RetryAfter: sospendere la chat per il tempo indicato e riprovare,
+      fino a MAX_RETRY_WAIT_SECONDS complessivi (poi l'errore risale al chiamante)
+
+    VINCOLO: chi detiene un lease sul messaggio (OutboxWorker) passa a run()
+    max_retry_wait inferiore alla durata del lease e un before_send che lo
+    rinnova: il cap effettivo è il minimo tra i due valori.
+    """
+
+    GLOBAL_LIMIT_PER_SECOND = 30
+    GLOBAL_BURST = 10
+    CHAT_LIMIT_PER_MINUTE = 20
+    CHAT_BURST = 3
+    MAX_RETRY_WAIT_SECONDS = 120.0
+
+    def __init__(self, global_limit_per_second: float = None, chat_limit_per_minute: float = None,
+                 max_retry_wait_seconds: float = None):
+        """
+        Inizializza scheduler.
+
+        Args:
+            global_limit_per_second: Messaggi/secondo del bot (default env TELEGRAM_RATE_LIMIT_PER_SECOND)
+            chat_limit_per_minute: Messaggi/minuto per chat (default env TELEGRAM_CHAT_RATE_LIMIT_PER_MINUTE)
+            max_retry_wait_seconds: Attesa RetryAfter massima per invio prima di rinunciare
+        """
+        if global_limit_per_second is None:
+            global_limit_per_second = float(os.getenv('TELEGRAM_RATE_LIMIT_PER_SECOND', self.GLOBAL_LIMIT_PER_SECOND))
+        if chat_limit_per_minute is None:
+            chat_limit_per_minute = float(os.getenv('TELEGRAM_CHAT_RATE_LIMIT_PER_MINUTE',
+                                                    self.CHAT_LIMIT_PER_MINUTE))
+
+        self.global_limit_per_second = global_limit_per_second
+        self.chat_limit_per_minute = chat_limit_per_minute
+        self.max_retry_wait_seconds = (self.MAX_RETRY_WAIT_SECONDS if max_retry_wait_seconds is None
+                                       else max_retry_wait_seconds)
+
+        global_burst = min(self.GLOBAL_BURST, global_limit_per_second / 2)
+        self.global_bucket = TokenBucket(
+            rate=global_limit_per_second - global_burst, capacity=global_burst, name='telegram'
+        )
+
+        self._chat_bursts = min(self.CHAT_BURST, chat_limit_per_minute / 2)
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._stats = {'sends': 0, 'retry_after': 0, 'retry_after_wait_seconds': 0.0, 'gave_up': 0}
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        """Bucket della chat (creato al primo invio)."""
+        key = str(chat_id)
+        with self._lock:
+            bucket = self._chat_buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(
+                    rate=(self.chat_limit_per_minute - self._chat_bursts) / 60,
+                    capacity=self._chat_bursts,
+                    name=f'telegram:{key}'
+                )
+                self._chat_buckets[key] = bucket
+            return bucket
+
+    async def run(self, chat_id, send: Callable[[], Awaitable[T]],
+                  before_send: Callable[[], None] = None, max_retry_wait: float = None) -> T:
+        """
+        Esegue un invio verso una chat rispettando i limiti.
+
+        Args:
+            chat_id: Chat destinataria (chiave del bucket per chat)
+            send: Factory della coroutine di invio (richiamata a ogni tentativo)
+            before_send: Chiamato dopo le attese e subito prima di ogni tentativo
+                         (es: rinnovo lease outbox); un'eccezione annulla l'invio
+            max_retry_wait: Cap RetryAfter del chiamante (es: entro il lease), minimo con max_retry_wait_seconds
+
+        Returns:
+            Risultato di send()
+
+        Raises:
+            telegram.error.RetryAfter: Attesa complessiva oltre il cap
+            Exception: Ogni altro errore di send() o before_send() (nessun retry qui)
+        """
+        chat_bucket = self._chat_bucket(chat_id)
+        retry_wait_cap = (self.max_retry_wait_seconds if max_retry_wait is None
+                          else min(self.max_retry_wait_seconds, max_retry_wait))
+        waited = 0.0
+
+        while True:
+            # Prima il token della chat: il token globale non resta prenotato durante l'attesa
+            await chat_bucket.acquire()
+            await self.global_bucket.acquire()
+            if before_send is not None:
+                before_send()
+            try:
+                result = await send()
+            except telegram.error.RetryAfter as e:
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                retry_after = float(retry_after)
+
+                with self._lock:
+                    self._stats['retry_after'] += 1
+                if waited + retry_after > retry_wait_cap:
+                    with self._lock:
+                        self._stats['gave_up'] += 1
+                    raise
+
+                logger.warning(f"⚠️ RetryAfter Telegram, nuovo tentativo tra {retry_after:.0f}s | Chat: {chat_id}")
+                chat_bucket.pause(retry_after)
+                waited += retry_after
+                with self._lock:
+                    self._stats['retry_after_wait_seconds'] += retry_after
+                continue
+
+            with self._lock:
+                self._stats['sends'] += 1
+            return result
+
+    def get_stats(self) -> Dict:
+        """Statistiche scheduler: invii, RetryAfter, attese bucket globale, chat attive."""
+        with self._lock:
+            stats = dict(self._stats)
+            chat_buckets = list(self._chat_buckets.values())
+        stats['retry_after_wait_seconds'] = round(stats['retry_after_wait_seconds'], 3)
+        stats['global'] = self.global_bucket.get_stats()
+        stats['chats'] = len(chat_buckets)
+        stats['chat_waits'] = sum(bucket.get_stats()['waited'] for bucket in chat_buckets)
+        stats['global_limit_per_second'] = self.global_limit_per_second
+        stats['chat_limit_per_minute'] = self.chat_limit_per_minute
+        return stats
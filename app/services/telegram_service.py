@@ -6,11 +6,17 @@ STRUTTURA SEMPLIFICATA:
 - Core messaging e configurazione
 - Integrazione con moduli bot specializzati
 - Gestione lifecycle bot (start/stop)
+- Bot condiviso per event loop (connection pool HTTP riusato dagli invii)
+- Invio parallelo ai gruppi target (concorrenza limitata, tempi per gruppo)
+- Outbox persistente opzionale (TELEGRAM_OUTBOX_PATH): consegna idempotente in background
+- Limiti anti-flood Telegram (globale + per chat) con RetryAfter gestito automaticamente
+- Processo bot in modalità polling o webhook (TELEGRAM_BOT_MODE)
 - Solo funzionalità essenziali
 
 MODULI ESTERNI:
 - bot.telegram_formatters: Formattazione messaggi
 - bot.telegram_commands: Comandi bot interattivi
+- bot.telegram_webhook: Endpoint HTTP per la modalità webhook
 """
 
 import os
@@ -18,20 +24,53 @@ import json
 import logging
 import yaml
 import asyncio
+import contextlib
+import secrets
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import telegram
 from telegram.ext import Application
+from telegram.request import HTTPXRequest
 
 try:
-    from .bot import TelegramFormatter, TelegramCommands
+    from .bot import TelegramFormatter, TelegramCommands, TelegramWebhookServer
+    from .telegram_outbox import TelegramOutbox, OutboxWorker
+    from .telegram_scheduler import TelegramSendScheduler
 except ImportError:
-    from bot import TelegramFormatter, TelegramCommands
+    from bot import TelegramFormatter, TelegramCommands, TelegramWebhookServer
+    from telegram_outbox import TelegramOutbox, OutboxWorker
+    from telegram_scheduler import TelegramSendScheduler
 
 # Logger per TelegramService (configurazione centralizzata già attiva)
 logger = logging.getLogger(__name__)
 
 
+# ===============================
+# RISULTATI INVIO
+# ===============================
+
+class SendResults(dict):
+    """
+    Risultati di un invio multi-gruppo: {group_key: bool}.
+    
+    Stesso contratto del dict restituito in precedenza, con in più:
+    - timings_ms: durata invio per gruppo (millisecondi)
+    - elapsed_ms: durata complessiva del fan-out
+    - queued: True se i messaggi sono stati accodati nell'outbox (consegna in background)
+    - statuses: stato outbox per gruppo ('queued', 'pending', 'sent')
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings_ms: Dict[str, float] = {}
+        self.elapsed_ms: float = 0.0
+        self.queued: bool = False
+        self.statuses: Dict[str, str] = {}
+
+
 # ===============================
 # CLASSE PRINCIPALE SERVIZIO TELEGRAM  
 # ===============================
@@ -48,14 +87,38 @@ class TelegramService:
     MODULI DELEGATI:
     - TelegramFormatter: formattazione messaggi con template YAML
     - TelegramCommands: gestione comandi bot interattivi
+    
+    BOT CONDIVISO:
+    start()/close() gestiscono un telegram.Bot (con connection pool HTTP)
+    per l'event loop corrente, usato da tutti gli invii del loop.
+    Senza Bot avviato ogni invio usa un Bot one-shot (fallback).
+    
+    LIMITI ANTI-FLOOD:
+    Ogni invio passa da TelegramSendScheduler (bucket globale + per chat):
+    i chiamanti attendono invece di ricevere RetryAfter e perdere messaggi.
+    
+    OUTBOX (opzionale):
+    Con outbox configurato le notifiche di una formazione vengono accodate
+    su SQLite con chiave (id formazione, gruppo, tipo) e consegnate da un
+    worker in background: ritorno immediato, nessun messaggio duplicato.
     """
     
+    # Connessioni HTTP del Bot condiviso (>= gruppi di un broadcast)
+    CONNECTION_POOL_SIZE = 16
+    # Invii contemporanei massimi in un fan-out verso i gruppi
+    MAX_CONCURRENT_SENDS = 8
+    # Modalità di ricezione update del processo bot (run_bot_sync)
+    BOT_MODES = ('polling', 'webhook')
+    # Update elaborati in parallelo dal processo bot (un comando lento non blocca le altre chat)
+    BOT_CONCURRENT_UPDATES = 16
+    
     def __init__(
         self, 
         token: str, 
         notion_service,  # NotionService dependency (obbligatorio per comandi bot)
         groups_config_path: str = None, 
-        templates_config_path: str = None
+        templates_config_path: str = None,
+        outbox_path: str = None
     ):
         """
         Inizializza servizio con configurazioni esterne e dipendenze.
@@ -65,6 +128,7 @@ class TelegramService:
             notion_service: Istanza NotionService per comandi bot interattivi
             groups_config_path (str): Path telegram_groups.json
             templates_config_path (str): Path message_templates.yaml
+            outbox_path (str): Path SQLite outbox (default: env TELEGRAM_OUTBOX_PATH, None = invio diretto)
         """
         self.token = token
         self.notion_service = notion_service  # ✅ Dipendenza esplicita e obbligatoria
@@ -84,7 +148,27 @@ class TelegramService:
         # ✅ NotionService configurato subito nei comandi (no setter separato)
         self.commands.notion_service = notion_service
         
-        logger.info(f"✅ TelegramService inizializzato | Gruppi configurati: {len(self.groups)} | NotionService: OK")
+        # Bot condivisi per event loop: mai riusati tra loop diversi (vedi docs/event-loop-analysis.md)
+        self._loop_bots = weakref.WeakKeyDictionary()
+        self._bots_lock = threading.Lock()
+        self._bot_stats = {'bots_started': 0, 'shared_sends': 0, 'one_shot_sends': 0}
+        self.max_concurrent_sends = int(os.getenv('TELEGRAM_MAX_CONCURRENT_SENDS', self.MAX_CONCURRENT_SENDS))
+        # Limiti anti-flood condivisi da tutti gli invii del processo (limite Telegram per bot)
+        self.scheduler = TelegramSendScheduler()
+        
+        # Outbox persistente opzionale (stesso pattern di NOTION_MIRROR_PATH)
+        outbox_path = outbox_path or os.getenv('TELEGRAM_OUTBOX_PATH')
+        self.outbox = TelegramOutbox(outbox_path) if outbox_path else None
+        self._outbox_worker = None
+        self._outbox_lock = threading.Lock()
+        # Server webhook del processo bot (solo run_bot_sync in modalità webhook)
+        self.webhook_server = None
+        if self.outbox is not None and self.outbox.count_unsent():
+            # Messaggi rimasti in coda da un'esecuzione precedente
+            self._ensure_outbox_worker()
+        
+        logger.info(f"✅ TelegramService inizializzato | Gruppi configurati: {len(self.groups)} | NotionService: OK | "
+                    f"Outbox: {'ON' if self.outbox else 'OFF'}")
     
     # ===============================
     # CONFIGURAZIONE
@@ -235,29 +319,116 @@ class TelegramService:
     
 
     # ===============================
-    # GESTIONE MESSAGGI E NOTIFICHE
+    # LIFECYCLE BOT CONDIVISO
     # ===============================
     
-    async def send_message_to_group(self, group_key: str, message: str, parse_mode: str = 'HTML') -> bool:
+    def _create_bot(self) -> telegram.Bot:
+        """Crea Bot con connection pool HTTP dimensionato per i broadcast."""
+        return telegram.Bot(
+            token=self.token,
+            request=HTTPXRequest(connection_pool_size=self.CONNECTION_POOL_SIZE)
+        )
+    
+    def _get_loop_bot(self) -> Optional[telegram.Bot]:
+        """Bot condiviso dell'event loop corrente (None se non avviato)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        with self._bots_lock:
+            return self._loop_bots.get(loop)
+    
+    async def start(self) -> bool:
         """
-        Invia un messaggio a un gruppo Telegram specifico, con supporto per i topic.
+        Avvia il Bot condiviso per l'event loop corrente (idempotente).
         
-        FUNZIONE CORE:
-        - Legge la configurazione del gruppo, che ora è un oggetto con `chat_id` e `topic_id` opzionale.
-        - Invia il messaggio al topic specificato, se presente.
-        - Mantiene la compatibilità con la vecchia configurazione (stringa semplice).
+        Il Bot resta legato al loop che lo ha creato: ogni loop (processo bot,
+        singola richiesta Flask) ha il proprio, chiuso con close().
         
-        Args:
-            group_key (str): Chiave del gruppo in telegram_groups.json ('IT', 'main_group', etc.)
-            message (str): Messaggio da inviare (supporta HTML)
-            parse_mode (str): Modalità parsing ('HTML', 'Markdown', None). Default: 'HTML'
-            
         Returns:
-            bool: True se messaggio inviato con successo, False in caso di errore
+            bool: True se il Bot è stato avviato ora, False se già attivo
         """
-        if group_key not in self.groups:
-            logger.error(f"❌ Gruppo '{group_key}' non configurato in telegram_groups.json")
+        if self._get_loop_bot() is not None:
             return False
+        
+        bot = self._create_bot()
+        await bot.initialize()
+        
+        loop = asyncio.get_running_loop()
+        with self._bots_lock:
+            if loop in self._loop_bots:
+                existing = True
+            else:
+                existing = False
+                self._loop_bots[loop] = bot
+                self._bot_stats['bots_started'] += 1
+        
+        if existing:
+            # Avvio concorrente sullo stesso loop: resta il primo Bot
+            await bot.shutdown()
+            return False
+        
+        logger.debug("🤖 Bot Telegram condiviso avviato per event loop")
+        return True
+    
+    async def close(self):
+        """Chiude il Bot condiviso dell'event loop corrente (connection pool incluso)."""
+        loop = asyncio.get_running_loop()
+        with self._bots_lock:
+            bot = self._loop_bots.pop(loop, None)
+        if bot is not None:
+            await bot.shutdown()
+            logger.debug("🤖 Bot Telegram condiviso chiuso")
+    
+    @contextlib.asynccontextmanager
+    async def bot_session(self):
+        """
+        Bot condiviso per tutta la durata del blocco (es: un broadcast).
+        
+        Se il Bot del loop era già attivo resta aperto all'uscita;
+        se l'avvio fallisce gli invii ripiegano sul Bot one-shot.
+        """
+        try:
+            started = await self.start()
+        except Exception as e:
+            logger.warning(f"⚠️ Avvio Bot condiviso fallito, invii one-shot | Error: {e}")
+            started = False
+        try:
+            yield
+        finally:
+            if started:
+                await self.close()
+    
+    def get_rate_limit_stats(self) -> Dict:
+        """Statistiche limiti anti-flood: invii, RetryAfter ricevuti, attese globali e per chat."""
+        return self.scheduler.get_stats()
+    
+    def get_schedule_stats(self) -> Dict:
+        """Statistiche indice calendario dei comandi: lookup, ricostruzioni, giorni indicizzati."""
+        return self.commands.schedule.get_stats()
+    
+    def get_bot_stats(self) -> Dict:
+        """Statistiche Bot condivisi: avvii, invii condivisi e one-shot, Bot attivi."""
+        with self._bots_lock:
+            stats = dict(self._bot_stats)
+            stats['active_bots'] = len(self._loop_bots)
+        return stats
+    
+    # ===============================
+    # GESTIONE MESSAGGI E NOTIFICHE
+    # ===============================
+    
+    def _resolve_chat(self, group_key: str):
+        """
+        Risolve chat_id e topic_id di un gruppo da telegram_groups.json.
+        
+        Mantiene la compatibilità con la vecchia configurazione (stringa semplice).
+        
+        Raises:
+            ValueError: Gruppo non configurato o chat_id mancante
+        """
+        if group_key not in self.groups:
+            raise ValueError(f"Gruppo '{group_key}' non configurato in telegram_groups.json")
 
         group_config = self.groups[group_key]
         
@@ -270,27 +441,82 @@ class TelegramService:
             topic_id = None
 
         if not chat_id:
-            logger.error(f"❌ chat_id mancante per gruppo '{group_key}'")
-            return False
-
-        try:
-            # Crea un client bot temporaneo per questa operazione
-            async with telegram.Bot(token=self.token) as bot:
-                kwargs = {
-                    'chat_id': chat_id,
-                    'text': message,
-                    'parse_mode': parse_mode
-                }
-                if topic_id:
-                    kwargs['message_thread_id'] = topic_id
-                
-                await bot.send_message(**kwargs)
+            raise ValueError(f"chat_id mancante per gruppo '{group_key}'")
+        return chat_id, topic_id
+    
+    async def _deliver(self, group_key: str, message: str, parse_mode: Optional[str] = 'HTML',
+                       before_send=None, max_retry_wait: float = None):
+        """
+        Consegna un messaggio a un gruppo, sollevando l'errore in caso di fallimento.
+        
+        Usato da send_message_to_group (errore → False) e dal worker outbox
+        (errore → retry o fallimento definitivo in base al tipo).
+        I limiti anti-flood e i RetryAfter sono gestiti dallo scheduler.
+        
+        Args:
+            before_send: Callback prima di ogni tentativo (worker outbox: rinnovo lease)
+            max_retry_wait: Cap attesa RetryAfter del chiamante (worker outbox: entro il lease)
+        
+        Raises:
+            ValueError: Gruppo non configurato
+            telegram.error.RetryAfter: Attesa Telegram oltre il massimo dello scheduler
+            telegram.error.TelegramError: Errore API Telegram
+        """
+        chat_id, topic_id = self._resolve_chat(group_key)
+        
+        kwargs = {
+            'chat_id': chat_id,
+            'text': message,
+            'parse_mode': parse_mode
+        }
+        if topic_id:
+            kwargs['message_thread_id'] = topic_id
+        
+        bot = self._get_loop_bot()
+        if bot is not None:
+            # Bot condiviso del loop: connessione già aperta
+            await self.scheduler.run(chat_id, lambda: bot.send_message(**kwargs),
+                                     before_send=before_send, max_retry_wait=max_retry_wait)
+            with self._bots_lock:
+                self._bot_stats['shared_sends'] += 1
+        else:
+            # Fallback: client bot temporaneo per questa operazione
+            async def send_one_shot():
+                async with telegram.Bot(token=self.token) as one_shot_bot:
+                    return await one_shot_bot.send_message(**kwargs)
             
-            topic_info = f", topic: {topic_id}" if topic_id else ""
-            logger.info(f"📤 Messaggio inviato | Gruppo: {group_key} | Chat: {chat_id}{topic_info}")
+            await self.scheduler.run(chat_id, send_one_shot,
+                                     before_send=before_send, max_retry_wait=max_retry_wait)
+            with self._bots_lock:
+                self._bot_stats['one_shot_sends'] += 1
+        
+        topic_info = f", topic: {topic_id}" if topic_id else ""
+        logger.info(f"📤 Messaggio inviato | Gruppo: {group_key} | Chat: {chat_id}{topic_info}")
+    
+    async def send_message_to_group(self, group_key: str, message: str, parse_mode: str = 'HTML') -> bool:
+        """
+        Invia un messaggio a un gruppo Telegram specifico, con supporto per i topic.
+        
+        FUNZIONE CORE:
+        - Legge la configurazione del gruppo, che ora è un oggetto con `chat_id` e `topic_id` opzionale.
+        - Invia il messaggio al topic specificato, se presente.
+        - Mantiene la compatibilità con la vecchia configurazione (stringa semplice).
+        
+        Args:
+            group_key (str): Chiave del gruppo in telegram_groups.json ('IT', 'main_group', etc.)
+            message (str): Messaggio da inviare (supporta HTML)
+            parse_mode (str): Modalità parsing ('HTML', 'Markdown', None). Default: 'HTML'
             
+        Returns:
+            bool: True se messaggio inviato con successo, False in caso di errore
+        """
+        try:
+            await self._deliver(group_key, message, parse_mode)
             return True
             
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            return False
         except telegram.error.TelegramError as e:
             logger.error(f"❌ TelegramError invio messaggio | Gruppo: {group_key} | Error: {e}")
             return False
@@ -298,8 +524,109 @@ class TelegramService:
             logger.error(f"❌ Errore imprevisto invio messaggio | Gruppo: {group_key} | Error: {e}", exc_info=True)
             return False
     
+    async def _send_to_groups(self, messages: Dict[str, str]) -> SendResults:
+        """
+        Invia messaggi a più gruppi in parallelo (fan-out).
+        
+        - Un solo Bot condiviso per tutto il fan-out (bot_session)
+        - Al massimo max_concurrent_sends invii contemporanei
+        - Risultati nell'ordine dei gruppi target, con durata per gruppo
+        
+        Args:
+            messages: {group_key: messaggio già formattato}
+            
+        Returns:
+            SendResults: {group_key: bool} + timings_ms / elapsed_ms
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_sends))
+        
+        async def send(group_key: str, message: str):
+            async with semaphore:
+                started = time.perf_counter()
+                success = await self.send_message_to_group(group_key, message)
+                return success, (time.perf_counter() - started) * 1000
+        
+        start_time = time.perf_counter()
+        async with self.bot_session():
+            outcomes = await asyncio.gather(*(send(group_key, message) for group_key, message in messages.items()))
+        
+        results = SendResults()
+        for group_key, (success, duration_ms) in zip(messages, outcomes):
+            results[group_key] = success
+            results.timings_ms[group_key] = round(duration_ms, 1)
+        results.elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        return results
+    
+    
+    # ===============================
+    # OUTBOX (CONSEGNA IN BACKGROUND)
+    # ===============================
+    
+    def _ensure_outbox_worker(self) -> OutboxWorker:
+        """Avvia il worker dell'outbox se non attivo (thread ed event loop dedicati)."""
+        with self._outbox_lock:
+            if self._outbox_worker is None:
+                self._outbox_worker = OutboxWorker(
+                    self.outbox, self._deliver, session=self.bot_session,
+                    max_concurrent=self.max_concurrent_sends
+                )
+            worker = self._outbox_worker
+        worker.start()
+        return worker
+    
+    async def _dispatch(self, training_data: Dict, kind: str, messages: Dict[str, str]) -> SendResults:
+        """
+        Consegna i messaggi di una formazione: outbox se configurato, altrimenti fan-out diretto.
+        
+        Con outbox il ritorno è immediato: True per gruppo significa messaggio
+        accettato (accodato ora, già in coda o già consegnato), lo stato
+        effettivo è in results.statuses e in get_outbox_delivery_status().
+        
+        Args:
+            training_data: Dati formazione (serve 'id' per la chiave di idempotenza)
+            kind: Tipo comunicazione ('training', 'feedback')
+            messages: {group_key: messaggio già formattato}
+            
+        Returns:
+            SendResults: Risultati per gruppo
+        """
+        training_id = training_data.get('id') or training_data.get('notion_id')
+        if self.outbox is None or not training_id:
+            return await self._send_to_groups(messages)
+        
+        start_time = time.perf_counter()
+        statuses = self.outbox.enqueue(str(training_id), kind, messages)
+        self._ensure_outbox_worker().wake()
+        
+        results = SendResults((group_key, True) for group_key in messages)
+        results.queued = True
+        results.statuses = statuses
+        results.elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        return results
+    
+    def get_outbox_delivery_status(self, training_id: str, kind: str = 'training') -> Dict[str, Dict]:
+        """Stato consegna per gruppo dei messaggi di una formazione ({} senza outbox)."""
+        if self.outbox is None:
+            return {}
+        return self.outbox.get_delivery_status(training_id, kind)
+    
+    def get_outbox_stats(self) -> Dict:
+        """Statistiche outbox e worker (enabled=False senza outbox)."""
+        if self.outbox is None:
+            return {'enabled': False}
+        worker = self._outbox_worker
+        stats = worker.get_stats() if worker else {'running': False, 'queue': self.outbox.get_stats()}
+        stats['enabled'] = True
+        return stats
     
-    async def send_training_notification(self, training_data: Dict) -> Dict[str, bool]:
+    def stop_outbox_worker(self, timeout: float = 10.0):
+        """Ferma il worker dell'outbox (i messaggi non consegnati restano in coda)."""
+        with self._outbox_lock:
+            worker, self._outbox_worker = self._outbox_worker, None
+        if worker is not None:
+            worker.stop(timeout)
+    
+    async def send_training_notification(self, training_data: Dict) -> SendResults:
         """
         Invia notifica di nuova formazione ai gruppi appropriati usando template YAML.
         
@@ -323,10 +650,11 @@ class TelegramService:
                 - Periodo: periodo formazione ('Programmata', 'OUT', etc.)
                 
         Returns:
-            Dict[str, bool]: Risultati invio per ogni gruppo target
-                             {'main_group': True, 'IT': False, ...}                             
+            SendResults: Risultati invio per ogni gruppo target
+                         {'main_group': True, 'IT': False, ...} (+ timings_ms per gruppo)
+                         Con outbox: True = accodato, consegna in background (results.queued)
         """
-        results = {}
+        results = SendResults()
         
         # Determina gruppi target in base ad area e periodo della formazione
         target_groups = self._get_target_groups(training_data)
@@ -340,17 +668,23 @@ class TelegramService:
         logger.info(f"📣 Invio notifica formazione | Target: {len(target_groups)} gruppi | "
                    f"Formazione: {training_data.get('Nome', 'N/A')}")
         
-        for group_key in target_groups:
-            message = self.formatter.format_training_message(training_data, group_key)
-            success = await self.send_message_to_group(group_key, message)
-            results[group_key] = success
+        # Invio parallelo con un solo Bot (e connection pool) per tutto il broadcast
+        messages = {
+            group_key: self.formatter.format_training_message(training_data, group_key)
+            for group_key in target_groups
+        }
+        results = await self._dispatch(training_data, 'training', messages)
         
         successful = sum(1 for s in results.values() if s)
+        if results.queued:
+            logger.info(f"📮 Notifica formazione accodata | Gruppi: {', '.join(results.keys())} | "
+                       f"Già consegnati: {sum(1 for s in results.statuses.values() if s == 'sent')}")
+            return results
         logger.info(f"✅ Notifica formazione completata | Successo: {successful}/{len(results)} | "
-                   f"Gruppi: {', '.join(results.keys())}")
+                   f"Gruppi: {', '.join(results.keys())} | Tempo: {results.elapsed_ms:.0f}ms")
         return results
     
-    async def send_feedback_notification(self, training_data: Dict, feedback_link: str) -> Dict[str, bool]:
+    async def send_feedback_notification(self, training_data: Dict, feedback_link: str) -> SendResults:
         """
         Invia richiesta feedback post-formazione ai gruppi area (NO main_group).
         
@@ -374,7 +708,8 @@ class TelegramService:
             feedback_link (str): URL diretto al form di feedback online
             
         Returns:
-            Dict[str, bool]: Risultati invio per gruppi area (escluso main_group)
+            SendResults: Risultati invio per gruppi area (escluso main_group, + timings_ms)
+                         Con outbox: True = accodato, consegna in background (results.queued)
             
         ESEMPIO:
             results = await service.send_feedback_notification(
@@ -383,7 +718,7 @@ class TelegramService:
             )
             # Risultato: {'IT': True} (solo gruppo IT, no main_group)
         """
-        results = {}
+        results = SendResults()
         
         # Ottieni tutti i gruppi target della formazione
         all_target_groups = self._get_target_groups(training_data)
@@ -399,21 +734,26 @@ class TelegramService:
         logger.info(f"📝 Invio richiesta feedback | Target: {len(target_groups)} gruppi area | "
                    f"Formazione: {training_data.get('Nome', 'N/A')}")
         
-        for group_key in target_groups:
-            message = self.formatter.format_feedback_message(training_data, feedback_link, group_key)
-            success = await self.send_message_to_group(group_key, message)
-            results[group_key] = success
+        messages = {
+            group_key: self.formatter.format_feedback_message(training_data, feedback_link, group_key)
+            for group_key in target_groups
+        }
+        results = await self._dispatch(training_data, 'feedback', messages)
         
         successful = sum(1 for s in results.values() if s)
+        if results.queued:
+            logger.info(f"📮 Richiesta feedback accodata | Gruppi: {', '.join(results.keys())} | "
+                       f"Già consegnati: {sum(1 for s in results.statuses.values() if s == 'sent')}")
+            return results
         logger.info(f"✅ Richiesta feedback completata | Successo: {successful}/{len(results)} | "
-                   f"Gruppi: {', '.join(results.keys())}")
+                   f"Gruppi: {', '.join(results.keys())} | Tempo: {results.elapsed_ms:.0f}ms")
         return results
     
     # ===============================
     # GESTIONE LIFECYCLE BOT TELEGRAM (per run_bot.py)
     # ===============================
     
-    def run_bot_sync(self):
+    def run_bot_sync(self, mode: str = None):
         """
         Esegue il bot in modalità sincrona per script standalone o testing.
         
@@ -426,51 +766,118 @@ class TelegramService:
         - Gestione automatica event loop asyncio
         - Gestione CTRL+C per shutdown pulito
         - Mantiene bot attivo fino a interruzione utente
+        - Ricezione update in polling o via webhook (endpoint aiohttp locale)
         
         PROCESSO:
         1. Crea event loop asyncio
-        2. Avvia bot con start_bot()
+        2. Avvia Application + polling o server webhook (_serve_bot)
         3. Mantiene esecuzione con Event().wait()
         4. Gestisce KeyboardInterrupt per shutdown graceful
-        5. Chiama stop_bot() nel finally
+        5. Ferma webhook/polling e Application nel finally
+        
+        Args:
+            mode (str): 'polling' o 'webhook' (default env TELEGRAM_BOT_MODE o 'polling')
         
         ESEMPIO USO:
             service = TelegramService(token="...")
             service.run_bot_sync()  # Bot resta attivo fino a CTRL+C
         """
-        async def main():
-            # Crea l'Application instance qui, solo per il processo del bot
-            application = Application.builder().token(self.token).build()
-            
-            # Registra i comandi sull'istanza dell'applicazione
-            self.commands.register_handlers(application)
-            logger.info("✅ Comandi bot configurati per il processo di polling.")
-
-            try:
-                logger.info("🚀 Avvio del bot Telegram in modalità polling...")
-                await application.initialize()
-                await application.start()
-                await application.updater.start_polling()
-                logger.info("✅ Bot Telegram avviato con successo e in ascolto comandi.")
-                
-                # Mantieni il processo in vita
-                await asyncio.Event().wait()
-
-            except (KeyboardInterrupt, SystemExit):
-                logger.info("🛑 Interruzione ricevuta, avvio spegnimento pulito del bot...")
-            
-            finally:
-                if application.updater and application.updater.is_running:
-                    await application.updater.stop()
-                if application.running:
-                    await application.stop()
-                await application.shutdown()
-                logger.info("✅ Bot Telegram fermato con successo.")
+        mode = (mode or os.getenv('TELEGRAM_BOT_MODE', 'polling')).lower()
+        if mode not in self.BOT_MODES:
+            raise ValueError(f"Modalità bot non valida: '{mode}' (disponibili: {', '.join(self.BOT_MODES)})")
         
         try:
-            asyncio.run(main())
+            asyncio.run(self._serve_bot(mode))
         except Exception as e:
             logger.critical(f"Errore critico nel loop principale del bot: {e}", exc_info=True)
+    
+    def build_bot_application(self, mode: str = 'polling') -> Application:
+        """
+        Crea l'Application del processo bot con i comandi registrati.
+        
+        Update elaborati in parallelo fino a TELEGRAM_BOT_CONCURRENT_UPDATES (default 16):
+        il comando di una chat non attende quelli delle altre.
+        
+        Args:
+            mode (str): 'polling' (con Updater) o 'webhook' (update dal server locale, nessun Updater)
+            
+        Returns:
+            Application: Application pronta per initialize()/start()
+        """
+        concurrent_updates = int(os.getenv('TELEGRAM_BOT_CONCURRENT_UPDATES', self.BOT_CONCURRENT_UPDATES))
+        builder = Application.builder().token(self.token).concurrent_updates(max(1, concurrent_updates))
+        if mode == 'webhook':
+            builder = builder.updater(None)
+        application = builder.build()
+        
+        # Registra i comandi sull'istanza dell'applicazione
+        self.commands.register_handlers(application)
+        logger.info(f"✅ Comandi bot configurati per il processo bot ({mode}) | "
+                    f"Update concorrenti: {application.update_processor.max_concurrent_updates}")
+        return application
+    
+    async def _serve_bot(self, mode: str):
+        """Avvia Application e ricezione update (polling o webhook) fino a interruzione."""
+        # Crea l'Application instance qui, solo per il processo del bot
+        application = self.build_bot_application(mode)
+        
+        try:
+            logger.info(f"🚀 Avvio del bot Telegram in modalità {mode}...")
+            await application.initialize()
+            await application.start()
+            if mode == 'webhook':
+                await self._start_webhook(application)
+            else:
+                await application.updater.start_polling()
+            # Bot condiviso per gli invii eseguiti da questo processo
+            await self.start()
+            logger.info("✅ Bot Telegram avviato con successo e in ascolto comandi.")
+            
+            # Mantieni il processo in vita
+            await asyncio.Event().wait()
+        
+        except (KeyboardInterrupt, SystemExit):
+            logger.info("🛑 Interruzione ricevuta, avvio spegnimento pulito del bot...")
+        
+        finally:
+            await self.close()
+            if self.webhook_server is not None:
+                await self.webhook_server.stop()
+            if application.updater and application.updater.is_running:
+                await application.updater.stop()
+            if application.running:
+                await application.stop()
+            await application.shutdown()
+            logger.info("✅ Bot Telegram fermato con successo.")
+    
+    async def _start_webhook(self, application: Application):
+        """
+        Avvia il server webhook locale e registra l'URL pubblico su Telegram.
+        
+        CONFIGURAZIONE (env):
+        - TELEGRAM_WEBHOOK_URL: URL pubblico HTTPS che inoltra all'endpoint locale
+          (se assente, il webhook va registrato esternamente)
+        - TELEGRAM_WEBHOOK_SECRET: secret header (generato se assente e URL configurato)
+        - TELEGRAM_WEBHOOK_HOST / TELEGRAM_WEBHOOK_PORT / TELEGRAM_WEBHOOK_PATH: endpoint locale
+        """
+        webhook_url = os.getenv('TELEGRAM_WEBHOOK_URL')
+        secret_token = os.getenv('TELEGRAM_WEBHOOK_SECRET')
+        if webhook_url and not secret_token:
+            # Telegram invia il secret in ogni richiesta: update falsi rifiutati anche senza configurazione
+            secret_token = secrets.token_urlsafe(32)
+        
+        self.webhook_server = TelegramWebhookServer(application, secret_token=secret_token)
+        await self.webhook_server.start()
+        
+        if webhook_url:
+            await application.bot.set_webhook(url=webhook_url, secret_token=secret_token)
+            logger.info(f"✅ Webhook registrato su Telegram | URL: {webhook_url}")
+        else:
+            logger.warning("⚠️ TELEGRAM_WEBHOOK_URL non configurato: webhook da registrare esternamente (setWebhook)")
+    
+    def get_webhook_stats(self) -> Dict:
+        """Statistiche webhook del processo bot (dict vuoto in modalità polling)."""
+        return self.webhook_server.get_stats() if self.webhook_server is not None else {}
 
 
 
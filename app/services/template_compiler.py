@@ -0,0 +1,145 @@
+"""
+Template Compiler - Template messaggi compilati al caricamento
+
+Questo modulo gestisce:
+- Parsing dei template str.format una sola volta (al caricamento dello YAML)
+- Validazione di ogni placeholder contro i campi noti del formatter
+- Render per segmenti precompilati: testo letterale fisso + valori dei campi, uniti con join
+  (nessun parsing del template a ogni messaggio)
+
+Un placeholder sbagliato viene segnalato al caricamento con il nome del
+template e i campi disponibili, non al primo invio.
+"""
+
+import string
+from typing import Callable, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+
+class TemplateCompileError(ValueError):
+    """Template non valido (sintassi o placeholder sconosciuti)."""
+    pass
+
+
+_FORMATTER = string.Formatter()
+
+
+def _placeholders(source: str) -> list:
+    """Nomi dei placeholder (inclusi quelli annidati nei format spec)."""
+    names = []
+    for _literal, field_name, format_spec, _conversion in _FORMATTER.parse(source):
+        if field_name is None:
+            continue
+        names.append(field_name)
+        if format_spec and '{' in format_spec:
+            names.extend(_placeholders(format_spec))
+    return names
+
+
+class CompiledTemplate:
+    """
+    Template str.format validato e pronto al render.
+
+    RESPONSABILITÀ:
+    - Rifiutare sintassi non valida, placeholder posizionali e campi sconosciuti
+    - Esporre i campi usati dal template (fields)
+    - Precompilare il template in segmenti letterali e slot dei campi
+
+    Gli slot {campo} semplici leggono il valore dal dict; quelli con conversione,
+    format spec o accesso ad attributo/indice usano format_map sul solo placeholder.
+    L'output è identico a str.format.
+    """
+
+    __slots__ = ('name', 'source', 'fields', '_parts', '_slots')
+
+    def __init__(self, source: str, allowed_fields: Iterable[str], name: str = 'template'):
+        """
+        Compila e valida il template.
+
+        Args:
+            source: Testo del template (placeholder {campo})
+            allowed_fields: Campi forniti dal formatter per questo template
+            name: Nome del template (per i messaggi di errore)
+
+        Raises:
+            TemplateCompileError: Template non stringa, sintassi errata o placeholder non validi
+        """
+        if not isinstance(source, str):
+            raise TemplateCompileError(f"Template '{name}' non è un testo: {type(source).__name__}")
+
+        allowed = frozenset(allowed_fields)
+        try:
+            placeholders = _placeholders(source)
+        except ValueError as e:
+            raise TemplateCompileError(f"Template '{name}' con sintassi non valida: {e}")
+
+        used = set()
+        unknown = []
+        for placeholder in placeholders:
+            # Nome base: {campo.attr} / {campo[0]} → campo
+            base = placeholder.split('.', 1)[0].split('[', 1)[0]
+            if not base or base.isdigit():
+                raise TemplateCompileError(f"Template '{name}': placeholder posizionali non supportati ('{{}}')")
+            if base not in allowed:
+                unknown.append(base)
+            used.add(base)
+
+        if unknown:
+            raise TemplateCompileError(
+                f"Template '{name}': placeholder sconosciuti {sorted(set(unknown))} "
+                f"(disponibili: {', '.join(sorted(allowed))})"
+            )
+
+        self.name = name
+        self.source = source
+        self.fields: FrozenSet[str] = frozenset(used)
+        self._parts, self._slots = self._compile_segments(source)
+
+    @staticmethod
+    def _compile_segments(source: str) -> Tuple[List[Optional[str]], Tuple]:
+        """
+        Divide il template in parti letterali e slot (indice, campo, formatter del placeholder).
+
+        Returns:
+            Tuple: Parti del testo (None negli slot) e slot da riempire al render
+        """
+        parts: List[Optional[str]] = []
+        slots = []
+        for literal, field_name, format_spec, conversion in _FORMATTER.parse(source):
+            if literal:
+                parts.append(literal)
+            if field_name is None:
+                continue
+            field_format: Optional[Callable[[Mapping], str]] = None
+            if format_spec or conversion or not field_name.isidentifier():
+                # Placeholder completo ricostruito (conversione e spec annidati inclusi)
+                placeholder = '{' + field_name + (f'!{conversion}' if conversion else '') + \
+                              (f':{format_spec}' if format_spec else '') + '}'
+                field_format = placeholder.format_map
+            slots.append((len(parts), field_name, field_format))
+            parts.append(None)
+        return parts, tuple(slots)
+
+    def render(self, values: Mapping) -> str:
+        """
+        Render del template.
+
+        Args:
+            values: Valori per i campi (almeno quelli in fields)
+
+        Returns:
+            str: Testo renderizzato
+
+        Raises:
+            KeyError: Campo del template mancante in values
+        """
+        parts = self._parts.copy()
+        for index, field_name, field_format in self._slots:
+            if field_format is not None:
+                parts[index] = field_format(values)
+            else:
+                value = values[field_name]
+                parts[index] = value if type(value) is str else format(value)
+        return ''.join(parts)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.name!r}, fields={sorted(self.fields)})"
@@ -234,6 +234,8 @@ class TrainingService:
                 'teams_link': str,
                 'attendee_emails': List[str],
                 'telegram_results': dict,
+                'telegram_timings_ms': dict,  # Durata invio per gruppo
+                'telegram_queued': bool,  # True: accodati nell'outbox, consegna in background
                 'nuovo_stato': str
             }
             
@@ -270,14 +272,18 @@ class TrainingService:
                 raise TrainingServiceError(f"Impossibile creare evento Teams: {e}")
             
             # 4. Aggiorna Notion con codice + link Teams + stato
-            await self.notion_service.update_formazione(training_id, {
+            #    (la formazione aggiornata arriva dalla response, nessuna rilettura)
+            updated_training = await self.notion_service.update_formazione(training_id, {
                 'Codice': generated_code,
                 'Link Teams': teams_link,
                 'Stato': 'Calendarizzata'
             })
             
-            # 5. Recupera formazione aggiornata per invio Telegram
-            updated_training = await self.notion_service.get_formazione_by_id(training_id)
+            # 5. Scrittura riuscita ma pagina restituita non parsabile: rileggo per invio Telegram
+            #    (un aggiornamento fallito solleva NotionServiceError)
+            if updated_training is None:
+                logger.warning(f"Pagina aggiornata non parsabile per {training_id}, rileggo la formazione")
+                updated_training = await self.notion_service.get_formazione_by_id(training_id)
             
             # 6. Invia messaggi Telegram
             send_results = await self.telegram_service.send_training_notification(updated_training)
@@ -287,6 +293,8 @@ class TrainingService:
                 'teams_link': teams_link,
                 'attendee_emails': attendee_emails,
                 'telegram_results': send_results,
+                'telegram_timings_ms': getattr(send_results, 'timings_ms', {}),
+                'telegram_queued': getattr(send_results, 'queued', False),
                 'nuovo_stato': 'Calendarizzata'
             }
             
@@ -406,6 +414,8 @@ class TrainingService:
             Dict con risultati operazione: {
                 'feedback_link': str,
                 'telegram_results': dict,
+                'telegram_timings_ms': dict,  # Durata invio per gruppo
+                'telegram_queued': bool,  # True: accodati nell'outbox, consegna in background
                 'nuovo_stato': str
             }
             
@@ -443,6 +453,8 @@ class TrainingService:
             result = {
                 'feedback_link': feedback_link,
                 'telegram_results': send_results,
+                'telegram_timings_ms': getattr(send_results, 'timings_ms', {}),
+                'telegram_queued': getattr(send_results, 'queued', False),
                 'nuovo_stato': 'Conclusa'
             }
             
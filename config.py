@@ -32,6 +32,8 @@ class Config:
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
     TELEGRAM_GROUPS_CONFIG = 'config/telegram_groups.json'
     TELEGRAM_TEMPLATES_CONFIG = 'config/message_templates.yaml'
+    # Processo bot (run_bot.py): 'polling' o 'webhook' (endpoint aiohttp locale)
+    TELEGRAM_BOT_MODE = os.getenv('TELEGRAM_BOT_MODE', 'polling').lower()
     
     # ===== NOTION CONFIG =====
     NOTION_TOKEN = os.getenv('NOTION_TOKEN')
@@ -2,8 +2,9 @@
 """
 🤖 Processo dedicato per Bot Telegram Formazing
 
-Esegue il bot Telegram in modalità polling per gestire comandi interattivi
-come /oggi, /domani, /settimana senza interferire con il processo Flask.
+Esegue il bot Telegram in modalità polling o webhook (TELEGRAM_BOT_MODE) per
+gestire comandi interattivi come /oggi, /domani, /settimana senza interferire
+con il processo Flask.
 """
 
 import logging
@@ -30,11 +31,11 @@ if __name__ == "__main__":
     training_service = TrainingService.get_instance()
     logger.info("✅ TrainingService Singleton inizializzato")
     
-    # Usa il metodo run_bot_sync per gestire il bot in modalità polling
+    # Usa il metodo run_bot_sync per gestire il bot (polling o webhook da configurazione)
     # Gestisce avvio, ascolto comandi e spegnimento pulito
     try:
-        logger.info("🚀 Avvio bot in modalità polling...")
-        training_service.telegram_service.run_bot_sync()
+        logger.info(f"🚀 Avvio bot in modalità {Config.TELEGRAM_BOT_MODE}...")
+        training_service.telegram_service.run_bot_sync(mode=Config.TELEGRAM_BOT_MODE)
     except KeyboardInterrupt:
         logger.info("⏹️  Interruzione utente ricevuta (CTRL+C)")
     except Exception as e:
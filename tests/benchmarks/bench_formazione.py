@@ -0,0 +1,111 @@
+"""
+Benchmark - Record Formazione vs dict
+
+Confronta, su N formazioni:
+- Memoria: dict (vecchio formato) vs Formazione con __slots__
+- Costo date: strptime ripetuto in ogni consumer vs datetime parsato una volta
+
+I consumer simulati sono quelli che prima riparsavano 'Data/Ora':
+TelegramCommands (data + ora), TelegramFormatter, CalendarOperations, EmailFormatter.
+
+UTILIZZO:
+python -m tests.benchmarks.bench_formazione
+python -m tests.benchmarks.bench_formazione --records 50000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app.services.notion.formazione import DATA_ORA_FORMAT, Formazione, get_data_inizio
+from app.services.notion.data_parser import NotionDataParser
+
+
+# Numero di letture della data per formazione nel workflow (commands x2, formatter, calendar, email)
+CONSUMER_READS = 5
+
+
+def build_pages(count: int) -> list:
+    """Pagine Notion sintetiche (stessa struttura di sample_notion_page)."""
+    base = datetime(2024, 1, 1, 9, 0)
+    return [
+        {
+            "id": f"page-{i:06d}",
+            "properties": {
+                "Nome": {"title": [{"plain_text": f"Formazione {i}"}]},
+                "Area": {"multi_select": [{"name": "IT"}, {"name": "R&D"}]},
+                "Date": {"date": {"start": (base + timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:00.000Z')}},
+                "Stato": {"status": {"name": "Calendarizzata"}},
+                "Codice": {"rich_text": [{"plain_text": f"IT-{i}"}]},
+                "Link Teams": {"url": f"https://teams.microsoft.com/l/meetup-join/{i}"},
+                "Periodo": {"select": {"name": "SPRING"}}
+            }
+        }
+        for i in range(count)
+    ]
+
+
+def measure_memory(factory) -> int:
+    """Byte allocati per costruire gli oggetti restituiti da factory."""
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    objects = factory()
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, 'filename'))
+    del objects
+    return allocated
+
+
+def legacy_date_reads(formazioni: list):
+    """Vecchio flusso: ogni consumer riparsa la stringa 'Data/Ora'."""
+    for formazione in formazioni:
+        for _ in range(CONSUMER_READS):
+            datetime.strptime(formazione['Data/Ora'], DATA_ORA_FORMAT)
+
+
+def record_date_reads(formazioni: list):
+    """Nuovo flusso: ogni consumer legge il datetime già calcolato."""
+    for formazione in formazioni:
+        for _ in range(CONSUMER_READS):
+            get_data_inizio(formazione)
+
+
+def timed(func, *args) -> float:
+    """Durata in millisecondi."""
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark record Formazione")
+    parser.add_argument('--records', type=int, default=10_000)
+    args = parser.parse_args()
+
+    pages = build_pages(args.records)
+    data_parser = NotionDataParser()
+    records = [data_parser.parse_single_formazione(page) for page in pages]
+    dicts = [record.to_dict() for record in records]
+
+    dict_bytes = measure_memory(lambda: [record.to_dict() for record in records])
+    slots_bytes = measure_memory(lambda: [
+        Formazione(r.id, r.nome, r.area, r.data_inizio, r.stato, r.codice,
+                   r.link_teams, r.periodo, r.notion_id, r.data_ora)
+        for r in records
+    ])
+
+    legacy_ms = timed(legacy_date_reads, dicts)
+    record_ms = timed(record_date_reads, records)
+
+    print(f"\n📊 Formazione benchmark | Record: {args.records:,} | Letture data per record: {CONSUMER_READS}\n")
+    print(f"{'':24}{'dict':>14}{'Formazione':>14}{'rapporto':>10}")
+    print(f"{'Memoria (byte/record)':24}{dict_bytes / args.records:>14.0f}{slots_bytes / args.records:>14.0f}"
+          f"{dict_bytes / max(slots_bytes, 1):>9.1f}x")
+    print(f"{'Date (µs/record)':24}{legacy_ms * 1000 / args.records:>14.2f}{record_ms * 1000 / args.records:>14.2f}"
+          f"{legacy_ms / max(record_ms, 1e-9):>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
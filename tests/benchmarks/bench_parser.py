@@ -0,0 +1,111 @@
+"""
+Benchmark - Parser generico vs parser compilato dallo schema
+
+Confronta, su liste di pagine Notion sintetiche:
+- Parser generico: parse_single_formazione per ogni pagina (estrattori extract_*)
+- Parser compilato: CompiledFormazioneParser (estrattori risolti dallo schema, ciclo unico)
+
+Verifica anche che i due percorsi producano le stesse formazioni.
+
+UTILIZZO:
+python -m tests.benchmarks.bench_parser
+python -m tests.benchmarks.bench_parser --sizes 1000 10000 --repeat 5
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+
+from app.services.notion.data_parser import NotionDataParser
+
+
+# Schema come restituito da NotionClient.get_database_schema()
+SCHEMA = {
+    'Nome': {'id': 'title', 'type': 'title'},
+    'Area': {'id': 'ar01', 'type': 'multi_select'},
+    'Date': {'id': 'dt01', 'type': 'date'},
+    'Stato': {'id': 'st01', 'type': 'status'},
+    'Codice': {'id': 'cd01', 'type': 'rich_text'},
+    'Link Teams': {'id': 'lt01', 'type': 'url'},
+    'Periodo': {'id': 'pr01', 'type': 'select'}
+}
+
+AREE = [
+    {'multi_select': [{'name': 'IT'}, {'name': 'R&D'}]},
+    {'multi_select': [{'name': 'HR'}]},
+    {'multi_select': [{'name': 'Marketing'}, {'name': 'IT'}, {'name': 'Sales'}]}
+]
+STATI = [{'status': {'name': name}} for name in ('Programmata', 'Calendarizzata', 'Conclusa')]
+PERIODO = {'select': {'name': 'SPRING'}}
+
+
+def build_pages(count: int) -> list:
+    """
+    Pagine Notion sintetiche (struttura di databases.query).
+
+    Le property a valore ripetuto (area, stato, periodo) sono oggetti condivisi
+    per contenere la memoria a 100k pagine: il parser li legge soltanto.
+    """
+    base = datetime(2024, 1, 1, 9, 0)
+    pages = []
+    for i in range(count):
+        start = base + timedelta(hours=i)
+        pages.append({
+            'id': f'page-{i:06d}',
+            'properties': {
+                'Nome': {'title': [{'plain_text': f'Formazione {i}'}]},
+                'Area': AREE[i % len(AREE)],
+                'Date': {'date': {'start': start.strftime('%Y-%m-%dT%H:%M:00.000Z')}},
+                'Stato': STATI[i % len(STATI)],
+                'Codice': {'rich_text': [{'plain_text': f'IT-{i}'}]} if i % 4 else {'rich_text': []},
+                'Link Teams': {'url': f'https://teams.microsoft.com/l/meetup-join/{i}' if i % 4 else None},
+                'Periodo': PERIODO
+            }
+        })
+    return pages
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Migliore durata in millisecondi su `repeat` esecuzioni."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser formazioni")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Log del parser fuori dalla misura (come in produzione a livello INFO)
+    logging.basicConfig(level=logging.WARNING)
+
+    generic = NotionDataParser()
+    compiled = NotionDataParser()
+    compiled.compile_schema(SCHEMA)
+
+    print(f"\n📊 Parser benchmark | Migliore di {args.repeat} esecuzioni\n")
+    print(f"{'Pagine':>10}{'generico (ms)':>16}{'compilato (ms)':>16}{'µs/pagina':>18}{'rapporto':>10}")
+
+    for size in args.sizes:
+        response = {'results': build_pages(size)}
+
+        # Stesso output dai due percorsi
+        expected = [f.to_dict() for f in generic.parse_formazioni_list(response)]
+        assert [f.to_dict() for f in compiled.parse_formazioni_list(response)] == expected
+
+        generic_ms = best_of(args.repeat, generic.parse_formazioni_list, response)
+        compiled_ms = best_of(args.repeat, compiled.parse_formazioni_list, response)
+
+        per_page = f"{generic_ms * 1000 / size:.2f} → {compiled_ms * 1000 / size:.2f}"
+        print(f"{size:>10,}{generic_ms:>16.1f}{compiled_ms:>16.1f}{per_page:>18}"
+              f"{generic_ms / max(compiled_ms, 1e-9):>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
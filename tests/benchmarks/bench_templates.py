@@ -0,0 +1,123 @@
+"""
+Benchmark - Render messaggi Telegram: str.format sul testo YAML vs template compilati
+
+Confronta, su formazioni sintetiche (scenario digest / promemoria broadcast):
+- Solo template: str.format(**valori) sul testo YAML vs CompiledTemplate.render
+- Formatter completo (TelegramFormatter.format_training_message, 7 gruppi per formazione):
+  cache render fredda (ogni formazione nuova) e calda (stessi dati già renderizzati)
+
+Verifica anche che i due percorsi producano gli stessi messaggi.
+
+UTILIZZO:
+python -m tests.benchmarks.bench_templates
+python -m tests.benchmarks.bench_templates --sizes 1000 10000 --repeat 5
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+
+import yaml
+
+from app.services.bot.telegram_formatters import TelegramFormatter
+from app.services.notion.formazione import Formazione
+from app.services.template_compiler import CompiledTemplate
+
+
+GROUPS = ['main_group', 'IT', 'R&D', 'HR', 'Legale', 'Commerciale', 'Marketing']
+
+
+def build_trainings(count: int) -> list:
+    """Formazioni sintetiche (record Formazione, come restituiti da NotionService)."""
+    base = datetime(2024, 1, 1, 9, 0)
+    return [
+        Formazione(
+            id=f'page-{i:06d}', nome=f'Formazione {i}', area=['IT', 'R&D'] if i % 2 else ['All'],
+            data_inizio=base + timedelta(hours=i), stato='Calendarizzata', codice=f'IT-{i}',
+            link_teams=f'https://teams.microsoft.com/l/meetup-join/{i}', periodo='SPRING'
+        )
+        for i in range(count)
+    ]
+
+
+def build_values(count: int) -> list:
+    """Valori template già estratti (misura del solo render)."""
+    return [
+        {'nome': f'Formazione {i}', 'area': 'IT, R&D', 'data_ora': '15/10/2024 14:30',
+         'codice': f'IT-{i}', 'link_teams': f'https://teams.microsoft.com/l/meetup-join/{i}'}
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Migliore durata in millisecondi su `repeat` esecuzioni."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark render template messaggi")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--templates', default='config/message_templates.yaml')
+    args = parser.parse_args()
+
+    # Log del formatter fuori dalla misura (come in produzione a livello INFO)
+    logging.basicConfig(level=logging.WARNING)
+
+    with open(args.templates, 'r', encoding='utf-8') as f:
+        templates = yaml.safe_load(f)
+    source = templates['training_notification']['telegram']['area_group']
+    compiled = CompiledTemplate(source, TelegramFormatter.TRAINING_FIELDS, 'area_group')
+
+    def render_raw(values_list):
+        for values in values_list:
+            source.format(**values)
+
+    def render_compiled(values_list):
+        for values in values_list:
+            compiled.render(values)
+
+    print(f"\n📊 Template benchmark | Migliore di {args.repeat} esecuzioni\n")
+    print("Solo template (area_group)")
+    print(f"{'Messaggi':>10}{'str.format (ms)':>18}{'compilato (ms)':>16}{'msg/s compilato':>18}{'rapporto':>10}")
+
+    for size in args.sizes:
+        values_list = build_values(size)
+        assert [compiled.render(v) for v in values_list[:10]] == [source.format(**v) for v in values_list[:10]]
+
+        raw_ms = best_of(args.repeat, render_raw, values_list)
+        compiled_ms = best_of(args.repeat, render_compiled, values_list)
+        print(f"{size:>10,}{raw_ms:>18.1f}{compiled_ms:>16.1f}{size / (compiled_ms / 1000):>18,.0f}"
+              f"{raw_ms / max(compiled_ms, 1e-9):>9.1f}x")
+
+    print(f"\nFormatter completo ({len(GROUPS)} gruppi per formazione)")
+    print(f"{'Messaggi':>10}{'cache fredda (ms)':>20}{'cache calda (ms)':>18}{'msg/s fredda':>16}{'msg/s calda':>16}")
+
+    for size in args.sizes:
+        trainings = build_trainings(max(1, size // len(GROUPS)))
+        messages = len(trainings) * len(GROUPS)
+
+        def render_all(formatter):
+            for training in trainings:
+                for group_key in GROUPS:
+                    formatter.format_training_message(training, group_key)
+
+        cold_ms = float('inf')
+        for _ in range(args.repeat):
+            formatter = TelegramFormatter(templates)
+            formatter.render_cache.max_entries = messages
+            cold_ms = min(cold_ms, best_of(1, render_all, formatter))
+        warm_ms = best_of(args.repeat, render_all, formatter)
+
+        print(f"{messages:>10,}{cold_ms:>20.1f}{warm_ms:>18.1f}"
+              f"{messages / (cold_ms / 1000):>16,.0f}{messages / (warm_ms / 1000):>16,.0f}")
+
+
+if __name__ == '__main__':
+    main()
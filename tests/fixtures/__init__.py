@@ -24,6 +24,8 @@ __all__ = [
     # Telegram fixtures
     "mock_telegram_bot",
     "configured_telegram_service",
+    "offline_telegram_service",
+    "patched_telegram_bot",
     "test_config_paths", 
     "sample_training_data",
     "alternative_training_data",
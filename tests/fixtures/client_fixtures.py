@@ -29,8 +29,8 @@ def valid_database_id():
 
 @pytest.fixture
 def mock_notion_client_class():
-    """Mock della classe Client di notion-client."""
-    with patch('app.services.notion.notion_client.Client') as mock_client_class:
+    """Mock della classe NotionAsyncClient (AsyncClient di notion-client)."""
+    with patch('app.services.notion.notion_client.NotionAsyncClient') as mock_client_class:
         mock_client_instance = MagicMock()
         mock_client_class.return_value = mock_client_instance
         yield mock_client_class
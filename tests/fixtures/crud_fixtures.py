@@ -12,20 +12,21 @@ INCLUDE:
 """
 
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 
 @pytest.fixture
 def mock_notion_client():
-    """Mock client Notion per test CRUD operations."""
+    """Mock client Notion (AsyncClient) per test CRUD operations."""
     mock_client = MagicMock()
     mock_client.pages = MagicMock()
-    mock_client.pages.update = MagicMock()
-    mock_client.pages.retrieve = MagicMock()
+    mock_client.pages.update = AsyncMock()
+    mock_client.pages.retrieve = AsyncMock()
     
     # Mock del wrapper client
     mock_wrapper = MagicMock()
     mock_wrapper.get_client.return_value = mock_client
+    mock_wrapper.get_property_ids = AsyncMock(return_value=None)
     
     return mock_wrapper
 
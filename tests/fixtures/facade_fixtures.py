@@ -12,7 +12,7 @@ INCLUDE:
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 
 @pytest.fixture
@@ -46,7 +46,8 @@ def mock_notion_service_modules():
         
         # Configure client methods
         mock_client.get_database_id.return_value = "test-database-id"
-        mock_client.get_client.return_value = Mock(databases=Mock())
+        mock_client.get_client.return_value = Mock(databases=Mock(query=AsyncMock(), retrieve=AsyncMock()))
+        mock_client.get_property_ids = AsyncMock(return_value=None)
         
         yield {
             'client': mock_client,
@@ -14,7 +14,7 @@ INCLUDE:
 import pytest
 import os
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 
 @pytest.fixture
@@ -142,6 +142,52 @@ def configured_telegram_service(load_test_env, test_config_paths, mock_notion_se
         pytest.skip(f"Errore setup TelegramService: {e}")
 
 
+@pytest.fixture
+def offline_telegram_service():
+    """
+    TelegramService con configurazione di test e token fittizio.
+    
+    Nessuna chiamata reale: da usare con patched_telegram_bot.
+    """
+    from app.services.telegram_service import TelegramService
+    
+    return TelegramService(
+        token="123456:TEST-TOKEN",
+        notion_service=Mock(),
+        groups_config_path='tests/config/test_telegram_groups.json',
+        templates_config_path='tests/config/test_message_templates.yaml'
+    )
+
+
+@pytest.fixture
+def patched_telegram_bot():
+    """
+    Sostituisce telegram.Bot con un mock (anche come async context manager).
+    
+    Returns:
+        MagicMock: Classe Bot mock; ogni istanza creata è in .instances,
+                   .send_message_side_effect (opzionale) simula send_message
+    """
+    instances = []
+    
+    def create_bot(*args, **kwargs):
+        bot = MagicMock()
+        bot.initialize = AsyncMock()
+        bot.shutdown = AsyncMock()
+        bot.send_message = AsyncMock(
+            return_value=Mock(message_id=123),
+            side_effect=bot_class.send_message_side_effect
+        )
+        bot.__aenter__.return_value = bot
+        instances.append(bot)
+        return bot
+    
+    with patch('app.services.telegram_service.telegram.Bot', side_effect=create_bot) as bot_class:
+        bot_class.instances = instances
+        bot_class.send_message_side_effect = None
+        yield bot_class
+
+
 # Esporta tutti i fixture pubblici
 __all__ = [
     "mock_telegram_bot",
@@ -149,5 +195,7 @@ __all__ = [
     "sample_feedback_data",
     "alternative_training_data",
     "test_config_paths",
-    "configured_telegram_service"
+    "configured_telegram_service",
+    "offline_telegram_service",
+    "patched_telegram_bot"
 ]
\ No newline at end of file
@@ -47,6 +47,30 @@ class MockNotionService:
         else:
             return []
     
+    def get_change_marker(self):
+        """Nessun mirror nel mock: nessun marker di modifica."""
+        return None
+    
+    async def get_formazioni_in_range(self, status: str, start_date, end_date) -> List[Dict]:
+        """
+        Restituisce formazioni mock con status dato in un range di giorni.
+        
+        Simula il filtro lato Notion (status + range date, estremi inclusi).
+        """
+        formazioni = []
+        for formazione in await self.get_formazioni_by_status(status):
+            data_ora = formazione.get('Data/Ora', '')
+            try:
+                if 'T' in data_ora:
+                    giorno = datetime.fromisoformat(data_ora.replace('Z', '+00:00')).date()
+                else:
+                    giorno = datetime.strptime(data_ora, '%d/%m/%Y %H:%M').date()
+            except ValueError:
+                continue
+            if start_date <= giorno <= end_date:
+                formazioni.append(formazione)
+        return formazioni
+    
     def _get_mock_formazioni_calendarizzate(self) -> List[Dict]:
         """
         Genera formazioni calendarizzate per testing comandi.
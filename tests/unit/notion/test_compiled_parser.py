@@ -0,0 +1,105 @@
+"""
+Unit test per CompiledFormazioneParser.
+
+Testa il fast path di parsing bulk compilato dallo schema database.
+Focus su:
+- Stesso output del parser generico (campi, datetime, pagine scartate)
+- Estrattori scelti dal tipo dichiarato nello schema
+- Fallback al parser generico per pagine anomale
+- Compilazione una sola volta da NotionService
+
+UTILIZZO:
+pytest tests/unit/notion/test_compiled_parser.py -v
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.notion import NotionService
+from app.services.notion.data_parser import NotionDataParser
+
+
+@pytest.fixture
+def database_schema():
+    """Schema database formazioni (formato NotionClient.get_database_schema)."""
+    return {
+        'Nome': {'id': 'title', 'type': 'title'},
+        'Area': {'id': 'ar%3A', 'type': 'multi_select'},
+        'Date': {'id': 'dt01', 'type': 'date'},
+        'Stato': {'id': 'st01', 'type': 'status'},
+        'Codice': {'id': 'cd01', 'type': 'rich_text'},
+        'Link Teams': {'id': 'lt01', 'type': 'url'},
+        'Periodo': {'id': 'pr01', 'type': 'select'}
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestCompiledFormazioneParser:
+    """Test suite per parser compilato dallo schema."""
+
+    @pytest.fixture
+    def compiled_parser(self, database_schema):
+        """NotionDataParser con fast path compilato."""
+        parser = NotionDataParser()
+        parser.compile_schema(database_schema)
+        return parser
+
+    def test_same_output_as_generic_parser(self, compiled_parser, sample_notion_page, sample_notion_page_minimal,
+                                           notion_page_rich_text_complex, notion_page_malformed_date,
+                                           sample_notion_page_incomplete):
+        """
+        Test equivalenza con parse_single_formazione.
+
+        Verifica che:
+        - Formazioni valide abbiano stessi campi e stesso datetime
+        - Pagine incomplete vengano scartate come nel parser generico
+        - Data malformata mantenga la stringa originale (data_inizio None)
+        """
+        pages = [sample_notion_page, sample_notion_page_minimal, notion_page_rich_text_complex,
+                 notion_page_malformed_date, sample_notion_page_incomplete]
+        generic = NotionDataParser()
+        expected = [f for f in (generic.parse_single_formazione(page) for page in pages) if f]
+
+        result = compiled_parser.parse_formazioni_list({'results': pages})
+
+        assert compiled_parser.is_compiled
+        assert [f.to_dict() for f in result] == [f.to_dict() for f in expected]
+        assert [f.data_inizio for f in result] == [f.data_inizio for f in expected]
+        assert result[3]['Data/Ora'] == 'invalid-date-format'
+
+    def test_extractors_follow_schema_types(self, database_schema, sample_notion_page):
+        """Test: 'Stato' dichiarato come select nello schema viene letto correttamente."""
+        parser = NotionDataParser()
+        parser.compile_schema({**database_schema, 'Stato': {'id': 'st01', 'type': 'select'}})
+        page = {**sample_notion_page, 'properties': {
+            **sample_notion_page['properties'], 'Stato': {'select': {'name': 'Programmata'}}
+        }}
+
+        result = parser.parse_formazioni_list({'results': [page]})
+
+        assert [f['Stato'] for f in result] == ['Programmata']
+
+    def test_anomalous_page_delegated_to_generic_parser(self, compiled_parser, sample_notion_page):
+        """Test fallback: pagina con property malformate non interrompe il parsing della lista."""
+        broken = {'id': 'broken-id', 'properties': {**sample_notion_page['properties'], 'Nome': 'non-un-dict'}}
+
+        result = compiled_parser.parse_formazioni_list({'results': [broken, sample_notion_page]})
+
+        assert [f['id'] for f in result] == [sample_notion_page['id']]
+
+    @pytest.mark.asyncio
+    async def test_service_compiles_parser_once(self, mock_notion_service_modules, mock_env_empty,
+                                                database_schema, notion_query_response):
+        """Test NotionService: schema letto e parser compilato alla prima query, poi riusato."""
+        service = NotionService(token="test-token", database_id="test-db")
+        service.data_parser = NotionDataParser()
+        service.client.get_database_schema = AsyncMock(return_value=database_schema)
+        service.client.get_client().databases.query.return_value = notion_query_response
+
+        first = await service._collect_formazioni({'database_id': 'test-db'})
+        second = await service._collect_formazioni({'database_id': 'test-db'})
+
+        assert service.data_parser.is_compiled
+        assert service.client.get_database_schema.await_count == 1
+        assert [f['id'] for f in first] == [f['id'] for f in second] == ['abc123-def456-ghi789', 'second-formation-id']
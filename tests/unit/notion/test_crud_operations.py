@@ -14,6 +14,9 @@ pytest tests/unit/notion/test_crud_operations.py -v
 pytest -m "unit and notion" tests/unit/notion/test_crud_operations.py -v
 """
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, patch
 from notion_client.errors import APIResponseError
@@ -258,6 +261,24 @@ class TestNotionCrudOperations:
         mock_notion_client.get_client().pages.retrieve.assert_called_once_with(page_id=sample_notion_id)
         mock_data_parser.parse_single_formazione.assert_called_once_with(sample_retrieve_response)
     
+    @pytest.mark.asyncio
+    async def test_get_formazione_by_id_uses_property_projection(self, crud_operations, mock_notion_client, sample_notion_id,
+                                                                 sample_retrieve_response, mock_data_parser):
+        """
+        Test projection su retrieve: solo le property lette dal parser.
+        
+        Verifica che gli ID risolti dallo schema siano inviati come filter_properties.
+        """
+        mock_notion_client.get_property_ids.return_value = ['title', 'abcd']
+        mock_notion_client.get_client().pages.retrieve.return_value = sample_retrieve_response
+        
+        await crud_operations.get_formazione_by_id(sample_notion_id, mock_data_parser)
+        
+        mock_notion_client.get_property_ids.assert_awaited_once_with(mock_data_parser.PARSED_PROPERTIES)
+        mock_notion_client.get_client().pages.retrieve.assert_called_once_with(
+            page_id=sample_notion_id, filter_properties=['title', 'abcd']
+        )
+    
     @pytest.mark.asyncio
     async def test_get_formazione_by_id_parse_failure(self, crud_operations, mock_notion_client, sample_notion_id,
                                                      sample_retrieve_response, mock_data_parser):
@@ -310,7 +331,7 @@ class TestNotionCrudOperations:
     
     @pytest.mark.asyncio
     async def test_update_multiple_fields_success(self, crud_operations, mock_notion_client, sample_notion_id, 
-                                                sample_multiple_fields_update):
+                                                sample_multiple_fields_update, mock_data_parser):
         """
         Test aggiornamento multipli campi in operazione atomica.
         
@@ -318,7 +339,7 @@ class TestNotionCrudOperations:
         - Tutti i campi siano convertiti nel formato Notion
         - Singola chiamata API per tutti gli aggiornamenti
         - Mapping corretto: status→Stato, codice→Codice, link_teams→Link Teams
-        - Return True per operazione successful
+        - Return formazione parsata dalla response di pages.update (nessuna rilettura)
         
         Operazione atomica: evita inconsistenze tra aggiornamenti separati.
         """
@@ -326,10 +347,12 @@ class TestNotionCrudOperations:
         mock_notion_client.get_client().pages.update.return_value = {"object": "page"}
         
         # Test
-        result = await crud_operations.update_multiple_fields(sample_notion_id, sample_multiple_fields_update)
+        result = await crud_operations.update_multiple_fields(sample_notion_id, sample_multiple_fields_update, mock_data_parser)
         
         # Verifica
-        assert result is True
+        assert result == mock_data_parser.parse_single_formazione.return_value
+        mock_data_parser.parse_single_formazione.assert_called_once_with({"object": "page"})
+        mock_notion_client.get_client().pages.retrieve.assert_not_called()
         
         expected_properties = {
             "Stato": {"status": {"name": "Calendarizzata"}},
@@ -343,7 +366,7 @@ class TestNotionCrudOperations:
         )
     
     @pytest.mark.asyncio
-    async def test_update_multiple_fields_partial_update(self, crud_operations, mock_notion_client, sample_notion_id):
+    async def test_update_multiple_fields_partial_update(self, crud_operations, mock_notion_client, sample_notion_id, mock_data_parser):
         """
         Test aggiornamento solo alcuni campi.
         
@@ -359,10 +382,10 @@ class TestNotionCrudOperations:
         partial_updates = {"Stato": "Conclusa"}  # Solo status
         
         # Test
-        result = await crud_operations.update_multiple_fields(sample_notion_id, partial_updates)
+        result = await crud_operations.update_multiple_fields(sample_notion_id, partial_updates, mock_data_parser)
         
         # Verifica
-        assert result is True
+        assert result is not None
         
         last_call = mock_notion_client.get_client().pages.update.call_args
         properties = last_call[1]["properties"]
@@ -372,13 +395,13 @@ class TestNotionCrudOperations:
         assert "Link Teams" not in properties
     
     @pytest.mark.asyncio
-    async def test_update_multiple_fields_api_error(self, crud_operations, mock_notion_client, sample_notion_id, mock_api_error):
+    async def test_update_multiple_fields_api_error(self, crud_operations, mock_notion_client, sample_notion_id, mock_api_error,
+                                                    mock_data_parser):
         """
         Test gestione errore API durante update multiplo.
         
         Verifica che:
-        - APIResponseError sia gestito
-        - Return False per operazione fallita
+        - APIResponseError sia propagato (None è riservato alla pagina non parsabile)
         - Rollback automatico non necessario (operazione atomica)
         
         Vantaggio operazioni atomiche: fallimento totale, no stati inconsistenti.
@@ -387,10 +410,23 @@ class TestNotionCrudOperations:
         mock_notion_client.get_client().pages.update.side_effect = mock_api_error
         
         # Test
-        result = await crud_operations.update_multiple_fields(sample_notion_id, {"status": "Conclusa"})
+        with pytest.raises(APIResponseError):
+            await crud_operations.update_multiple_fields(sample_notion_id, {"status": "Conclusa"}, mock_data_parser)
         
         # Verifica
-        assert result is False
+        mock_data_parser.parse_single_formazione.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_update_multiple_fields_unparsable_page(self, crud_operations, mock_notion_client, sample_notion_id,
+                                                          mock_data_parser):
+        """Test: scrittura riuscita ma pagina restituita non parsabile → None, nessun errore."""
+        mock_notion_client.get_client().pages.update.return_value = {"object": "page"}
+        mock_data_parser.parse_single_formazione.return_value = None
+        
+        result = await crud_operations.update_multiple_fields(sample_notion_id, {"Stato": "Conclusa"}, mock_data_parser)
+        
+        assert result is None
+        mock_notion_client.get_client().pages.update.assert_called_once()
     
     # ===== TEST BATCH UPDATE STATUS =====
     
@@ -451,6 +487,46 @@ class TestNotionCrudOperations:
         assert result["failed_ids"] == ["batch-id-002", "batch-id-003"]
         assert result["total"] == 3
     
+    @pytest.mark.asyncio
+    async def test_batch_update_status_runs_concurrently(self, crud_operations, mock_notion_client):
+        """
+        Test batch update concorrente e limitato.
+        
+        Verifica che:
+        - Gli update si sovrappongano (durata ≈ latenza × batch / concorrenza)
+        - Non più di BATCH_MAX_CONCURRENCY update siano in volo insieme
+        """
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def slow_update(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return {"object": "page"}
+        
+        mock_notion_client.get_client().pages.update.side_effect = slow_update
+        ids = [f"batch-id-{i:03d}" for i in range(10)]
+        
+        start = time.perf_counter()
+        result = await crud_operations.batch_update_status(ids, "Conclusa")
+        elapsed = time.perf_counter() - start
+        
+        assert result == {'success_count': 10, 'failed_ids': [], 'total': 10}
+        assert max_in_flight == crud_operations.BATCH_MAX_CONCURRENCY
+        assert elapsed < 0.05 * 10 / 2
+    
+    @pytest.mark.asyncio
+    async def test_iter_batch_update_status_streams_results(self, crud_operations, mock_notion_client, sample_batch_formazioni_ids):
+        """Test streaming: un risultato (id, successo) per ogni formazione, appena disponibile."""
+        mock_notion_client.get_client().pages.update.return_value = {"object": "page"}
+        
+        results = [item async for item in crud_operations.iter_batch_update_status(sample_batch_formazioni_ids, "Conclusa")]
+        
+        assert sorted(results) == [(notion_id, True) for notion_id in sample_batch_formazioni_ids]
+    
     @pytest.mark.asyncio
     async def test_batch_update_status_empty_list(self, crud_operations, mock_notion_client):
         """
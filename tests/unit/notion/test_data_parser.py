@@ -17,6 +17,7 @@ pytest -m "unit and notion" -v
 import pytest
 from datetime import datetime
 from app.services.notion.data_parser import NotionDataParser
+from app.services.notion.formazione import Formazione
 
 
 @pytest.mark.unit
@@ -47,7 +48,7 @@ class TestNotionDataParser:
         
         # Verifiche generali
         assert result is not None
-        assert isinstance(result, dict)
+        assert isinstance(result, Formazione)
         assert '_notion_id' in result
         
         # Verifiche campi specifici
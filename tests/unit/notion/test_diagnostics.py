@@ -0,0 +1,138 @@
+"""
+Unit test per NotionDiagnostics (health check e readiness).
+
+Focus su:
+- Probe users.me / databases.retrieve eseguiti in parallelo
+- Risultato health check e info database riusati entro la finestra di cache
+- Readiness istantanea con refresh in background
+
+UTILIZZO:
+pytest tests/unit/notion/test_diagnostics.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.services.notion.diagnostics import NotionDiagnostics
+
+
+DATABASE_INFO = {
+    'title': [{'plain_text': 'Formazioni'}],
+    'properties': {
+        'Nome': {'type': 'title'},
+        'Area': {'type': 'multi_select'},
+        'Date': {'type': 'date'},
+        'Stato': {'type': 'status'},
+        'Codice': {'type': 'rich_text'},
+        'Link Teams': {'type': 'url'},
+        'Periodo': {'type': 'select'}
+    },
+    'created_time': '2024-01-01T00:00:00.000Z',
+    'last_edited_time': '2024-03-15T10:00:00.000Z'
+}
+
+
+@pytest.fixture
+def notion_api():
+    """API Notion simulata: ogni probe impiega 50ms."""
+    async def me():
+        await asyncio.sleep(0.05)
+        return {'name': 'Bot', 'type': 'bot', 'id': 'user-123456789'}
+
+    async def retrieve(**kwargs):
+        await asyncio.sleep(0.05)
+        return DATABASE_INFO
+
+    return Mock(
+        users=Mock(me=AsyncMock(side_effect=me)),
+        databases=Mock(retrieve=AsyncMock(side_effect=retrieve))
+    )
+
+
+@pytest.fixture
+def diagnostics(notion_api):
+    """NotionDiagnostics con client mock."""
+    client = Mock()
+    client.get_database_id.return_value = 'test-database-id'
+    client.get_config_info.return_value = {}
+    client.get_client.return_value = notion_api
+    return NotionDiagnostics(client, health_cache_seconds=30)
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestNotionDiagnostics:
+    """Test suite per health check concorrenti e in cache."""
+
+    @pytest.mark.asyncio
+    async def test_connection_probes_run_concurrently_and_are_cached(self, diagnostics, notion_api):
+        """
+        Test health check completo.
+
+        Verifica che:
+        - users.me e databases.retrieve si sovrappongano (~50ms, non ~100ms)
+        - Un secondo test_connection entro la finestra non chiami Notion
+        - validate_database_structure riusi la databases.retrieve in cache
+        - force=True ripeta i probe
+        """
+        start = time.perf_counter()
+        result = await diagnostics.test_connection()
+        elapsed = time.perf_counter() - start
+
+        assert result['connection_ok'] and result['database_accessible']
+        assert result['cached'] is False
+        assert elapsed < 0.09
+
+        cached = await diagnostics.test_connection()
+        validation = await diagnostics.validate_database_structure()
+
+        assert cached['cached'] is True
+        assert validation['valid'] is True
+        assert notion_api.users.me.await_count == 1
+        assert notion_api.databases.retrieve.await_count == 1
+
+        await diagnostics.test_connection(force=True)
+        assert notion_api.databases.retrieve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_connection_reports_database_error(self, diagnostics, notion_api):
+        """Test: database non accessibile → connessione ok, errore riportato, readiness non pronta."""
+        notion_api.databases.retrieve = AsyncMock(side_effect=RuntimeError("database non trovato"))
+
+        result = await diagnostics.test_connection()
+
+        assert result['connection_ok'] is True
+        assert result['database_accessible'] is False
+        assert result['error'] == "Errore generico: database non trovato"
+        assert diagnostics.get_readiness()['state'] == 'not_ready'
+
+    @pytest.mark.asyncio
+    async def test_readiness_returns_last_state_and_refreshes_in_background(self, diagnostics):
+        """
+        Test readiness istantanea.
+
+        Verifica che:
+        - Senza stato noto venga restituito 'unknown' e avviato un refresh
+        - Refresh multipli non vengano avviati in parallelo
+        - Dopo il refresh lo stato sia 'ready' senza ulteriori chiamate
+        """
+        submitted = []
+        diagnostics.notion_client.submit_background = Mock(side_effect=submitted.append)
+
+        first = diagnostics.get_readiness()
+        diagnostics.get_readiness()
+
+        assert first['state'] == 'unknown'
+        assert first['ready'] is False
+        assert len(submitted) == 1
+
+        await submitted[0]
+        readiness = diagnostics.get_readiness()
+
+        assert readiness['ready'] is True
+        assert readiness['stale'] is False
+        assert readiness['checked_at'] is not None
+        assert len(submitted) == 1
@@ -0,0 +1,87 @@
+"""
+Unit test per record Formazione.
+
+Testa il record compatto prodotto da NotionDataParser.
+Focus su:
+- Accesso dict-style (compatibilità template e chiamanti esistenti)
+- Datetime timezone-aware calcolato una sola volta
+- Copia e chiavi extra
+- Helper get_data_inizio per dict legacy
+
+UTILIZZO:
+pytest tests/unit/notion/test_formazione.py -v
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.notion.data_parser import NotionDataParser
+from app.services.notion.formazione import Formazione, get_data_inizio, DEFAULT_TIMEZONE
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestFormazione:
+    """Test suite per record Formazione."""
+
+    @pytest.fixture
+    def formazione(self, sample_notion_page):
+        """Formazione parsata dalla pagina Notion di esempio."""
+        return NotionDataParser().parse_single_formazione(sample_notion_page)
+
+    def test_parser_produces_aware_datetime(self, formazione):
+        """
+        Test datetime parsato una volta dal parser.
+
+        Verifica che data_inizio sia aware (UTC da '...Z') e coerente con 'Data/Ora'.
+        """
+        assert formazione.data_inizio == datetime(2024, 3, 15, 14, 0, tzinfo=timezone.utc)
+        assert formazione['Data/Ora'] == '15/03/2024 14:00'
+        assert not hasattr(formazione, '__dict__')
+
+    def test_dict_style_access(self, formazione):
+        """Test compatibilità con il vecchio dict (get, in, keys, unpacking, uguaglianza)."""
+        assert formazione.get('Nome') == 'Sicurezza Web Avanzata'
+        assert formazione.get('Inesistente', 'N/A') == 'N/A'
+        assert 'Link Teams' in formazione
+        assert list(formazione.keys()) == [
+            'id', 'Nome', 'Area', 'Data/Ora', 'Stato', 'Codice', 'Link Teams', 'Periodo', '_notion_id'
+        ]
+        assert {**formazione}['Area'] == ['IT', 'R&D']
+        assert formazione == formazione.to_dict()
+
+    def test_copy_and_set_items(self, formazione):
+        """
+        Test copia per preview (training.copy()) e assegnazioni.
+
+        Verifica che:
+        - La copia sia indipendente dall'originale
+        - Chiavi non standard vengano conservate
+        - Una nuova 'Data/Ora' aggiorni data_inizio
+        """
+        preview = formazione.copy()
+        preview['Codice'] = 'NUOVO-01'
+        preview['Note'] = 'extra'
+        preview['Data/Ora'] = '20/03/2024 10:30'
+
+        assert formazione['Codice'] == 'IT-Sicurezza-2024-SPRING-01'
+        assert 'Note' not in formazione
+        assert preview['Note'] == 'extra'
+        assert preview.data_inizio == datetime(2024, 3, 20, 10, 30, tzinfo=DEFAULT_TIMEZONE)
+        with pytest.raises(TypeError):
+            del preview['Nome']
+
+    def test_get_data_inizio_for_legacy_dicts(self):
+        """Test helper su dict (mock, dati legacy): formato custom e ISO."""
+        assert get_data_inizio({'Data/Ora': '22/09/2024 14:30'}) == datetime(2024, 9, 22, 14, 30, tzinfo=DEFAULT_TIMEZONE)
+        assert get_data_inizio({'Data/Ora': '2024-09-22T14:30:00Z'}).utcoffset().total_seconds() == 0
+        assert get_data_inizio({'Data/Ora': 'data non valida'}) is None
+        assert get_data_inizio({}) is None
+
+    def test_from_dict_round_trip(self, formazione):
+        """Test ricostruzione da dict (mirror locale) con datetime già noto."""
+        rebuilt = Formazione.from_dict(formazione.to_dict(), data_inizio=formazione.data_inizio)
+
+        assert rebuilt == formazione
+        assert rebuilt.data_inizio == formazione.data_inizio
@@ -0,0 +1,80 @@
+"""
+Unit test per NotionFreshnessCache.
+
+Focus su:
+- Riuso risultati solo con marker invariato
+- Granularità al minuto di last_edited_time (risultati non verificabili)
+- Validità della sonda ed età massima dei risultati
+
+UTILIZZO:
+pytest tests/unit/notion/test_freshness_cache.py -v
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.notion.freshness_cache import NotionFreshnessCache
+
+
+MARKER = ('page-1', '2024-03-15T10:00:00.000Z')
+FETCHED_AT = datetime(2024, 3, 15, 10, 5, tzinfo=timezone.utc)
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestNotionFreshnessCache:
+    """Test suite per cache risultati con sonda di freschezza."""
+
+    def test_results_reused_only_with_same_marker(self):
+        """
+        Test validazione tramite marker.
+
+        Verifica che:
+        - Stesso marker → copia dei risultati salvati
+        - Marker diverso (altra pagina o timestamp) → None
+        - Statistiche hit/miss aggiornate
+        """
+        cache = NotionFreshnessCache()
+        cache.store('q', [{'id': 'a'}], MARKER, FETCHED_AT)
+
+        cached = cache.get('q', MARKER)
+        cached[0]['id'] = 'modificata'
+
+        assert cache.get('q', MARKER) == [{'id': 'a'}]
+        assert cache.get('q', ('page-2', MARKER[1])) is None
+        assert cache.get('q', ('page-1', '2024-03-15T10:06:00.000Z')) is None
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses']) == (2, 2)
+
+    def test_recent_edit_not_verifiable(self):
+        """Test: fetch nello stesso minuto dell'ultima modifica → risultati non salvati."""
+        cache = NotionFreshnessCache()
+        cache.store('q', [{'id': 'a'}], MARKER, datetime(2024, 3, 15, 10, 0, 40, tzinfo=timezone.utc))
+
+        assert cache.get('q', MARKER) is None
+        assert cache.get_stats()['unverifiable'] == 1
+
+    def test_probe_ttl_max_age_and_invalidate(self):
+        """Test: sonda scaduta, risultati oltre l'età massima e invalidate() forzano la rilettura."""
+        cache = NotionFreshnessCache(max_age_seconds=0, probe_ttl_seconds=0)
+        cache.set_probe(MARKER)
+        cache.store('q', [{'id': 'a'}], MARKER, FETCHED_AT)
+
+        assert cache.get_probe() is None
+        assert cache.get('q', MARKER) is None
+
+        cache = NotionFreshnessCache()
+        cache.set_probe(MARKER)
+        cache.store('q', [{'id': 'a'}], MARKER, FETCHED_AT)
+        assert cache.get_probe() == MARKER
+        cache.invalidate()
+        assert cache.get_probe() is None
+        assert cache.get('q', MARKER) is None
+
+    def test_marker_from_probe_response(self):
+        """Test: marker dalla prima pagina della sonda, (None, None) se database vuoto."""
+        response = {'results': [{'id': 'page-1', 'last_edited_time': MARKER[1], 'properties': {}}]}
+
+        assert NotionFreshnessCache.marker_from_response(response) == MARKER
+        assert NotionFreshnessCache.marker_from_response({'results': []}) == (None, None)
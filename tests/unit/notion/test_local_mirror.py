@@ -0,0 +1,295 @@
+"""
+Unit test per NotionLocalMirror e sync incrementale NotionService.
+
+Testa la replica SQLite locale del database formazioni.
+Focus su:
+- Letture indicizzate (status, area, range date)
+- Patch locali dopo scritture
+- Watermark e sync delta/completo
+- Revisione modifiche condivisa tra connessioni
+- Fallback su dati locali con Notion non raggiungibile
+
+UTILIZZO:
+pytest tests/unit/notion/test_local_mirror.py -v
+"""
+
+import contextlib
+from datetime import date
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.notion import NotionService
+from app.services.notion.data_parser import NotionDataParser
+from app.services.notion.local_mirror import NotionLocalMirror
+from app.services.notion.query_builder import NotionQueryBuilder
+
+
+def _formazione(notion_id, stato='Programmata', area=None, data_ora='15/03/2024 14:00'):
+    """Formazione normalizzata minima (stesso formato di NotionDataParser)."""
+    return {
+        'id': notion_id,
+        'Nome': f'Formazione {notion_id}',
+        'Area': area or ['IT'],
+        'Data/Ora': data_ora,
+        'Stato': stato,
+        'Codice': '',
+        'Link Teams': '',
+        'Periodo': 'SPRING',
+        '_notion_id': notion_id
+    }
+
+
+def _notion_page(page, last_edited_time, archived=False):
+    """Pagina Notion raw con metadati sync."""
+    return {**page, 'last_edited_time': last_edited_time, 'archived': archived}
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestNotionLocalMirror:
+    """Test suite per NotionLocalMirror."""
+
+    @pytest.fixture
+    def mirror(self):
+        """Mirror in memoria per test."""
+        mirror = NotionLocalMirror(':memory:')
+        yield mirror
+        mirror.close()
+
+    def test_reads_filter_and_sort_by_date(self, mirror):
+        """
+        Test letture per status, area e combinate.
+
+        Verifica che:
+        - I filtri usino le tabelle indicizzate
+        - I risultati siano ordinati cronologicamente (come le query Notion)
+        """
+        mirror.apply_changes([
+            (_formazione('b', area=['IT', 'HR'], data_ora='20/03/2024 09:00'), None),
+            (_formazione('a', area=['IT'], data_ora='10/03/2024 09:00'), None),
+            (_formazione('c', stato='Conclusa', area=['HR']), None),
+        ])
+
+        assert [f['id'] for f in mirror.get_by_status('Programmata')] == ['a', 'b']
+        assert [f['id'] for f in mirror.get_by_area('HR')] == ['c', 'b']
+        assert [f['id'] for f in mirror.get_by_status_and_area('Programmata', 'HR')] == ['b']
+        assert mirror.get_by_status('Programmata')[1]['Area'] == ['IT', 'HR']
+
+    def test_get_by_date_range_inclusive(self, mirror):
+        """Test lookup per giorno (comandi bot /oggi, /domani, /settimana)."""
+        mirror.apply_changes([
+            (_formazione('a', stato='Calendarizzata', data_ora='10/03/2024 09:00'), None),
+            (_formazione('b', stato='Calendarizzata', data_ora='12/03/2024 23:30'), None),
+            (_formazione('c', stato='Calendarizzata', data_ora='13/03/2024 00:00'), None),
+            (_formazione('d', stato='Programmata', data_ora='11/03/2024 09:00'), None),
+        ])
+
+        result = mirror.get_by_date_range('Calendarizzata', date(2024, 3, 10), date(2024, 3, 12))
+
+        assert [f['id'] for f in result] == ['a', 'b']
+
+    def test_patch_formazione_updates_indexed_columns(self, mirror):
+        """
+        Test patch locale dopo scrittura su Notion.
+
+        Verifica che il cambio di stato sposti la formazione tra le query
+        e che campi non aggiornabili vengano ignorati.
+        """
+        mirror.upsert_formazione(_formazione('a'), '2024-03-01T10:00:00.000Z')
+
+        assert mirror.patch_formazione('a', {'Stato': 'Calendarizzata', 'Codice': 'IT-01', 'Nome': 'X'}) is True
+        assert mirror.patch_formazione('missing', {'Stato': 'Calendarizzata'}) is False
+
+        assert mirror.get_by_status('Programmata') == []
+        patched = mirror.get_by_status('Calendarizzata')[0]
+        assert patched['Codice'] == 'IT-01'
+        assert patched['Nome'] == 'Formazione a'
+
+    def test_retain_only_removes_deleted_pages(self, mirror):
+        """Test sync completo: le pagine non più presenti in Notion vengono rimosse."""
+        mirror.apply_changes([(_formazione('a'), None), (_formazione('b', area=['HR']), None)])
+
+        removed = mirror.retain_only({'a'})
+
+        assert removed == 1
+        assert mirror.count() == 1
+        assert mirror.get_by_area('HR') == []
+
+    def test_sync_state_persisted(self, tmp_path):
+        """Test watermark e orario sync persistiti su file (sopravvivono al riavvio)."""
+        db_path = str(tmp_path / 'mirror' / 'notion.sqlite3')
+        mirror = NotionLocalMirror(db_path)
+        assert mirror.is_initialized() is False
+        mirror.mark_synced('2024-03-15T10:00:00.000Z', full=True)
+        mirror.close()
+
+        reopened = NotionLocalMirror(db_path)
+
+        assert reopened.get_watermark() == '2024-03-15T10:00:00.000Z'
+        assert reopened.is_initialized() is True
+        assert reopened.get_last_full_sync_time() is not None
+        reopened.close()
+
+    def test_revision_visible_across_connections(self, tmp_path):
+        """
+        Test revisione mirror (segnale di modifica tra processi).
+
+        Verifica che:
+        - Ogni scrittura che cambia le formazioni incrementi la revisione
+        - Batch vuoti e mark_synced non la modifichino
+        - Una seconda connessione sullo stesso file (altro processo) la veda subito
+        """
+        db_path = str(tmp_path / 'notion.sqlite3')
+        writer = NotionLocalMirror(db_path)
+        reader = NotionLocalMirror(db_path)
+        assert reader.get_revision() == 0
+
+        writer.apply_changes([(_formazione('a'), None), (_formazione('b'), None)])
+        writer.apply_changes([])
+        writer.mark_synced('2024-03-15T10:00:00.000Z')
+        assert reader.get_revision() == 1
+
+        writer.patch_formazione('a', {'Stato': 'Calendarizzata'})
+        writer.upsert_formazione(_formazione('c'))
+        writer.retain_only({'a', 'c'})
+        assert reader.get_revision() == 4
+        assert writer.get_stats()['revision'] == 4
+
+        writer.close()
+        reader.close()
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestNotionServiceMirrorSync:
+    """Test integrazione NotionService ↔ mirror (sync incrementale)."""
+
+    @pytest.fixture
+    def mirrored_service(self, mock_notion_service_modules, mock_env_empty):
+        """NotionService con mirror in memoria e parser/query builder reali."""
+        service = NotionService(token="test-token", database_id="test-db", mirror_path=':memory:')
+        service.query_builder = NotionQueryBuilder()
+        service.data_parser = NotionDataParser()
+        service.client.bypass_cache = contextlib.nullcontext
+        return service
+
+    @pytest.mark.asyncio
+    async def test_reads_served_from_mirror_after_first_sync(self, mirrored_service, sample_notion_page):
+        """
+        Test prima lettura: sync completo, poi letture solo locali.
+
+        Verifica che:
+        - La prima lettura popoli il mirror (una query senza filtro)
+        - Le letture successive nell'intervallo non chiamino Notion
+        """
+        query_api = mirrored_service.client.get_client().databases.query
+        query_api.return_value = {
+            'results': [_notion_page(sample_notion_page, '2024-03-15T10:00:00.000Z')],
+            'has_more': False,
+            'next_cursor': None
+        }
+
+        first = await mirrored_service.get_formazioni_by_status('Programmata')
+        second = await mirrored_service.get_formazioni_by_area('R&D')
+
+        assert [f['id'] for f in first] == ['abc123-def456-ghi789']
+        assert second == first
+        assert query_api.call_count == 1
+        assert 'filter' not in query_api.call_args.kwargs
+        assert mirrored_service.mirror.get_watermark() == '2024-03-15T10:00:00.000Z'
+
+    @pytest.mark.asyncio
+    async def test_delta_sync_uses_watermark_and_drops_archived(self, mirrored_service, sample_notion_page):
+        """
+        Test sync incrementale.
+
+        Verifica che:
+        - La query delta filtri per last_edited_time >= watermark
+        - Le pagine archiviate vengano rimosse dal mirror
+        """
+        mirror = mirrored_service.mirror
+        mirror.upsert_formazione(_formazione(sample_notion_page['id']), '2024-03-15T10:00:00.000Z')
+        mirror.mark_synced('2024-03-15T10:00:00.000Z', full=True)
+
+        query_api = mirrored_service.client.get_client().databases.query
+        query_api.return_value = {
+            'results': [_notion_page(sample_notion_page, '2024-03-16T08:00:00.000Z', archived=True)],
+            'has_more': False,
+            'next_cursor': None
+        }
+
+        summary = await mirrored_service.sync_mirror()
+
+        assert summary == {'mode': 'delta', 'upserted': 0, 'deleted': 1, 'watermark': '2024-03-16T08:00:00.000Z'}
+        assert query_api.call_args.kwargs['filter']['last_edited_time'] == {'on_or_after': '2024-03-15T10:00:00.000Z'}
+        assert mirror.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_stale_mirror_served_when_notion_unreachable(self, mirrored_service):
+        """Test resilienza: sync fallito → letture servite dai dati locali."""
+        mirror = mirrored_service.mirror
+        mirror.upsert_formazione(_formazione('a'))
+        mirror.mark_synced('2024-03-15T10:00:00.000Z', full=True)
+        mirrored_service.mirror_sync_seconds = 0
+        mirrored_service.client.get_client().databases.query = AsyncMock(side_effect=Exception("timeout"))
+
+        result = await mirrored_service.get_formazioni_by_status('Programmata')
+
+        assert [f['id'] for f in result] == ['a']
+
+    @pytest.mark.asyncio
+    async def test_update_formazione_patches_mirror(self, mirrored_service, sample_notion_page):
+        """
+        Test scrittura: Notion aggiornato, mirror allineato senza nuovo sync.
+
+        Verifica che la formazione ritornata sia quella parsata dalla response
+        di pages.update (nessuna rilettura) e che il mirror la contenga.
+        """
+        mirror = mirrored_service.mirror
+        mirror.upsert_formazione(_formazione(sample_notion_page['id']))
+        updated_page = {
+            **sample_notion_page,
+            'properties': {**sample_notion_page['properties'], 'Stato': {'status': {'name': 'Calendarizzata'}}}
+        }
+        crud = mirrored_service.crud_operations
+        crud.update_multiple_fields = AsyncMock(return_value=NotionDataParser().parse_single_formazione(updated_page))
+
+        updated = await mirrored_service.update_formazione(sample_notion_page['id'], {'Stato': 'Calendarizzata'})
+
+        assert updated['Stato'] == 'Calendarizzata'
+        crud.update_multiple_fields.assert_awaited_once_with(
+            sample_notion_page['id'], {'Stato': 'Calendarizzata'}, mirrored_service.data_parser
+        )
+        crud.get_formazione_by_id.assert_not_called()
+        assert [f['Nome'] for f in mirror.get_by_status('Calendarizzata')] == ['Sicurezza Web Avanzata']
+
+    @pytest.mark.asyncio
+    async def test_unparsable_write_is_success_and_api_error_is_failure(self, mirrored_service):
+        """
+        Test esiti di update_formazione.
+
+        Verifica che:
+        - Scrittura riuscita con pagina non parsabile → None, mirror allineato con i campi scritti,
+          wrapper deprecati True
+        - Errore API → NotionServiceError, mirror invariato, wrapper deprecati False
+        """
+        from app.services.notion import NotionServiceError
+
+        mirror = mirrored_service.mirror
+        mirror.upsert_formazione(_formazione('a'))
+        crud = mirrored_service.crud_operations
+        crud.update_multiple_fields = AsyncMock(return_value=None)
+
+        assert await mirrored_service.update_formazione('a', {'Stato': 'Calendarizzata', 'Codice': 'IT-01'}) is None
+        assert mirror.get_by_status('Calendarizzata')[0]['Codice'] == 'IT-01'
+        assert await mirrored_service.update_formazione_status('a', 'Calendarizzata') is True
+        assert await mirrored_service.update_codice_e_link('a', 'IT-01', 'https://teams') is True
+
+        crud.update_multiple_fields = AsyncMock(side_effect=Exception('502 Bad Gateway'))
+
+        with pytest.raises(NotionServiceError):
+            await mirrored_service.update_formazione('a', {'Stato': 'Conclusa'})
+        assert await mirrored_service.update_formazione_status('a', 'Conclusa') is False
+        assert await mirrored_service.update_codice_e_link('a', 'IT-02', 'https://teams') is False
+        assert mirror.get_by_status('Conclusa') == []
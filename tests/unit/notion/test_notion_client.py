@@ -8,14 +8,21 @@ Focus su:
 - Gestione variabili d'ambiente
 - Error handling per connessione fallita
 - Sicurezza e gestione credenziali
+- Retry su 429/5xx e rate limiting centralizzato
 
 UTILIZZO:
 pytest tests/unit/notion/test_notion_client.py -v
 pytest -m "unit and notion" tests/unit/notion/test_notion_client.py -v
 """
 
+import asyncio
+import threading
+
 import pytest
 from unittest.mock import patch, MagicMock
+import httpx
+from notion_client import AsyncClient
+from notion_client.errors import APIResponseError
 from app.services.notion.notion_client import NotionClient, NotionClientError
 
 
@@ -47,7 +54,8 @@ class TestNotionClient:
         assert client.client is not None
         
         # Verifica che il client Notion sia stato inizializzato
-        mock_notion_client_class.assert_called_once_with(auth=valid_notion_token)
+        mock_notion_client_class.assert_called_once()
+        assert mock_notion_client_class.call_args.kwargs['auth'] == valid_notion_token
     
     def test_init_with_env_variables(self, mock_notion_client_class, mock_env_variables):
         """
@@ -69,7 +77,8 @@ class TestNotionClient:
         assert client.database_id == mock_env_variables['NOTION_DATABASE_ID']
         assert client.client is not None
         
-        mock_notion_client_class.assert_called_once_with(auth=mock_env_variables['NOTION_TOKEN'])
+        mock_notion_client_class.assert_called_once()
+        assert mock_notion_client_class.call_args.kwargs['auth'] == mock_env_variables['NOTION_TOKEN']
     
     def test_init_mixed_credentials(self, mock_notion_client_class, mock_env_variables, valid_database_id):
         """
@@ -91,7 +100,8 @@ class TestNotionClient:
         assert client.token == mock_env_variables['NOTION_TOKEN']  # Da environment
         assert client.database_id == custom_database_id  # Esplicito
         
-        mock_notion_client_class.assert_called_once_with(auth=mock_env_variables['NOTION_TOKEN'])
+        mock_notion_client_class.assert_called_once()
+        assert mock_notion_client_class.call_args.kwargs['auth'] == mock_env_variables['NOTION_TOKEN']
     
     # ===== TEST VALIDAZIONE CREDENZIALI =====
     
@@ -172,18 +182,57 @@ class TestNotionClient:
         Test gestione fallimento inizializzazione client Notion.
         
         Verifica che:
-        - Exception da Client() sia propagata
+        - Exception da NotionAsyncClient() sia propagata
         - Logging errore sia eseguito
         - Sistema non rimanga in stato inconsistente
         
         Scenario: problemi rete, token invalido, servizio Notion down.
         """
-        with patch('app.services.notion.notion_client.Client') as mock_client:
+        with patch('app.services.notion.notion_client.NotionAsyncClient') as mock_client:
             mock_client.side_effect = Exception("Connection failed")
             
             with pytest.raises(Exception, match="Connection failed"):
                 NotionClient(token=valid_notion_token, database_id=valid_database_id)
     
+    # ===== TEST CLIENT PER EVENT LOOP =====
+    
+    def test_requests_from_every_loop_share_background_pool(self, valid_notion_token, valid_database_id):
+        """
+        Test connection pool unico sul loop di background.
+        
+        Verifica che:
+        - Loop diversi (asyncio.run per richiesta Flask) ricevano lo stesso client
+        - Le richieste HTTP vengano eseguite sul loop di background (pool mai legato a un loop chiuso)
+        - Le metriche registrino comunque i byte ricevuti nel contesto del chiamante
+        - aclose() chiuda il pool condiviso
+        
+        Scenario: con un client per loop il pool di ogni richiesta Flask restava aperto e non riusato.
+        """
+        threads = []
+        
+        def handler(request):
+            threads.append(threading.current_thread().name)
+            return httpx.Response(200, json={"object": "page", "id": "page-x"})
+        
+        client = NotionClient(token=valid_notion_token, database_id=valid_database_id,
+                              transport=httpx.MockTransport(handler))
+        
+        async def flask_request():
+            notion = client.get_client()
+            await notion.pages.retrieve(page_id='page-x')
+            return notion
+        
+        first = asyncio.run(flask_request())
+        second = asyncio.run(flask_request())
+        
+        assert first is second is client.client
+        assert isinstance(first, AsyncClient)
+        assert threads == ['notion-background', 'notion-background']
+        assert client.get_latency_stats()['pages.retrieve']['bytes_received'] > 0
+        
+        asyncio.run(client.aclose())
+        assert client.client.client.is_closed
+    
     # ===== TEST METODI GETTER =====
     
     def test_get_client(self, mock_notion_client_class, valid_notion_token, valid_database_id):
@@ -340,4 +389,291 @@ class TestNotionClient:
         
         assert client1.database_id == "db1"
         assert client2.database_id == "db2"
-        assert client1 is not client2  # Istanze diverse
\ No newline at end of file
+        assert client1 is not client2  # Istanze diverse
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestNotionClientQueryCache:
+    """Test suite per cache query TTL + stale-while-revalidate di NotionClient."""
+    
+    @pytest.fixture
+    def api_calls(self):
+        """Registro delle richieste HTTP arrivate al transport finto."""
+        return []
+    
+    @pytest.fixture
+    def cached_client(self, api_calls, valid_notion_token, valid_database_id):
+        """NotionClient con transport httpx finto (nessuna rete reale)."""
+        def handler(request):
+            api_calls.append((request.method, request.url.path))
+            return httpx.Response(200, json={
+                "object": "list",
+                "results": [{"id": f"page-{len(api_calls)}"}],
+                "has_more": False,
+                "next_cursor": None
+            })
+        
+        return NotionClient(token=valid_notion_token, database_id=valid_database_id,
+                            transport=httpx.MockTransport(handler))
+    
+    @pytest.mark.asyncio
+    async def test_identical_queries_served_from_cache(self, cached_client, api_calls, valid_database_id):
+        """
+        Test hit cache per query identiche (ordine chiavi indifferente).
+        
+        Verifica che:
+        - La prima query vada a Notion (miss)
+        - La seconda, con stesse chiavi in ordine diverso, sia servita dalla cache (hit)
+        """
+        notion = cached_client.get_client()
+        
+        first = await notion.databases.query(database_id=valid_database_id, filter={"a": 1}, page_size=100)
+        second = await notion.databases.query(page_size=100, filter={"a": 1}, database_id=valid_database_id)
+        
+        assert first == second
+        assert len(api_calls) == 1
+        stats = cached_client.get_cache_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+        assert stats['entries'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed_in_background(self, cached_client, api_calls, valid_database_id):
+        """
+        Test stale-while-revalidate.
+        
+        Verifica che:
+        - Una entry oltre la finestra "fresh" sia restituita subito (dato stale)
+        - Il refresh avvenga in background e aggiorni la cache
+        """
+        notion = cached_client.get_client()
+        first = await notion.databases.query(database_id=valid_database_id)
+        
+        # Invecchia artificialmente l'entry oltre la finestra fresh
+        key, (response, cached_at) = next(iter(cached_client._cached_data.items()))
+        cached_client._cached_data[key] = (response, cached_at - cached_client.CACHE_FRESH_SECONDS - 1)
+        
+        stale = await notion.databases.query(database_id=valid_database_id)
+        assert stale == first
+        
+        for _ in range(100):
+            if cached_client.get_cache_stats()['background_refreshes']:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert len(api_calls) == 2
+        assert cached_client.get_cache_stats()['stale_hits'] == 1
+        refreshed = await notion.databases.query(database_id=valid_database_id)
+        assert refreshed['results'][0]['id'] == 'page-2'
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_and_non_cacheable_requests(self, cached_client, api_calls, valid_database_id):
+        """
+        Test invalidazione e richieste escluse dalla cache.
+        
+        Verifica che:
+        - pages.retrieve non sia mai servito dalla cache
+        - invalidate_cache() forzi una nuova query a Notion
+        """
+        notion = cached_client.get_client()
+        
+        await notion.pages.retrieve(page_id="page-x")
+        await notion.pages.retrieve(page_id="page-x")
+        assert len(api_calls) == 2
+        
+        await notion.databases.query(database_id=valid_database_id)
+        cached_client.invalidate_cache("page-x")
+        await notion.databases.query(database_id=valid_database_id)
+        
+        assert len(api_calls) == 4
+        assert cached_client.get_cache_stats()['invalidations'] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestNotionClientSchema:
+    """Test suite per schema database e projection property."""
+    
+    @pytest.fixture
+    def schema_requests(self):
+        """Richieste HTTP arrivate al transport finto."""
+        return []
+    
+    @pytest.fixture
+    def schema_client(self, schema_requests, valid_notion_token, valid_database_id):
+        """NotionClient con transport finto: databases.retrieve + query."""
+        def handler(request):
+            schema_requests.append(request)
+            if request.method == 'GET':
+                return httpx.Response(200, json={
+                    "object": "database",
+                    "properties": {
+                        "Nome": {"id": "title", "type": "title"},
+                        "Stato": {"id": "%3AUPp", "type": "status"},
+                        "Date": {"id": "b%5Cd", "type": "date"},
+                        "Note interne": {"id": "xyz1", "type": "rich_text"}
+                    }
+                })
+            return httpx.Response(200, json={"object": "list", "results": [], "has_more": False, "next_cursor": None})
+        
+        return NotionClient(token=valid_notion_token, database_id=valid_database_id,
+                            transport=httpx.MockTransport(handler))
+    
+    @pytest.mark.asyncio
+    async def test_property_ids_resolved_once(self, schema_client, schema_requests):
+        """
+        Test risoluzione ID property dallo schema.
+        
+        Verifica che:
+        - Lo schema sia scaricato una sola volta
+        - Gli ID siano decodificati e nell'ordine richiesto
+        - Property mancanti vengano ignorate
+        """
+        first = await schema_client.get_property_ids(['Nome', 'Stato', 'Date', 'Periodo'])
+        second = await schema_client.get_property_ids(['Stato'])
+        
+        assert first == ['title', ':UPp', 'b\\d']
+        assert second == [':UPp']
+        assert len(schema_requests) == 1
+    
+    @pytest.mark.asyncio
+    async def test_filter_properties_sent_as_query_string(self, schema_client, schema_requests, valid_database_id):
+        """Test projection: ID property inviati come filter_properties ripetuti in query string."""
+        property_ids = await schema_client.get_property_ids(['Nome', 'Stato'])
+        
+        await schema_client.get_client().databases.query(
+            database_id=valid_database_id, filter_properties=property_ids
+        )
+        
+        query_request = schema_requests[-1]
+        assert query_request.method == 'POST'
+        assert query_request.url.params.get_list('filter_properties') == ['title', ':UPp']
+    
+    @pytest.mark.asyncio
+    async def test_property_ids_none_when_schema_unavailable(self, valid_notion_token, valid_database_id):
+        """Test fallback: schema non recuperabile → nessuna projection (None)."""
+        client = NotionClient(
+            token=valid_notion_token, database_id=valid_database_id,
+            transport=httpx.MockTransport(lambda request: httpx.Response(500, json={}))
+        )
+        client.max_retries = 0
+        
+        assert await client.get_property_ids(['Nome']) is None
+
+
+@pytest.mark.unit
+@pytest.mark.notion
+class TestNotionClientRetry:
+    """Test suite per rate limiting centralizzato e retry su errori transitori."""
+    
+    @pytest.fixture
+    def responses(self):
+        """Risposte da restituire in sequenza (l'ultima viene ripetuta)."""
+        return []
+    
+    @pytest.fixture
+    def api_calls(self):
+        """Richieste HTTP arrivate al transport finto."""
+        return []
+    
+    @pytest.fixture
+    def retry_client(self, responses, api_calls, valid_notion_token, valid_database_id):
+        """NotionClient con transport finto e backoff ridotto (test veloci)."""
+        def handler(request):
+            api_calls.append((request.method, request.url.path))
+            return responses.pop(0) if len(responses) > 1 else responses[0]
+        
+        client = NotionClient(token=valid_notion_token, database_id=valid_database_id,
+                              transport=httpx.MockTransport(handler))
+        client.RETRY_BASE_SECONDS = 0.001
+        return client
+    
+    @staticmethod
+    def _error(status, headers=None):
+        """Risposta errore nel formato API Notion."""
+        codes = {429: 'rate_limited', 503: 'service_unavailable'}
+        return httpx.Response(status, headers=headers,
+                              json={'object': 'error', 'code': codes[status], 'message': 'errore'})
+    
+    @pytest.mark.asyncio
+    async def test_429_retried_honoring_retry_after(self, retry_client, responses, api_calls, valid_database_id):
+        """
+        Test 429 con Retry-After.
+        
+        Verifica che:
+        - La richiesta venga ripetuta e il risultato restituito al chiamante
+        - Retry-After metta in pausa il token bucket condiviso
+        - Le metriche registrino retry e attese
+        """
+        responses.extend([
+            self._error(429, headers={'Retry-After': '0.05'}),
+            httpx.Response(200, json={'object': 'list', 'results': [], 'has_more': False, 'next_cursor': None})
+        ])
+        
+        result = await retry_client.get_client().databases.query(database_id=valid_database_id)
+        
+        assert result['results'] == []
+        assert len(api_calls) == 2
+        stats = retry_client.get_rate_limit_stats()
+        assert stats['retries'] == 1
+        assert stats['rate_limited'] == 1
+        assert stats['retry_wait_seconds'] == pytest.approx(0.05)
+        assert stats['limiter']['pauses'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_server_errors_retried_only_for_idempotent_requests(self, retry_client, responses, api_calls):
+        """
+        Test 5xx: update pagina (PATCH) ripetuto, creazione pagina (POST) no.
+        
+        Un retry di pages.create dopo un 503 potrebbe duplicare la pagina.
+        """
+        responses.extend([self._error(503), httpx.Response(200, json={'object': 'page', 'id': 'page-x'})])
+        
+        page = await retry_client.get_client().pages.update(page_id='page-x', properties={})
+        assert page['id'] == 'page-x'
+        assert len(api_calls) == 2
+        
+        responses[:] = [self._error(503)]
+        with pytest.raises(APIResponseError):
+            await retry_client.get_client().pages.create(parent={'database_id': 'db'}, properties={})
+        assert len(api_calls) == 3
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, retry_client, responses, api_calls):
+        """Test 429 persistente: dopo max_retries l'errore arriva al chiamante."""
+        retry_client.max_retries = 2
+        responses.append(self._error(429))
+        
+        with pytest.raises(APIResponseError) as exc_info:
+            await retry_client.get_client().pages.retrieve(page_id='page-x')
+        
+        assert exc_info.value.status == 429
+        assert len(api_calls) == 3
+        assert retry_client.get_rate_limit_stats()['gave_up'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_latency_recorded_per_operation(self, retry_client, responses, valid_database_id):
+        """
+        Test istogrammi latenza per operazione.
+        
+        Verifica che:
+        - Ogni tentativo HTTP sia registrato sotto l'operazione corretta (ID esclusi)
+        - Errori e byte ricevuti vengano contati
+        - Le risposte servite dalla cache non generino campioni
+        """
+        page_response = httpx.Response(200, json={'object': 'page', 'id': 'page-x'})
+        list_response = httpx.Response(200, json={'object': 'list', 'results': [], 'has_more': False, 'next_cursor': None})
+        responses.extend([self._error(503), page_response, list_response])
+        notion = retry_client.get_client()
+        
+        await notion.pages.update(page_id='page-x', properties={})
+        await notion.databases.query(database_id=valid_database_id)
+        await notion.databases.query(database_id=valid_database_id)
+        
+        stats = retry_client.get_latency_stats()
+        assert stats['pages.update']['count'] == 2
+        assert stats['pages.update']['errors'] == 1
+        assert stats['pages.update']['bytes_received'] > len(page_response.content)
+        assert stats['databases.query']['count'] == 1
+        assert stats['databases.query']['bytes_received'] == len(list_response.content)
+        assert stats['pages.retrieve']['count'] == 0
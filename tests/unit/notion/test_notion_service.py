@@ -16,6 +16,9 @@ COVERAGE:
 - API contract e module accessibility
 """
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from notion_client.errors import APIResponseError
@@ -152,4 +155,243 @@ class TestNotionServiceFacade:
         # Verifica metodi pubblici esistano (API contract)
         assert callable(getattr(service, 'get_formazioni_by_status', None))
         assert callable(getattr(service, 'update_formazione_status', None))
-        assert callable(getattr(service, 'get_formazione_by_id', None))
\ No newline at end of file
+        assert callable(getattr(service, 'get_formazione_by_id', None))    
+    @pytest.mark.asyncio
+    async def test_get_formazioni_by_status_follows_pagination(self, mock_notion_service_modules, mock_env_empty):
+        """
+        TEST PAGINAZIONE: has_more/next_cursor seguiti fino all'ultima pagina.
+        
+        Verifica che:
+        - Ogni pagina successiva sia richiesta con start_cursor corretto
+        - Ogni response sia parsata una sola volta
+        - Il risultato contenga le formazioni di TUTTE le pagine (no troncamento a 100)
+        """
+        service = NotionService(token="test-token", database_id="test-db")
+        
+        mock_query = {"database_id": "test-db", "page_size": 100}
+        page_1 = {"results": [{"id": "p1"}], "has_more": True, "next_cursor": "cursor-2"}
+        page_2 = {"results": [{"id": "p2"}], "has_more": False, "next_cursor": None}
+        
+        mock_notion_service_modules['query_builder'].build_status_filter_query.return_value = mock_query
+        mock_query_api = mock_notion_service_modules['client'].get_client().databases.query
+        mock_query_api.side_effect = [page_1, page_2]
+        mock_notion_service_modules['data_parser'].parse_formazioni_list.side_effect = (
+            lambda response: [{'id': page['id']} for page in response['results']]
+        )
+        
+        result = await service.get_formazioni_by_status("Conclusa")
+        
+        assert result == [{'id': 'p1'}, {'id': 'p2'}]
+        assert mock_query_api.call_count == 2
+        mock_query_api.assert_any_call(**mock_query)
+        mock_query_api.assert_called_with(**mock_query, start_cursor="cursor-2")
+        assert mock_notion_service_modules['data_parser'].parse_formazioni_list.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_formazioni_grouped_by_status_single_scan(self, mock_notion_service_modules, mock_env_empty):
+        """
+        TEST DASHBOARD: più status recuperati con una sola query paginata.
+        
+        Verifica che:
+        - Venga eseguita un'unica scansione (query "or")
+        - Le formazioni siano suddivise per status mantenendo l'ordine
+        - Le statistiche includano conteggi per status e totale
+        """
+        service = NotionService(token="test-token", database_id="test-db")
+        
+        mock_query = {"database_id": "test-db", "page_size": 100}
+        mock_notion_service_modules['query_builder'].build_multi_status_filter_query.return_value = mock_query
+        mock_query_api = mock_notion_service_modules['client'].get_client().databases.query
+        mock_query_api.return_value = {"results": [], "has_more": False, "next_cursor": None}
+        mock_notion_service_modules['data_parser'].parse_formazioni_list.return_value = [
+            {'id': 'a', 'Stato': 'Programmata'},
+            {'id': 'b', 'Stato': 'Conclusa'},
+            {'id': 'c', 'Stato': 'Programmata'},
+        ]
+        
+        result = await service.get_formazioni_grouped_by_status(['Programmata', 'Calendarizzata', 'Conclusa'])
+        
+        assert mock_query_api.call_count == 1
+        assert [f['id'] for f in result['formazioni']['Programmata']] == ['a', 'c']
+        assert result['formazioni']['Calendarizzata'] == []
+        assert result['stats'] == {'programmata': 2, 'calendarizzata': 0, 'conclusa': 1, 'totale': 3}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('status, code, transient', [
+        (429, 'rate_limited', True),
+        (503, 'service_unavailable', True),
+        (400, 'validation_error', False),
+    ])
+    async def test_grouped_query_error_reports_transient_cause(self, mock_notion_service_modules, mock_env_empty,
+                                                               status, code, transient):
+        """
+        TEST DASHBOARD: NotionServiceError.transient distingue 429/5xx (retry esauriti) dagli altri errori.
+
+        La dashboard non ripiega su query per status quando Notion è sovraccarico.
+        """
+        service = NotionService(token="test-token", database_id="test-db")
+        mock_notion_service_modules['query_builder'].build_multi_status_filter_query.return_value = {"database_id": "test-db"}
+        mock_notion_service_modules['client'].get_client().databases.query.side_effect = APIResponseError(
+            response=Mock(status_code=status, text='errore', headers={}), message="API Error", code=code
+        )
+
+        with pytest.raises(NotionServiceError) as exc_info:
+            await service.get_formazioni_grouped_by_status(['Programmata', 'Calendarizzata', 'Conclusa'])
+
+        assert exc_info.value.transient is transient
+
+    @pytest.mark.asyncio
+    async def test_get_formazioni_in_range_filters_server_side(self, mock_notion_service_modules, mock_env_empty):
+        """
+        TEST RANGE DATE: query status + date, rifinitura locale sul giorno.
+        
+        Verifica che:
+        - Il range inviato a Notion includa lo status e un giorno di margine per lato
+        - Le formazioni fuori dal range esatto (margine timezone) vengano scartate
+        """
+        from datetime import date
+        
+        service = NotionService(token="test-token", database_id="test-db")
+        
+        mock_query = {"database_id": "test-db", "page_size": 100}
+        mock_notion_service_modules['query_builder'].build_date_range_filter_query.return_value = mock_query
+        mock_notion_service_modules['client'].get_client().databases.query.return_value = {
+            "results": [], "has_more": False, "next_cursor": None
+        }
+        mock_notion_service_modules['data_parser'].parse_formazioni_list.return_value = [
+            {'id': 'prima', 'Data/Ora': '14/03/2024 23:30'},
+            {'id': 'giorno', 'Data/Ora': '15/03/2024 09:00'},
+            {'id': 'dopo', 'Data/Ora': '16/03/2024 00:30'},
+        ]
+        
+        result = await service.get_formazioni_in_range('Calendarizzata', date(2024, 3, 15), date(2024, 3, 15))
+        
+        assert [f['id'] for f in result] == ['giorno']
+        mock_notion_service_modules['query_builder'].build_date_range_filter_query.assert_called_once_with(
+            start_date='2024-03-14', end_date='2024-03-16', database_id='test-database-id', status='Calendarizzata'
+        )
+    
+    @pytest.mark.asyncio
+    async def test_queries_use_property_projection(self, mock_notion_service_modules, mock_env_empty):
+        """
+        TEST PROJECTION: le query paginate richiedono solo le property parsate.
+        
+        Verifica che filter_properties sia aggiunto a ogni pagina della query.
+        """
+        service = NotionService(token="test-token", database_id="test-db")
+        
+        mock_notion_service_modules['client'].get_property_ids.return_value = ['title', 'abcd']
+        mock_notion_service_modules['query_builder'].build_status_filter_query.return_value = {"database_id": "test-db"}
+        mock_query_api = mock_notion_service_modules['client'].get_client().databases.query
+        mock_query_api.side_effect = [
+            {"results": [], "has_more": True, "next_cursor": "cursor-2"},
+            {"results": [], "has_more": False, "next_cursor": None},
+        ]
+        mock_notion_service_modules['data_parser'].parse_formazioni_list.return_value = []
+        
+        await service.get_formazioni_by_status("Programmata")
+        
+        for call in mock_query_api.call_args_list:
+            assert call.kwargs['filter_properties'] == ['title', 'abcd']
+    
+    @pytest.mark.asyncio
+    async def test_gathered_status_queries_overlap(self, mock_notion_service_modules, mock_env_empty):
+        """
+        TEST CONCORRENZA: query gather-ate non bloccano l'event loop.
+        
+        Verifica che tre query con latenza simulata eseguite con asyncio.gather
+        impieghino circa quanto la più lenta, non la somma delle tre.
+        """
+        service = NotionService(token="test-token", database_id="test-db")
+        
+        async def slow_query(**query):
+            await asyncio.sleep(0.1)
+            return {"results": [], "has_more": False, "next_cursor": None}
+        
+        mock_notion_service_modules['query_builder'].build_status_filter_query.return_value = {"database_id": "test-db"}
+        mock_notion_service_modules['client'].get_client().databases.query.side_effect = slow_query
+        mock_notion_service_modules['data_parser'].parse_formazioni_list.return_value = []
+        
+        start = time.perf_counter()
+        await asyncio.gather(
+            service.get_formazioni_by_status("Programmata"),
+            service.get_formazioni_by_status("Calendarizzata"),
+            service.get_formazioni_by_status("Conclusa")
+        )
+        elapsed = time.perf_counter() - start
+        
+        assert elapsed < 0.25
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_reads_coalesced(self, mock_notion_service_modules, mock_env_empty):
+        """
+        TEST SINGLE-FLIGHT: letture identiche concorrenti → una sola richiesta.
+        
+        Verifica che:
+        - Tre get_formazione_by_id sullo stesso ID chiamino CrudOperations una volta
+        - Ogni chiamante riceva una copia indipendente
+        - Le chiamate coalescenti siano contate nelle statistiche
+        """
+        service = NotionService(token="test-token", database_id="test-db")
+        
+        async def slow_get(notion_id, data_parser):
+            await asyncio.sleep(0.05)
+            return {'id': notion_id, 'Nome': 'Formazione'}
+        
+        mock_get = AsyncMock(side_effect=slow_get)
+        mock_notion_service_modules['crud_operations'].get_formazione_by_id = mock_get
+        mock_notion_service_modules['diagnostics'].get_service_stats.return_value = {}
+        
+        results = await asyncio.gather(*(service.get_formazione_by_id("page-1") for _ in range(3)))
+        results[0]['Nome'] = 'Modificata'
+        
+        assert mock_get.await_count == 1
+        assert [r['Nome'] for r in results] == ['Modificata', 'Formazione', 'Formazione']
+        assert service.get_service_stats()['single_flight']['coalesced'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_conditional_fetch_skips_unchanged_scan(self, mock_notion_service_modules, mock_env_empty):
+        """
+        TEST FETCH CONDIZIONALE: sonda last_edited_time prima della scansione.
+        
+        Verifica che:
+        - Database invariato → risultati riusati senza nuova scansione
+        - Marker cambiato (pagina modificata) → nuova scansione
+        - Scrittura dal servizio → risultati condizionali scartati
+        """
+        from contextlib import nullcontext
+        
+        service = NotionService(token="test-token", database_id="test-db", conditional_fetch=True)
+        service.freshness.probe_ttl_seconds = 0  # Una sonda per lettura
+        
+        modules = mock_notion_service_modules
+        modules['client'].bypass_cache = nullcontext
+        modules['query_builder'].build_freshness_probe_query.return_value = {"database_id": "test-db", "page_size": 1}
+        modules['query_builder'].build_status_filter_query.return_value = {"database_id": "test-db", "page_size": 100}
+        modules['data_parser'].parse_formazioni_list.return_value = [{'id': 'a', 'Stato': 'Programmata'}]
+        modules['crud_operations'].update_multiple_fields = AsyncMock(return_value={'id': 'a'})
+        
+        probe = {'results': [{'id': 'a', 'last_edited_time': '2024-01-01T10:00:00.000Z'}]}
+        scans = []
+        
+        async def query_api(**query):
+            if query.get('page_size') == 1:
+                return probe
+            scans.append(query)
+            return {"results": [], "has_more": False, "next_cursor": None}
+        
+        modules['client'].get_client().databases.query = AsyncMock(side_effect=query_api)
+        
+        first = await service.get_formazioni_by_status('Programmata')
+        second = await service.get_formazioni_by_status('Programmata')
+        assert len(scans) == 1
+        assert second == first and second[0] is not first[0]
+        
+        probe['results'][0]['last_edited_time'] = '2024-01-01T11:00:00.000Z'
+        await service.get_formazioni_by_status('Programmata')
+        assert len(scans) == 2
+        
+        await service.update_formazione('page-id-12345678', {'Stato': 'Conclusa'})
+        await service.get_formazioni_by_status('Programmata')
+        assert len(scans) == 3
+        assert service.freshness.get_stats()['hits'] == 1
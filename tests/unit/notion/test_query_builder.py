@@ -128,6 +128,20 @@ class TestNotionQueryBuilder:
         assert result["filter"]["and"][0]["date"]["on_or_after"] == same_date
         assert result["filter"]["and"][1]["date"]["on_or_before"] == same_date
     
+    def test_build_date_range_filter_query_with_status(self, query_builder, sample_database_id):
+        """
+        Test range date combinato con status (comandi bot /oggi, /settimana).
+        
+        Verifica che lo status sia aggiunto al filtro 'and' dopo i limiti di data.
+        """
+        result = query_builder.build_date_range_filter_query(
+            "2024-04-01", "2024-04-07", sample_database_id, status="Calendarizzata"
+        )
+        
+        assert len(result["filter"]["and"]) == 3
+        assert result["filter"]["and"][2] == {"property": "Stato", "status": {"equals": "Calendarizzata"}}
+        assert result["page_size"] == 100
+    
     # ===== TEST BUILD AREA FILTER QUERY =====
     
     def test_build_area_filter_query_it(self, query_builder, sample_database_id):
@@ -179,6 +193,31 @@ class TestNotionQueryBuilder:
         
         assert result["filter"]["multi_select"]["contains"] == "Marketing"
     
+    # ===== TEST BUILD MULTI STATUS FILTER QUERY =====
+    
+    def test_build_multi_status_filter_query(self, query_builder, sample_database_id):
+        """
+        Test query multi-status per dashboard.
+        
+        Verifica che:
+        - Gli status siano combinati in "or"
+        - Ordinamento per data e page size come le query per status
+        """
+        query = query_builder.build_multi_status_filter_query(
+            ["Programmata", "Calendarizzata", "Conclusa"], sample_database_id
+        )
+        
+        assert [f["status"]["equals"] for f in query["filter"]["or"]] == ["Programmata", "Calendarizzata", "Conclusa"]
+        assert all(f["property"] == "Stato" for f in query["filter"]["or"])
+        assert query["sorts"][0] == {"property": "Date", "direction": "ascending"}
+        assert query["page_size"] == 100
+    
+    def test_build_multi_status_filter_query_single_status(self, query_builder, sample_database_id):
+        """Test con un solo status: filtro semplice identico a build_status_filter_query."""
+        query = query_builder.build_multi_status_filter_query(["Programmata"], sample_database_id)
+        
+        assert query == query_builder.build_status_filter_query("Programmata", sample_database_id)
+    
     # ===== TEST BUILD COMBINED FILTER QUERY =====
     
     def test_build_combined_filter_query_status_only(self, query_builder, sample_database_id):
@@ -247,6 +286,37 @@ class TestNotionQueryBuilder:
         assert status_filter["status"]["equals"] == "Calendarizzata"
         assert area_filter["multi_select"]["contains"] == "HR"
     
+    # ===== TEST BUILD LAST EDITED FILTER QUERY =====
+    
+    def test_build_last_edited_filter_query_with_watermark(self, query_builder, sample_database_id):
+        """
+        Test query delta per sync mirror locale.
+        
+        Verifica che:
+        - Filtro timestamp last_edited_time on_or_after watermark
+        - Ordinamento per ultima modifica (watermark monotono)
+        """
+        query = query_builder.build_last_edited_filter_query("2024-03-15T10:00:00.000Z", sample_database_id)
+        
+        assert query["database_id"] == sample_database_id
+        assert query["filter"] == {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": "2024-03-15T10:00:00.000Z"}
+        }
+        assert query["sorts"] == [{"timestamp": "last_edited_time", "direction": "ascending"}]
+        assert query["page_size"] == 100
+    
+    def test_build_last_edited_filter_query_without_watermark(self, query_builder, sample_database_id):
+        """
+        Test query delta senza watermark (primo sync / sync completo).
+        
+        Nessun filtro: vengono restituite tutte le pagine.
+        """
+        query = query_builder.build_last_edited_filter_query(None, sample_database_id)
+        
+        assert "filter" not in query
+        assert query_builder.validate_query_structure(query) is True
+    
     # ===== TEST VALIDATE QUERY STRUCTURE =====
     
     def test_validate_query_structure_valid_query(self, query_builder, expected_status_query):
@@ -322,6 +392,23 @@ class TestNotionQueryBuilder:
     
     # ===== TEST EDGE CASES =====
     
+    def test_build_freshness_probe_query(self, query_builder, sample_database_id):
+        """
+        Test sonda di freschezza per fetch condizionale.
+        
+        Verifica che:
+        - Venga richiesta una sola pagina (la modificata più di recente)
+        - Ordinamento per last_edited_time decrescente
+        - Proiezione sul solo titolo
+        """
+        query = query_builder.build_freshness_probe_query(sample_database_id)
+        
+        assert query["database_id"] == sample_database_id
+        assert query["page_size"] == 1
+        assert query["sorts"] == [{"timestamp": "last_edited_time", "direction": "descending"}]
+        assert query["filter_properties"] == ["title"]
+        assert query_builder.validate_query_structure(query)
+    
     def test_query_builder_initialization(self, query_builder):
         """
         Test inizializzazione QueryBuilder.
@@ -0,0 +1,67 @@
+"""
+Unit test per istogrammi latenza (LatencyHistogram, OperationMetrics).
+
+Focus su:
+- Percentili stimati entro l'errore dei bucket
+- Conteggi, error rate e byte ricevuti
+- Registro per operazione
+
+UTILIZZO:
+pytest tests/unit/test_metrics.py -v
+"""
+
+import pytest
+
+from app.services.metrics import LatencyHistogram, OperationMetrics
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+    """Test suite per LatencyHistogram e OperationMetrics."""
+
+    def test_percentiles_within_bucket_error(self):
+        """
+        Test stima percentili.
+
+        Verifica che con latenze 1..1000ms p50/p95/p99 siano entro il 10%
+        del valore esatto e che il massimo sia quello reale.
+        """
+        histogram = LatencyHistogram()
+        for duration_ms in range(1, 1001):
+            histogram.record(float(duration_ms))
+
+        stats = histogram.snapshot()
+
+        assert stats['count'] == 1000
+        assert stats['p50_ms'] == pytest.approx(500, rel=0.1)
+        assert stats['p95_ms'] == pytest.approx(950, rel=0.1)
+        assert stats['p99_ms'] == pytest.approx(990, rel=0.1)
+        assert stats['max_ms'] == 1000
+        assert stats['avg_ms'] == pytest.approx(500.5)
+
+    def test_errors_and_bytes(self):
+        """Test error rate e byte ricevuti (anche valori fuori scala)."""
+        histogram = LatencyHistogram()
+        histogram.record(0.2, bytes_received=100)
+        histogram.record(250_000, error=True, bytes_received=300)
+
+        stats = histogram.snapshot()
+
+        assert stats['error_rate'] == 0.5
+        assert stats['bytes_received'] == 400
+        assert stats['avg_bytes'] == 200
+        assert stats['p99_ms'] == 250_000
+
+    def test_operation_registry(self):
+        """Test registro: operazioni predefinite visibili a zero, nuove create al primo record."""
+        metrics = OperationMetrics(['databases.query'])
+        metrics.record('pages.update', 120.0)
+
+        stats = metrics.get_stats()
+
+        assert list(stats) == ['databases.query', 'pages.update']
+        assert stats['databases.query']['count'] == 0
+        assert stats['pages.update']['p50_ms'] == pytest.approx(120, rel=0.1)
+
+        metrics.reset()
+        assert metrics.get_stats()['pages.update']['count'] == 0
@@ -0,0 +1,80 @@
+"""
+Unit test per TokenBucket (rate limiter condiviso).
+
+Focus su:
+- Burst entro capacity senza attese
+- Attese proporzionali al rate oltre il burst
+- Prenotazioni FIFO con chiamanti concorrenti
+- Pausa su Retry-After
+- Metriche attese
+
+UTILIZZO:
+pytest tests/unit/test_rate_limiter.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.rate_limiter import TokenBucket
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test suite per TokenBucket."""
+
+    def test_burst_within_capacity_does_not_wait(self):
+        """Test: fino a capacity token le prenotazioni sono immediate."""
+        bucket = TokenBucket(rate=2, capacity=3)
+
+        delays = [bucket.reserve() for _ in range(3)]
+
+        assert delays == [0.0, 0.0, 0.0]
+        assert bucket.get_stats()['waited'] == 0
+
+    def test_reservations_beyond_capacity_are_spaced_by_rate(self):
+        """
+        Test: oltre il burst ogni prenotazione attende 1/rate in più della precedente.
+
+        Verifica anche le metriche (richieste in attesa, attesa massima).
+        """
+        bucket = TokenBucket(rate=10, capacity=1)
+
+        delays = [bucket.reserve() for _ in range(4)]
+
+        assert delays[0] == 0.0
+        assert delays[1] == pytest.approx(0.1, abs=0.01)
+        assert delays[2] == pytest.approx(0.2, abs=0.01)
+        assert delays[3] == pytest.approx(0.3, abs=0.01)
+        stats = bucket.get_stats()
+        assert stats['acquired'] == 4
+        assert stats['waited'] == 3
+        assert stats['max_wait_seconds'] == pytest.approx(0.3, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquire_respects_rate(self):
+        """Test: acquire concorrenti completano in tempo proporzionale al rate."""
+        bucket = TokenBucket(rate=50, capacity=1)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        elapsed = time.perf_counter() - start
+
+        # 5 token oltre il burst a 50/s → ~0.1s
+        assert 0.08 <= elapsed < 0.5
+
+    def test_pause_delays_next_reservations(self):
+        """Test Retry-After: dopo pause() anche il burst disponibile attende."""
+        bucket = TokenBucket(rate=10, capacity=5)
+
+        bucket.pause(0.5)
+        delay = bucket.reserve()
+
+        assert delay == pytest.approx(0.6, abs=0.02)
+        assert bucket.get_stats()['pauses'] == 1
+
+    def test_invalid_rate_rejected(self):
+        """Test: rate non positivo non ammesso."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
@@ -0,0 +1,172 @@
+"""
+Unit test per RenderCache e cache render dei formatter.
+
+Focus su:
+- Hit / miss / LRU e dati non hashable
+- TelegramFormatter: anteprima e conferma con gli stessi dati → stesso testo, un solo render
+- Link Teams creato alla conferma inserito dopo il render (corpo dell'anteprima riusato)
+- TrainingService reale: generate_preview → send_training_notification senza nuovi render
+- Dati o template cambiati → nuovo render
+- EmailFormatter: oggetto e corpo evento riusati
+
+UTILIZZO:
+pytest tests/unit/test_render_cache.py -v
+"""
+
+import copy
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import yaml
+
+from app.services.bot.telegram_formatters import TelegramFormatter
+from app.services.microsoft.email_formatter import EmailFormatter
+from app.services.notion.data_parser import NotionDataParser
+from app.services.render_cache import RenderCache, template_version
+from app.services.training_service import TrainingService
+
+
+@pytest.fixture
+def templates():
+    """Template Telegram di test."""
+    with open('tests/config/test_message_templates.yaml', 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+@pytest.mark.unit
+class TestRenderCache:
+    """Test suite per RenderCache."""
+
+    def test_hit_miss_eviction_and_uncacheable(self):
+        """Test: render una volta per chiave, LRU oltre max_entries, chiavi non hashable senza cache."""
+        cache = RenderCache(max_entries=2)
+        render = Mock(side_effect=lambda: 'testo')
+
+        assert cache.get_or_render(('a',), render) == 'testo'
+        assert cache.get_or_render(('a',), render) == 'testo'
+        assert render.call_count == 1
+
+        cache.get_or_render(('b',), render)
+        cache.get_or_render(('c',), render)
+        cache.get_or_render(('a',), render)
+        assert render.call_count == 4
+
+        cache.get_or_render(('d', ['lista']), render)
+        stats = cache.get_stats()
+        assert stats == {'hits': 1, 'misses': 4, 'uncacheable': 1, 'entries': 2, 'hit_rate': 0.2}
+
+    def test_template_version_changes_with_content(self, templates):
+        """Test: stessa versione per template uguali, diversa se un template cambia."""
+        changed = yaml.safe_load(yaml.safe_dump(templates))
+        changed['feedback_request']['telegram']['message'] += '!'
+
+        assert template_version(templates) == template_version(dict(templates))
+        assert template_version(templates) != template_version(changed)
+
+
+@pytest.mark.unit
+class TestFormatterRenderCache:
+    """Test suite per cache render nei formatter."""
+
+    def test_preview_and_confirm_share_rendered_messages(self, templates, sample_training_data):
+        """
+        Test anteprima → conferma.
+
+        Verifica che:
+        - Gruppi area diversi condividano il render del template area_group
+        - La conferma con gli stessi dati restituisca lo stesso testo senza nuovo render
+        - Il link Teams cambiato venga inserito senza nuovo render, un altro dato cambiato no
+        - Template riassegnati invalidino i testi in cache (nuova versione)
+        """
+        formatter = TelegramFormatter(templates)
+        preview = {group: formatter.format_training_message(sample_training_data, group)
+                   for group in ('main_group', 'IT', 'HR')}
+
+        confirm = {group: formatter.format_training_message(dict(sample_training_data), group)
+                   for group in ('main_group', 'IT', 'HR')}
+
+        assert confirm == preview
+        assert formatter.get_render_stats()['misses'] == 2
+        assert formatter.get_render_stats()['hits'] == 4
+
+        updated = {**sample_training_data, 'Link Teams': 'https://teams.microsoft.com/l/meetup-join/nuovo'}
+        with_link = formatter.format_training_message(updated, 'IT')
+        assert with_link == preview['IT'].replace(sample_training_data['Link Teams'], updated['Link Teams'])
+        assert formatter.get_render_stats()['misses'] == 2
+
+        assert 'IT-02' in formatter.format_training_message({**updated, 'Codice': 'IT-02'}, 'IT')
+        assert formatter.get_render_stats()['misses'] == 3
+
+        formatter.templates = {**templates, 'training_notification': {'telegram': {'area_group': 'Nuovo {nome}'}}}
+        assert formatter.format_training_message(sample_training_data, 'IT') == f"Nuovo {sample_training_data['Nome']}"
+
+    @pytest.mark.asyncio
+    async def test_training_service_preview_then_confirm(self, offline_telegram_service, patched_telegram_bot,
+                                                         sample_notion_page, tmp_path, monkeypatch):
+        """
+        Test sequenza reale TrainingService: generate_preview → send_training_notification.
+
+        Verifica che:
+        - L'anteprima (codice generato, nessun link Teams) renderizzi un corpo per tipo template
+        - La conferma (link Teams appena creato) riusi quei corpi: nessun nuovo render
+        - I messaggi inviati contengano il link reale al posto di quello (vuoto) dell'anteprima
+        """
+        monkeypatch.setattr('app.services.training_service.Config.BASE_DIR', str(tmp_path))
+        parser = NotionDataParser()
+        page = copy.deepcopy(sample_notion_page)
+        page['properties']['Codice'] = {'rich_text': []}
+        page['properties']['Link Teams'] = {'url': None}
+        teams_link = 'https://teams.microsoft.com/l/meetup-join/creato-alla-conferma'
+
+        async def update_formazione(notion_id, updates):
+            props = page['properties']
+            props['Stato'] = {'status': {'name': updates['Stato']}}
+            props['Codice'] = {'rich_text': [{'plain_text': updates['Codice']}]}
+            props['Link Teams'] = {'url': updates['Link Teams']}
+            return parser.parse_single_formazione(page)
+
+        service = object.__new__(TrainingService)
+        service.notion_service = Mock()
+        service.notion_service.get_formazione_by_id = AsyncMock(
+            side_effect=lambda notion_id: parser.parse_single_formazione(page)
+        )
+        service.notion_service.update_formazione = AsyncMock(side_effect=update_formazione)
+        service.microsoft_service = Mock()
+        service.microsoft_service.create_training_event = AsyncMock(return_value={
+            'teams_link': teams_link, 'event_id': 'evt-1', 'attendee_emails': ['it@example.com'],
+            'calendar_link': 'https://outlook.office.com/evt-1'
+        })
+        service.telegram_service = offline_telegram_service
+        formatter = offline_telegram_service.formatter
+
+        preview = await service.generate_preview(page['id'])
+        assert formatter.get_render_stats()['misses'] == 2
+
+        result = await service.send_training_notification(page['id'])
+
+        assert result['codice_generato'] == preview['codice_generato']
+        assert formatter.get_render_stats()['misses'] == 2
+        sent = {call.kwargs['chat_id']: call.kwargs['text']
+                for call in patched_telegram_bot.instances[0].send_message.await_args_list}
+        assert len(sent) == len(preview['messages']) == 3
+        for message in preview['messages']:
+            assert 'href=""' in message['message']
+            assert sent[message['chat_id']] == message['message'].replace('href=""', f'href="{teams_link}"')
+
+    def test_email_subject_and_body_are_cached(self):
+        """Test: oggetto e corpo evento renderizzati una volta per gli stessi dati."""
+        formatter = EmailFormatter()
+        training = {
+            'Nome': 'Sicurezza Informatica',
+            'Codice': 'IT-Security-2024-SPRING-01',
+            'Data/Ora': '2024-10-15T14:30:00+02:00',
+            'Area': ['IT', 'R&D']
+        }
+
+        body = formatter.format_calendar_body(training)
+        subject = formatter.format_subject(training)
+
+        assert formatter.format_calendar_body(dict(training)) is body
+        assert formatter.format_subject(dict(training)) is subject
+        assert formatter.format_calendar_body({**training, 'Codice': 'IT-Security-2024-SPRING-02'}) != body
+        assert formatter.get_render_stats()['hits'] == 2
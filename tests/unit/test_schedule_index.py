@@ -0,0 +1,286 @@
+"""
+Unit test per ScheduleIndex e comandi bot serviti dall'indice.
+
+Focus su:
+- Una sola query range Notion per ricostruzione (finestra dei comandi), anche con richieste concorrenti
+- Formazioni per giorno ordinate per ora, intervalli in ordine cronologico
+- Giorni fuori finestra → query range sul solo intervallo richiesto; cambio giorno → nuova finestra
+- Ricostruzione dopo invalidate() o refresh scaduto, indice precedente se Notion fallisce
+- invalidate() durante una ricostruzione → ricostruzione successiva
+- Modifica del mirror da un altro processo → ricostruzione alla lookup successiva
+- Scadenza: indice precedente o TimeoutError, ricostruzione completata in background
+- /oggi, /domani, /settimana: picco di comandi → nessuna query oltre la prima
+- Comandi con Notion lento: risposta "in caricamento" entro la scadenza
+
+UTILIZZO:
+pytest tests/unit/test_schedule_index.py -v
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.bot.schedule_index import ScheduleIndex
+from app.services.bot.telegram_commands import TelegramCommands
+from app.services.notion.local_mirror import NotionLocalMirror
+
+
+TODAY = date.today()
+WINDOW = (TODAY - timedelta(days=TODAY.weekday()), TODAY + timedelta(days=ScheduleIndex.DAYS_AHEAD))
+
+
+def slow_notion(formazioni: list, delay: float) -> Mock:
+    """NotionService mock con query calendario lenta."""
+    async def get_formazioni_in_range(status, start_date, end_date):
+        await asyncio.sleep(delay)
+        return formazioni
+
+    notion = Mock()
+    notion.get_formazioni_in_range = AsyncMock(side_effect=get_formazioni_in_range)
+    return notion
+
+
+def training(nome: str, day: date, ora: str = '09:00') -> dict:
+    """Formazione calendarizzata minima (formato Data/Ora del mock Notion)."""
+    data_ora = f"{day.strftime('%d/%m/%Y')} {ora}" if day else ''
+    return {'Nome': nome, 'Area': 'IT', 'Data/Ora': data_ora, 'Codice': nome.upper(), 'Link Teams': ''}
+
+
+@pytest.fixture
+def counting_notion(mock_notion_service):
+    """MockNotionService con conteggio chiamate su get_formazioni_in_range."""
+    mock_notion_service.get_formazioni_in_range = AsyncMock(
+        wraps=mock_notion_service.get_formazioni_in_range
+    )
+    return mock_notion_service
+
+
+@pytest.mark.unit
+class TestScheduleIndex:
+    """Test suite per ScheduleIndex."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_build(self):
+        """
+        Test costruzione indice.
+
+        Verifica che:
+        - Lookup concorrenti generino una sola query range Notion sulla finestra dei comandi
+        - Le formazioni del giorno siano ordinate per ora
+        - I giorni dell'intervallo siano in ordine cronologico
+        """
+        tomorrow = TODAY + timedelta(days=1)
+        notion = Mock()
+        notion.get_formazioni_in_range = AsyncMock(return_value=[
+            training('pomeriggio', TODAY, '15:00'),
+            training('domani', tomorrow, '10:00'),
+            training('mattina', TODAY, '09:00'),
+            training('senza data', None),
+        ])
+        index = ScheduleIndex(notion, refresh_seconds=300)
+
+        days = await asyncio.gather(*(index.get_day(TODAY) for _ in range(20)))
+        week = await index.get_range(TODAY, WINDOW[1])
+
+        notion.get_formazioni_in_range.assert_awaited_once_with('Calendarizzata', *WINDOW)
+        assert [f['Nome'] for f in days[0]] == ['mattina', 'pomeriggio']
+        assert list(week) == [TODAY, tomorrow]
+        assert await index.get_day(TODAY + timedelta(days=2)) == []
+
+        stats = index.get_stats()
+        assert stats['builds'] == 1
+        assert (stats['lookups'], stats['range_queries']) == (22, 0)
+        assert (stats['days'], stats['trainings']) == (2, 3)
+        assert stats['window'] == [WINDOW[0].isoformat(), WINDOW[1].isoformat()]
+
+    @pytest.mark.asyncio
+    async def test_days_outside_window_use_range_query(self):
+        """
+        Test giorni fuori finestra.
+
+        Verifica che:
+        - Giorno e intervallo fuori finestra interroghino Notion sul solo range richiesto
+        - Nessuna ricostruzione dell'indice per queste richieste
+        """
+        later = TODAY + timedelta(days=30)
+        last_week = (WINDOW[0] - timedelta(days=7), WINDOW[0] - timedelta(days=1))
+        notion = Mock()
+        notion.get_formazioni_in_range = AsyncMock(return_value=[
+            training('pomeriggio', later, '15:00'), training('mattina', later, '09:00')
+        ])
+        index = ScheduleIndex(notion, refresh_seconds=300)
+
+        assert [f['Nome'] for f in await index.get_day(later)] == ['mattina', 'pomeriggio']
+        notion.get_formazioni_in_range.assert_awaited_once_with('Calendarizzata', later, later)
+
+        notion.get_formazioni_in_range.return_value = []
+        assert await index.get_range(*last_week) == {}
+        notion.get_formazioni_in_range.assert_awaited_with('Calendarizzata', *last_week)
+
+        stats = index.get_stats()
+        assert (stats['builds'], stats['range_queries']) == (0, 2)
+
+    @pytest.mark.asyncio
+    async def test_day_change_rebuilds_with_new_window(self):
+        """Test: cambio giorno → nuova finestra, indice ricostruito anche se non scaduto."""
+        notion = Mock()
+        notion.get_formazioni_in_range = AsyncMock(return_value=[])
+        index = ScheduleIndex(notion, refresh_seconds=300)
+        assert await index.get_day(TODAY) == []
+
+        next_window = (WINDOW[0], WINDOW[1] + timedelta(days=1))
+        index.current_window = lambda: next_window
+        assert await index.get_day(TODAY + timedelta(days=1)) == []
+
+        notion.get_formazioni_in_range.assert_awaited_with('Calendarizzata', *next_window)
+        assert index.get_stats()['builds'] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_rebuilds_and_failures_serve_previous_index(self, caplog):
+        """Test: invalidate() → nuova query; errore Notion con indice esistente → indice precedente."""
+        notion = Mock()
+        notion.get_formazioni_in_range = AsyncMock(return_value=[training('python', TODAY)])
+        index = ScheduleIndex(notion, refresh_seconds=300)
+        assert len(await index.get_day(TODAY)) == 1
+
+        notion.get_formazioni_in_range.side_effect = RuntimeError('Notion down')
+        index.invalidate()
+
+        assert [f['Nome'] for f in await index.get_day(TODAY)] == ['python']
+        assert notion.get_formazioni_in_range.await_count == 2
+        assert 'uso indice precedente' in caplog.text
+        assert index.get_stats()['build_errors'] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_build_forces_rebuild(self):
+        """Test: invalidate() mentre la lettura è in corso → dati serviti, indice non marcato valido."""
+        notion = slow_notion([training('python', TODAY)], delay=0.1)
+        index = ScheduleIndex(notion, refresh_seconds=300)
+
+        lookup = asyncio.ensure_future(index.get_day(TODAY))
+        await asyncio.sleep(0.05)
+        index.invalidate()
+        assert len(await lookup) == 1
+
+        notion.get_formazioni_in_range.side_effect = None
+        notion.get_formazioni_in_range.return_value = [
+            training('python', TODAY), training('git', TODAY, '14:00')
+        ]
+        assert [f['Nome'] for f in await index.get_day(TODAY)] == ['python', 'git']
+        assert len(await index.get_day(TODAY)) == 2
+        assert notion.get_formazioni_in_range.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_mirror_revision_from_other_process_triggers_rebuild(self, tmp_path):
+        """
+        Test segnale di modifica tra processi.
+
+        Verifica che:
+        - Con revisione mirror invariata l'indice non venga ricostruito
+        - Una scrittura sul mirror da un'altra connessione (processo Flask)
+          faccia ricostruire l'indice del processo bot alla lookup successiva
+        """
+        db_path = str(tmp_path / 'notion.sqlite3')
+        flask_mirror = NotionLocalMirror(db_path)
+        bot_mirror = NotionLocalMirror(db_path)
+        notion = Mock()
+        notion.get_formazioni_in_range = AsyncMock(return_value=[])
+        notion.get_change_marker = bot_mirror.get_revision
+        index = ScheduleIndex(notion, refresh_seconds=300)
+
+        assert await index.get_day(TODAY) == []
+        assert await index.get_day(TODAY) == []
+        assert notion.get_formazioni_in_range.await_count == 1
+
+        flask_mirror.upsert_formazione({**training('python', TODAY), 'id': 'p1',
+                                        'Area': ['IT'], 'Stato': 'Calendarizzata'})
+        notion.get_formazioni_in_range.return_value = [training('python', TODAY)]
+
+        assert len(await index.get_day(TODAY)) == 1
+        assert notion.get_formazioni_in_range.await_count == 2
+
+        flask_mirror.close()
+        bot_mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_first_build_failure_is_raised(self):
+        """Test: senza indice precedente l'errore Notion viene propagato."""
+        notion = Mock()
+        notion.get_formazioni_in_range = AsyncMock(side_effect=RuntimeError('Notion down'))
+        index = ScheduleIndex(notion)
+
+        with pytest.raises(RuntimeError):
+            await index.get_day(TODAY)
+
+    @pytest.mark.asyncio
+    async def test_deadline_serves_previous_index_while_rebuild_continues(self):
+        """
+        Test scadenza lookup con Notion lento.
+
+        Verifica che:
+        - Senza indice precedente la scadenza sollevi TimeoutError
+        - La ricostruzione prosegua in background e serva le richieste successive
+        - Con indice precedente la scadenza restituisca i dati in cache
+        """
+        notion = slow_notion([training('python', TODAY)], delay=0.2)
+        index = ScheduleIndex(notion, refresh_seconds=300)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await index.get_day(TODAY, timeout=0.01)
+        await asyncio.sleep(0.3)
+        assert len(await index.get_day(TODAY, timeout=0.01)) == 1
+
+        index.invalidate()
+        assert len(await index.get_day(TODAY, timeout=0.01)) == 1
+        await asyncio.sleep(0.3)
+
+        stats = index.get_stats()
+        assert notion.get_formazioni_in_range.await_count == 2
+        assert (stats['builds'], stats['deadline_misses']) == (2, 2)
+
+
+@pytest.mark.unit
+class TestCommandsUseScheduleIndex:
+    """Test suite per comandi bot serviti dall'indice calendario."""
+
+    @pytest.mark.asyncio
+    async def test_command_burst_queries_notion_once(self, counting_notion):
+        """
+        Test picco di comandi.
+
+        Verifica che:
+        - 50 /oggi concorrenti più /domani e /settimana facciano una sola query range Notion
+        - Le risposte contengano le formazioni del giorno in ordine di orario
+        """
+        commands = TelegramCommands(Mock())
+        commands.notion_service = counting_notion
+
+        updates = [Mock(message=Mock(reply_text=AsyncMock())) for _ in range(52)]
+        await asyncio.gather(*(commands.command_oggi(update, None) for update in updates[:50]))
+        await commands.command_domani(updates[50], None)
+        await commands.command_settimana(updates[51], None)
+
+        counting_notion.get_formazioni_in_range.assert_awaited_once_with('Calendarizzata', *WINDOW)
+
+        oggi = updates[0].message.reply_text.call_args.args[0]
+        assert datetime.now().strftime('%d/%m/%Y') in oggi
+        assert oggi.index('Python Fundamentals Workshop') < oggi.index('Advanced Git Workflows')
+        assert 'Leadership & Team Management' in updates[50].message.reply_text.call_args.args[0]
+        assert 'FORMAZIONI SETTIMANA' in updates[51].message.reply_text.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_slow_notion_answers_loading_within_deadline(self):
+        """Test: calendario non disponibile entro la scadenza → messaggio "in caricamento", non blocco."""
+        commands = TelegramCommands(Mock())
+        commands.notion_service = slow_notion([], delay=0.5)
+        commands.command_deadline = 0.05
+        update = Mock(message=Mock(reply_text=AsyncMock()))
+
+        started = asyncio.get_running_loop().time()
+        await commands.command_oggi(update, None)
+
+        assert asyncio.get_running_loop().time() - started < 0.4
+        update.message.reply_text.assert_awaited_once_with(TelegramCommands.LOADING_MESSAGE)
+        await asyncio.sleep(0.5)
@@ -0,0 +1,141 @@
+"""
+Unit test per SingleFlight (coalescing richieste concorrenti).
+
+Focus su:
+- Una sola esecuzione per chiave tra chiamate concorrenti
+- Propagazione errori a tutti i chiamanti
+- Condivisione tra event loop in thread diversi
+- Leader annullato e rilascio chiavi dopo scritture
+
+UTILIZZO:
+pytest tests/unit/test_single_flight.py -v
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test suite per SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """
+        Test coalescing sulla stessa chiave.
+
+        Verifica che:
+        - Chiamate concorrenti con stessa chiave eseguano la funzione una volta
+        - Chiavi diverse non vengano coalescenti
+        - I chiamanti in attesa ricevano la copia del risultato
+        """
+        group = SingleFlight(copy_result=list)
+        executions = []
+
+        async def fetch(key):
+            executions.append(key)
+            await asyncio.sleep(0.02)
+            return [key]
+
+        results = await asyncio.gather(
+            group.do('a', lambda: fetch('a')),
+            group.do('a', lambda: fetch('a')),
+            group.do('b', lambda: fetch('b'))
+        )
+
+        assert executions == ['a', 'b']
+        assert results == [['a'], ['a'], ['b']]
+        assert results[0] is not results[1]
+        stats = group.get_stats()
+        assert stats['calls'] == 3
+        assert stats['coalesced'] == 1
+        assert stats['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagated_to_all_callers(self):
+        """Test: l'eccezione del leader arriva anche ai chiamanti coalescenti."""
+        group = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("Notion non raggiungibile")
+
+        results = await asyncio.gather(
+            group.do('k', failing), group.do('k', failing), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert group.get_stats()['executions'] == 1
+
+    def test_shared_across_event_loops(self):
+        """Test: chiamate da event loop diversi (thread Flask + bot) condividono l'esecuzione."""
+        group = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        executions = []
+        results = []
+
+        async def fetch():
+            executions.append(1)
+            started.set()
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            return 'dati'
+
+        leader = threading.Thread(target=lambda: results.append(asyncio.run(group.do('k', fetch))))
+        leader.start()
+        started.wait(timeout=1)
+
+        follower = threading.Thread(target=lambda: results.append(asyncio.run(group.do('k', fetch))))
+        follower.start()
+        while group.get_stats()['coalesced'] == 0:
+            threading.Event().wait(0.005)
+        release.set()
+        leader.join(timeout=1)
+        follower.join(timeout=1)
+
+        assert results == ['dati', 'dati']
+        assert len(executions) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over_execution(self):
+        """Test: leader annullato → il chiamante in attesa riesegue la funzione."""
+        group = SingleFlight()
+        executions = []
+
+        async def fetch():
+            executions.append(1)
+            await asyncio.sleep(0.05)
+            return len(executions)
+
+        leader = asyncio.create_task(group.do('k', fetch))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(group.do('k', fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == 2
+        assert leader.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_forget_starts_new_execution(self):
+        """Test: dopo forget() (scrittura) i nuovi chiamanti non ricevono il risultato in volo."""
+        group = SingleFlight()
+        executions = []
+
+        async def fetch():
+            executions.append(1)
+            await asyncio.sleep(0.02)
+            return len(executions)
+
+        first = asyncio.create_task(group.do('k', fetch))
+        await asyncio.sleep(0)
+        group.forget()
+        second = await group.do('k', fetch)
+
+        assert await first == 2
+        assert second == 2
+        assert len(executions) == 2
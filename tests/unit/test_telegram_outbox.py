@@ -0,0 +1,223 @@
+"""
+Test unitari per TelegramOutbox e OutboxWorker - Consegna idempotente
+
+Focus su:
+- Idempotenza per (training_id, group_key, kind): nessun messaggio duplicato
+- Lease: messaggi in invio di un processo terminato tornano consegnabili
+- Lease rinnovato prima di ogni invio: un worker con lease scaduto e ripreso non reinvia
+- Retry (Retry-After, backoff) ed errori permanenti
+- TelegramService con outbox: ritorno immediato, consegna in background
+
+Pattern: SQLite ':memory:', telegram.Bot sostituito da mock, NO invii reali
+"""
+
+import asyncio
+import time
+
+import pytest
+import telegram
+
+from app.services.telegram_outbox import TelegramOutbox, OutboxWorker
+
+
+@pytest.fixture
+def outbox():
+    """Outbox SQLite in memoria."""
+    outbox = TelegramOutbox(':memory:')
+    yield outbox
+    outbox.close()
+
+
+@pytest.fixture
+def outbox_telegram_service(offline_telegram_service, outbox):
+    """TelegramService di test con outbox in memoria (worker fermato a fine test)."""
+    offline_telegram_service.outbox = outbox
+    yield offline_telegram_service
+    offline_telegram_service.stop_outbox_worker()
+
+
+def wait_until(condition, timeout: float = 5.0):
+    """Attende (polling) che condition() sia vera."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timeout in attesa della consegna"
+        time.sleep(0.01)
+
+
+@pytest.mark.unit
+class TestTelegramOutbox:
+    """Test suite per coda persistente e idempotenza."""
+
+    def test_enqueue_is_idempotent_per_training_group_and_kind(self, outbox):
+        """
+        Test chiave di idempotenza.
+
+        Verifica che:
+        - Un secondo accodamento non duplichi i messaggi in coda
+        - Un messaggio consegnato non venga riaccodato
+        - Un fallimento definitivo venga riaccodato da una nuova conferma
+        - Lo stesso gruppo con tipo diverso sia un messaggio distinto
+        """
+        messages = {'main_group': 'msg main', 'IT': 'msg IT'}
+
+        assert outbox.enqueue('training-1', 'training', messages) == {'main_group': 'queued', 'IT': 'queued'}
+        assert outbox.enqueue('training-1', 'training', messages) == {'main_group': 'pending', 'IT': 'pending'}
+
+        claimed = {item['group_key']: item for item in outbox.claim_due(10, lease_seconds=60)}
+        outbox.mark_sent(claimed['main_group']['id'])
+        outbox.mark_failed(claimed['IT']['id'], 'BadRequest: chat not found')
+
+        assert outbox.enqueue('training-1', 'training', messages) == {'main_group': 'sent', 'IT': 'queued'}
+        assert outbox.enqueue('training-1', 'feedback', {'IT': 'feedback IT'}) == {'IT': 'queued'}
+        assert outbox.get_stats()['sent'] == 1
+        assert outbox.get_stats()['pending'] == 2
+
+    def test_claim_respects_lease_and_schedule(self, outbox):
+        """Test: messaggi presi in carico non riassegnati fino a scadenza lease, retry non prima del delay."""
+        outbox.enqueue('training-1', 'training', {'HR': 'msg HR', 'IT': 'msg IT'})
+
+        first = outbox.claim_due(10, lease_seconds=60)
+        assert len(first) == 2
+        assert outbox.claim_due(10, lease_seconds=60) == []
+
+        outbox.mark_retry(first[0]['id'], 'TimedOut', delay_seconds=60)
+        assert outbox.claim_due(10, lease_seconds=60) == []
+        assert 59 < outbox.seconds_until_next() <= 60
+
+        # Processo terminato a metà invio: lease scaduto → messaggio di nuovo consegnabile
+        outbox.enqueue('training-2', 'training', {'HR': 'msg HR'})
+        orphan = outbox.claim_due(10, lease_seconds=0)
+        assert [item['training_id'] for item in orphan] == ['training-2']
+        assert [item['id'] for item in outbox.claim_due(10, lease_seconds=60)] == [orphan[0]['id']]
+
+
+@pytest.mark.unit
+class TestOutboxWorker:
+    """Test suite per consegna, retry ed errori permanenti."""
+
+    @pytest.mark.asyncio
+    async def test_drain_classifies_errors(self, outbox):
+        """
+        Test esiti di consegna.
+
+        Verifica che:
+        - Invio riuscito → 'sent'
+        - RetryAfter → nuovo tentativo dopo il tempo indicato da Telegram
+        - BadRequest (errore permanente) → 'failed' senza altri tentativi
+        - Errore transitorio → backoff entro RETRY_BASE_SECONDS
+        """
+        async def deliver(group_key, message, parse_mode, before_send=None, max_retry_wait=None):
+            if group_key == 'HR':
+                raise telegram.error.RetryAfter(30)
+            if group_key == 'Legale':
+                raise telegram.error.BadRequest("Chat not found")
+            if group_key == 'Marketing':
+                raise telegram.error.TimedOut()
+
+        outbox.enqueue('training-1', 'training', {'IT': 'a', 'HR': 'b', 'Legale': 'c', 'Marketing': 'd'})
+        worker = OutboxWorker(outbox, deliver)
+
+        assert await worker.drain_once() == 4
+
+        status = outbox.get_delivery_status('training-1', 'training')
+        assert status['IT']['status'] == 'sent'
+        assert status['Legale']['status'] == 'failed'
+        assert status['HR']['status'] == 'pending'
+        assert status['Marketing']['status'] == 'pending'
+        assert status['HR']['last_error'].startswith('RetryAfter')
+        assert 0 < outbox.seconds_until_next() <= OutboxWorker.RETRY_BASE_SECONDS
+        assert worker.get_stats()['delivered'] == 1
+        assert worker.get_stats()['retried'] == 2
+        assert worker.get_stats()['failed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_taken_over_is_not_sent_twice(self, tmp_path):
+        """
+        Test due processi sullo stesso file outbox (Flask + bot).
+
+        Verifica che:
+        - Un worker lento (attesa anti-flood oltre il lease) perda il lease ripreso da un altro worker
+        - Il worker lento non invii: ogni messaggio consegnato una sola volta
+        - Senza concorrenza il lease scaduto ma non ripreso venga rinnovato e il messaggio inviato
+        """
+        path = str(tmp_path / 'telegram_outbox.sqlite3')
+        outbox_slow, outbox_fast = TelegramOutbox(path), TelegramOutbox(path)
+        sent = []
+
+        def make_deliver(name, pacing):
+            async def deliver(group_key, message, parse_mode, before_send=None, max_retry_wait=None):
+                await asyncio.sleep(pacing)  # Attesa bucket/RetryAfter dello scheduler
+                before_send()
+                sent.append((name, group_key))
+            return deliver
+
+        slow = OutboxWorker(outbox_slow, make_deliver('slow', 0.3))
+        fast = OutboxWorker(outbox_fast, make_deliver('fast', 0))
+        slow.LEASE_SECONDS = fast.LEASE_SECONDS = 0.1
+
+        outbox_slow.enqueue('training-1', 'training', {'IT': 'a', 'HR': 'b'})
+
+        async def fast_after_lease_expiry():
+            await asyncio.sleep(0.15)
+            return await fast.drain_once()
+
+        await asyncio.gather(slow.drain_once(), fast_after_lease_expiry())
+
+        assert sorted(sent) == [('fast', 'HR'), ('fast', 'IT')]
+        assert slow.get_stats()['lease_lost'] == 2
+        assert {s['status'] for s in outbox_slow.get_delivery_status('training-1', 'training').values()} == {'sent'}
+
+        outbox_slow.enqueue('training-2', 'training', {'IT': 'c'})
+        await slow.drain_once()
+
+        assert ('slow', 'IT') in sent
+        assert outbox_slow.get_delivery_status('training-2', 'training')['IT']['status'] == 'sent'
+        outbox_slow.close()
+        outbox_fast.close()
+
+
+@pytest.mark.unit
+class TestTelegramServiceOutbox:
+    """Test suite per TelegramService con outbox configurato."""
+
+    @pytest.mark.asyncio
+    async def test_notification_is_queued_and_delivered_once(self, outbox_telegram_service, patched_telegram_bot,
+                                                             sample_training_data):
+        """
+        Test notifica con outbox.
+
+        Verifica che:
+        - La notifica ritorni subito con i messaggi accodati
+        - Il worker in background consegni un messaggio per gruppo
+        - Una seconda conferma della stessa formazione non reinvii nulla
+        """
+        service = outbox_telegram_service
+        training = {**sample_training_data, 'id': 'notion-page-1', 'Area': ['IT', 'HR'], 'Periodo': 'SPRING'}
+
+        results = await service.send_training_notification(training)
+
+        assert results.queued is True
+        assert dict(results) == {'main_group': True, 'IT': True, 'HR': True}
+        assert results.statuses == {'main_group': 'queued', 'IT': 'queued', 'HR': 'queued'}
+
+        wait_until(lambda: service.outbox.count_unsent() == 0)
+        delivered = sum(bot.send_message.await_count for bot in patched_telegram_bot.instances)
+        assert delivered == 3
+
+        again = await service.send_training_notification(training)
+
+        assert again.statuses == {'main_group': 'sent', 'IT': 'sent', 'HR': 'sent'}
+        assert sum(bot.send_message.await_count for bot in patched_telegram_bot.instances) == 3
+        assert service.get_outbox_stats()['queue']['sent'] == 3
+
+    @pytest.mark.asyncio
+    async def test_training_without_id_is_sent_directly(self, outbox_telegram_service, patched_telegram_bot,
+                                                        sample_training_data):
+        """Test: senza id formazione (nessuna chiave di idempotenza) invio diretto come senza outbox."""
+        results = await outbox_telegram_service.send_training_notification(
+            {**sample_training_data, 'Periodo': 'SPRING'}
+        )
+
+        assert results.queued is False
+        assert dict(results) == {'main_group': True, 'IT': True}
+        assert outbox_telegram_service.outbox.get_stats()['pending'] == 0
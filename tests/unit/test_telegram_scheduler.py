@@ -0,0 +1,117 @@
+"""
+Unit test per TelegramSendScheduler (limiti anti-flood Telegram).
+
+Focus su:
+- Burst per chat senza attese, poi invii distanziati dal rate della chat
+- Chat diverse indipendenti (solo il limite globale è condiviso)
+- RetryAfter: pausa della chat e nuovo tentativo, nessun messaggio perso
+- Rinuncia oltre l'attesa massima (l'errore risale al chiamante)
+- Cap del chiamante (lease outbox) e before_send subito prima di ogni tentativo
+
+UTILIZZO:
+pytest tests/unit/test_telegram_scheduler.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+import telegram
+
+from app.services.telegram_scheduler import TelegramSendScheduler
+
+
+@pytest.mark.unit
+class TestTelegramSendScheduler:
+    """Test suite per TelegramSendScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_chat_limit_spaces_sends_and_chats_are_independent(self):
+        """
+        Test limite per chat.
+
+        Verifica che:
+        - I primi CHAT_BURST invii alla stessa chat partano subito
+        - I successivi attendano il rate della chat (~0.1s con 600/minuto)
+        - Un'altra chat non subisca le attese della prima
+        """
+        scheduler = TelegramSendScheduler(global_limit_per_second=1000, chat_limit_per_minute=600)
+        sent_at = {}
+
+        async def send(chat_id, index):
+            await scheduler.run(chat_id, lambda: asyncio.sleep(0))
+            sent_at[(chat_id, index)] = time.perf_counter()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send('-100A', index) for index in range(5)), send('-100B', 0))
+
+        offsets = sorted(sent_at[('-100A', index)] - start for index in range(5))
+        assert offsets[2] < 0.05
+        assert offsets[3] == pytest.approx(0.1, abs=0.05)
+        assert offsets[4] == pytest.approx(0.2, abs=0.05)
+        assert sent_at[('-100B', 0)] - start < 0.05
+
+        stats = scheduler.get_stats()
+        assert stats['sends'] == 6
+        assert stats['chats'] == 2
+        assert stats['chat_waits'] == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_chat_and_retries(self):
+        """Test: RetryAfter → attesa del tempo indicato e nuovo tentativo riuscito."""
+        scheduler = TelegramSendScheduler(global_limit_per_second=1000, chat_limit_per_minute=600)
+        attempts = []
+
+        async def send():
+            attempts.append(time.perf_counter())
+            if len(attempts) == 1:
+                raise telegram.error.RetryAfter(0.1)
+            return 'ok'
+
+        assert await scheduler.run('-100A', send) == 'ok'
+
+        assert len(attempts) == 2
+        assert attempts[1] - attempts[0] >= 0.1
+        stats = scheduler.get_stats()
+        assert stats['retry_after'] == 1
+        assert stats['gave_up'] == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_max_wait_is_raised(self):
+        """Test: RetryAfter oltre max_retry_wait_seconds → nessuna attesa, errore al chiamante."""
+        scheduler = TelegramSendScheduler(max_retry_wait_seconds=5)
+
+        async def send():
+            raise telegram.error.RetryAfter(60)
+
+        with pytest.raises(telegram.error.RetryAfter):
+            await scheduler.run('-100A', send)
+
+        assert scheduler.get_stats()['gave_up'] == 1
+
+    @pytest.mark.asyncio
+    async def test_caller_cap_and_before_send(self):
+        """
+        Test vincoli del chiamante (worker outbox).
+
+        Verifica che:
+        - max_retry_wait del chiamante abbassi il cap dello scheduler (RetryAfter non atteso)
+        - before_send venga chiamato prima di ogni tentativo e un suo errore annulli l'invio
+        """
+        scheduler = TelegramSendScheduler(global_limit_per_second=1000, chat_limit_per_minute=600)
+        calls = []
+
+        async def send():
+            calls.append('send')
+            raise telegram.error.RetryAfter(10)
+
+        with pytest.raises(telegram.error.RetryAfter):
+            await scheduler.run('-100A', send, before_send=lambda: calls.append('renew'), max_retry_wait=5)
+        assert calls == ['renew', 'send']
+
+        def lease_lost():
+            raise RuntimeError('lease perso')
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run('-100B', send, before_send=lease_lost)
+        assert calls == ['renew', 'send']
@@ -0,0 +1,162 @@
+"""
+Test unitari per TelegramService - Invio messaggi
+
+Focus su:
+- Bot condiviso per event loop (start/close, un solo connection pool per broadcast)
+- Fallback al Bot one-shot senza Bot avviato
+- Fan-out parallelo ai gruppi (concorrenza limitata, tempi per gruppo)
+- RetryAfter gestito dallo scheduler anti-flood (nessun messaggio perso)
+
+Pattern: telegram.Bot sostituito da mock (patched_telegram_bot), NO invii reali
+"""
+
+import asyncio
+import time
+
+import pytest
+import telegram
+
+
+@pytest.mark.unit
+class TestTelegramServiceSharedBot:
+    """Test suite per lifecycle Bot condiviso."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_shares_one_bot(self, offline_telegram_service, patched_telegram_bot, sample_training_data):
+        """
+        Test broadcast 'All' con un solo Bot.
+
+        Verifica che:
+        - Tutti i gruppi target ricevano il messaggio
+        - Venga creato e inizializzato un solo Bot (un handshake, un getMe)
+        - Il Bot venga chiuso a fine broadcast
+        """
+        training = {**sample_training_data, 'Area': ['All'], 'Periodo': 'SPRING'}
+
+        results = await offline_telegram_service.send_training_notification(training)
+
+        assert len(results) == 7 and all(results.values())
+        assert len(patched_telegram_bot.instances) == 1
+        bot = patched_telegram_bot.instances[0]
+        assert bot.initialize.await_count == 1
+        assert bot.send_message.await_count == 7
+        assert bot.shutdown.await_count == 1
+        assert offline_telegram_service.get_bot_stats()['shared_sends'] == 7
+
+    @pytest.mark.asyncio
+    async def test_started_bot_survives_sessions_until_close(self, offline_telegram_service, patched_telegram_bot,
+                                                             sample_training_data):
+        """
+        Test start()/close() espliciti.
+
+        Verifica che:
+        - Con Bot già avviato i broadcast non ne creino altri né lo chiudano
+        - Dopo close() gli invii usino il Bot one-shot (fallback)
+        """
+        service = offline_telegram_service
+        assert await service.start() is True
+        assert await service.start() is False
+
+        await service.send_training_notification({**sample_training_data, 'Periodo': 'SPRING'})
+        await service.send_message_to_group('HR', 'messaggio')
+
+        shared = patched_telegram_bot.instances[0]
+        assert len(patched_telegram_bot.instances) == 1
+        assert shared.send_message.await_count == 3
+        assert shared.shutdown.await_count == 0
+
+        await service.close()
+        assert shared.shutdown.await_count == 1
+
+        assert await service.send_message_to_group('HR', 'messaggio') is True
+        one_shot = patched_telegram_bot.instances[1]
+        assert one_shot.__aenter__.await_count == 1
+        assert service.get_bot_stats() == {
+            'bots_started': 1, 'shared_sends': 3, 'one_shot_sends': 1, 'active_bots': 0
+        }
+
+
+@pytest.mark.unit
+class TestTelegramServiceFanOut:
+    """Test suite per invio parallelo ai gruppi target."""
+
+    @pytest.mark.asyncio
+    async def test_groups_sent_concurrently_with_timings(self, offline_telegram_service, patched_telegram_bot,
+                                                         sample_training_data, sample_feedback_data):
+        """
+        Test fan-out 'All' (main_group + 6 aree).
+
+        Verifica che:
+        - Gli invii si sovrappongano (tempo totale ~ un invio, non la somma)
+        - Il risultato resti {group_key: bool} nell'ordine dei gruppi target
+        - Ogni gruppo abbia la sua durata in timings_ms
+        - Il feedback usi lo stesso fan-out (main_group escluso)
+        """
+        async def slow_send(**kwargs):
+            await asyncio.sleep(0.05)
+
+        patched_telegram_bot.send_message_side_effect = slow_send
+        training = {**sample_training_data, 'Area': ['All'], 'Periodo': 'SPRING'}
+
+        start = time.perf_counter()
+        results = await offline_telegram_service.send_training_notification(training)
+        elapsed = time.perf_counter() - start
+
+        assert list(results) == ['main_group', 'IT', 'R&D', 'HR', 'Legale', 'Commerciale', 'Marketing']
+        assert all(results.values())
+        assert elapsed < 0.2
+        assert set(results.timings_ms) == set(results)
+        assert all(ms >= 40 for ms in results.timings_ms.values())
+
+        feedback = await offline_telegram_service.send_feedback_notification(
+            {**sample_feedback_data, 'Area': ['IT', 'HR']}, 'https://forms.office.com/feedback'
+        )
+        assert dict(feedback) == {'IT': True, 'HR': True}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_and_failures_isolated(self, offline_telegram_service, patched_telegram_bot,
+                                                             sample_training_data):
+        """Test: al massimo max_concurrent_sends invii contemporanei, un gruppo fallito non blocca gli altri."""
+        offline_telegram_service.max_concurrent_sends = 2
+        in_flight, peak = 0, 0
+
+        async def tracked_send(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if kwargs['chat_id'] == offline_telegram_service.groups['HR']:
+                raise RuntimeError("chat non raggiungibile")
+
+        patched_telegram_bot.send_message_side_effect = tracked_send
+
+        results = await offline_telegram_service.send_training_notification(
+            {**sample_training_data, 'Area': ['All'], 'Periodo': 'SPRING'}
+        )
+
+        assert peak == 2
+        assert results['HR'] is False
+        assert sum(results.values()) == 6
+
+
+
+@pytest.mark.unit
+class TestTelegramServiceFloodControl:
+    """Test suite per limiti anti-flood negli invii del servizio."""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_retried_not_dropped(self, offline_telegram_service, patched_telegram_bot):
+        """Test: RetryAfter di Telegram → il messaggio viene reinviato, send_message_to_group ritorna True."""
+        calls = []
+
+        async def flood_once(**kwargs):
+            calls.append(kwargs['chat_id'])
+            if len(calls) == 1:
+                raise telegram.error.RetryAfter(0.05)
+
+        patched_telegram_bot.send_message_side_effect = flood_once
+
+        assert await offline_telegram_service.send_message_to_group('HR', 'messaggio') is True
+        assert calls == [offline_telegram_service.groups['HR']] * 2
+        assert offline_telegram_service.get_rate_limit_stats()['retry_after'] == 1
@@ -0,0 +1,114 @@
+"""
+Unit test per TelegramWebhookServer (modalità webhook del processo bot).
+
+Focus su:
+- POST di un Update JSON sintetico → stesso handler /oggi del polling
+- Secret token errato → 403, JSON non valido → 400
+- Application senza Updater in modalità webhook, update concorrenti configurabili
+
+UTILIZZO:
+pytest tests/unit/test_telegram_webhook.py -v
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import aiohttp
+import pytest
+import telegram
+from telegram.ext import Application, ExtBot
+
+from app.services.bot import TelegramCommands, TelegramWebhookServer
+
+
+def command_update(text: str, update_id: int = 1) -> dict:
+    """Update Telegram sintetico con un comando in chat privata."""
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': 1700000000,
+            'chat': {'id': 42, 'type': 'private'},
+            'from': {'id': 42, 'is_bot': False, 'first_name': 'Test'},
+            'text': text,
+            'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(text)}]
+        }
+    }
+
+
+async def fake_get_me(bot, *args, **kwargs):
+    """get_me offline: utente bot fittizio (richiesto da Application.start)."""
+    bot._bot_user = telegram.User(id=123456, is_bot=True, first_name='Formazing', username='formazing_bot')
+    return bot._bot_user
+
+
+@pytest.fixture
+def notion_service():
+    """NotionService mock senza formazioni calendarizzate."""
+    notion = Mock()
+    notion.get_formazioni_in_range = AsyncMock(return_value=[])
+    return notion
+
+
+@pytest.mark.unit
+class TestTelegramWebhookServer:
+    """Test suite per TelegramWebhookServer."""
+
+    @pytest.mark.asyncio
+    async def test_posted_update_reaches_command_handler(self, notion_service):
+        """
+        Test flusso webhook completo.
+
+        Verifica che:
+        - L'Update POSTato sull'endpoint locale venga accodato (200)
+        - L'Application lo elabori con gli handler di TelegramCommands
+        - Richieste senza secret corretto o con JSON non valido vengano scartate
+        """
+        commands = TelegramCommands(Mock())
+        commands.notion_service = notion_service
+        application = Application.builder().token('123456:TEST').updater(None).build()
+        commands.register_handlers(application)
+
+        replied = asyncio.Event()
+        reply_text = AsyncMock(side_effect=lambda *args, **kwargs: replied.set())
+
+        with patch.object(ExtBot, 'get_me', fake_get_me), \
+                patch.object(telegram.Message, 'reply_text', reply_text):
+            await application.initialize()
+            await application.start()
+            server = TelegramWebhookServer(application, host='127.0.0.1', port=0,
+                                           path='/telegram/webhook', secret_token='s3cret')
+            await server.start()
+            url = f'http://127.0.0.1:{server.bound_port}/telegram/webhook'
+
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(url, json=command_update('/oggi'),
+                                            headers={server.SECRET_HEADER: 's3cret'}) as response:
+                        assert response.status == 200
+                    async with session.post(url, json=command_update('/oggi', 2)) as response:
+                        assert response.status == 403
+                    async with session.post(url, data='non json',
+                                            headers={server.SECRET_HEADER: 's3cret'}) as response:
+                        assert response.status == 400
+
+                await asyncio.wait_for(replied.wait(), timeout=5)
+            finally:
+                await server.stop()
+                await application.stop()
+                await application.shutdown()
+
+        assert 'FORMAZIONI DI OGGI' in reply_text.call_args.args[0]
+        assert reply_text.await_count == 1
+        assert server.get_stats() == {'received': 1, 'rejected': 1, 'invalid': 1}
+
+    def test_webhook_application_has_no_updater(self, offline_telegram_service, monkeypatch):
+        """Test: webhook senza Updater (niente long-poll), stessi comandi, update elaborati in parallelo."""
+        monkeypatch.setenv('TELEGRAM_BOT_CONCURRENT_UPDATES', '4')
+        webhook_app = offline_telegram_service.build_bot_application('webhook')
+        polling_app = offline_telegram_service.build_bot_application('polling')
+
+        assert webhook_app.updater is None
+        assert polling_app.updater is not None
+        assert len(webhook_app.handlers[0]) == len(polling_app.handlers[0]) == 5
+        assert webhook_app.update_processor.max_concurrent_updates == 4
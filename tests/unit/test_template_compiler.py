@@ -0,0 +1,118 @@
+"""
+Unit test per CompiledTemplate e compilazione template nei formatter.
+
+Focus su:
+- Render per segmenti precompilati identico a str.format sui template validi
+- Placeholder sconosciuti, posizionali o sintassi errata rifiutati alla compilazione
+- TelegramFormatter: errore segnalato al caricamento, messaggio di fallback al render
+- EmailFormatter: template non valido → EmailFormatterError all'avvio
+
+UTILIZZO:
+pytest tests/unit/test_template_compiler.py -v
+"""
+
+from datetime import date
+
+import pytest
+import yaml
+
+from app.services.bot.telegram_formatters import TelegramFormatter
+from app.services.microsoft.email_formatter import EmailFormatter, EmailFormatterError
+from app.services.template_compiler import CompiledTemplate, TemplateCompileError
+
+
+FIELDS = ('nome', 'area', 'data_ora', 'codice', 'link_teams')
+
+
+@pytest.mark.unit
+class TestCompiledTemplate:
+    """Test suite per CompiledTemplate."""
+
+    def test_render_matches_str_format(self):
+        """Test: stesso output di str.format, campi usati esposti, graffe letterali preservate."""
+        source = '📚 {nome} | {area} | {{letterale}} | <code>{codice!r}</code> {data_ora:>5}'
+        values = {'nome': 'Python', 'area': 'IT', 'data_ora': '14:30', 'codice': 'PY-01', 'link_teams': 'x'}
+
+        template = CompiledTemplate(source, FIELDS, 'test')
+
+        assert template.render(values) == source.format(**values)
+        assert template.fields == {'nome', 'area', 'codice', 'data_ora'}
+
+    @pytest.mark.parametrize('source', [
+        '',
+        'Solo testo {{senza}} campi',
+        '{nome}{codice}',
+        'Codice {codice:{area}} e {data_ora.year} {link_teams[0]}',
+        'Numero {nome:05d} | {area}',
+    ])
+    def test_segment_render_matches_str_format(self, source):
+        """Test: segmenti precompilati (slot semplici, spec annidati, attributi, valori non stringa) come str.format."""
+        values = {'nome': 42, 'area': '>8', 'data_ora': date(2024, 10, 15),
+                  'codice': 'PY', 'link_teams': ['https://teams']}
+
+        assert CompiledTemplate(source, FIELDS, 'test').render(values) == source.format(**values)
+
+    def test_missing_value_raises_key_error(self):
+        """Test: campo assente nei valori → KeyError, come str.format."""
+        with pytest.raises(KeyError):
+            CompiledTemplate('Ciao {nome}', FIELDS, 'test').render({})
+
+    @pytest.mark.parametrize('source, message', [
+        ('Ciao {nome} {docente}', "placeholder sconosciuti ['docente']"),
+        ('Ciao {} {nome}', 'placeholder posizionali'),
+        ('Ciao {nome', 'sintassi non valida'),
+        ('Ciao {nome.upper} {sala[0]}', "placeholder sconosciuti ['sala']"),
+    ])
+    def test_invalid_templates_rejected_at_compile_time(self, source, message):
+        """Test: errori di template individuati alla compilazione con nome del template nel messaggio."""
+        with pytest.raises(TemplateCompileError) as exc_info:
+            CompiledTemplate(source, FIELDS, 'training_notification.telegram.area_group')
+
+        assert message in str(exc_info.value)
+        assert 'training_notification.telegram.area_group' in str(exc_info.value)
+
+
+@pytest.mark.unit
+class TestFormatterCompilation:
+    """Test suite per compilazione al caricamento nei formatter."""
+
+    def test_telegram_formatter_reports_invalid_template_on_load(self, caplog):
+        """Test: placeholder sconosciuto segnalato alla creazione del formatter, non al primo invio."""
+        templates = {
+            'training_notification': {'telegram': {
+                'main_group': 'Nuova formazione {nome}',
+                'area_group': 'Formazione {nome} per {aula}'
+            }}
+        }
+
+        formatter = TelegramFormatter(templates)
+
+        assert list(formatter.template_errors) == ['training_notification.telegram.area_group']
+        assert 'aula' in caplog.text
+        assert formatter.format_training_message({'Nome': 'Python'}, 'main_group') == 'Nuova formazione Python'
+        assert formatter.format_training_message({'Nome': 'Python'}, 'IT') == (
+            "❌ Errore nella formattazione del messaggio per la formazione: Python"
+        )
+
+    def test_email_formatter_rejects_invalid_template_on_load(self, tmp_path):
+        """Test: template calendario con placeholder sconosciuto → EmailFormatterError all'avvio."""
+        path = tmp_path / 'calendar_templates.yaml'
+        path.write_text(yaml.safe_dump({
+            'calendar_event': {'subject': 'Formazione {Nome}', 'body': 'Codice: {Codice}\nSala: {Sala}'}
+        }), encoding='utf-8')
+
+        with pytest.raises(EmailFormatterError, match='Sala'):
+            EmailFormatter(str(path))
+
+    def test_email_subject_can_use_all_event_fields(self, tmp_path):
+        """Test: oggetto evento con gli stessi campi del corpo (Codice, Area)."""
+        path = tmp_path / 'calendar_templates.yaml'
+        path.write_text(yaml.safe_dump({
+            'calendar_event': {'subject': '[{Area}] {Nome} ({Codice})\n', 'body': '{Nome}'}
+        }), encoding='utf-8')
+
+        formatter = EmailFormatter(str(path))
+
+        assert formatter.format_subject({'Nome': 'Python', 'Codice': 'PY-01', 'Area': ['IT', 'R&D']}) == (
+            '[IT, R&D] Python (PY-01)'
+        )